@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# scripts/benchmarks/aggregator.py
+""" Compare the time a client needs to read values of many devices directly
+with the time needed to read them from an
+:class:`umodbus.server.aggregator.Aggregator`.
+
+    $ python scripts/benchmarks/aggregator.py --devices 20 --reads 1000
+
+"""
+import time
+import socket
+import argparse
+from threading import Thread
+try:
+    from socketserver import ThreadingTCPServer
+except ImportError:
+    from SocketServer import ThreadingTCPServer
+
+from umodbus.client import tcp
+from umodbus.server import tcp as tcp_server
+from umodbus.client.upstream import Upstream
+from umodbus.server.aggregator import Aggregator
+
+
+def serve(app):
+    app.daemon_threads = True
+    t = Thread(target=app.serve_forever)
+    t.daemon = True
+    t.start()
+
+
+def create_server():
+    return tcp_server.get_server(ThreadingTCPServer, ('localhost', 0),
+                                 tcp_server.RequestHandler)
+
+
+def create_device():
+    device = create_server()
+
+    @device.route(slave_ids=[1], function_codes=[3], addresses=list(range(5)))
+    def registers(slave_id, function_code, address):
+        return address
+
+    serve(device)
+    return device
+
+
+def measure(reads, read_all):
+    """ Return mean number of seconds to read all values. """
+    start = time.time()
+
+    for _ in range(reads):
+        read_all()
+
+    return (time.time() - start) / reads
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--devices', type=int, default=20)
+    parser.add_argument('--reads', type=int, default=1000)
+    args = parser.parse_args()
+
+    devices = [create_device() for _ in range(args.devices)]
+    adu = tcp.read_holding_registers(1, 0, 5)
+
+    socks = [socket.create_connection(device.server_address)
+             for device in devices]
+    direct = measure(args.reads, lambda: [tcp.send_message(adu, sock)
+                                          for sock in socks])
+
+    aggregator = Aggregator()
+    for i, device in enumerate(devices):
+        aggregator.add_mapping(
+            5 * i, aggregator.add_device(
+                Upstream(device.server_address).send_message,
+                interval=0.1),
+            address=0, quantity=5)
+
+    app = create_server()
+    aggregator.bind_routes(app, slave_ids=[1])
+    serve(app)
+    aggregator.start()
+
+    # Wait for first poll of all devices.
+    while not all(mapping.values for mapping in aggregator.mappings):
+        time.sleep(0.01)
+
+    sock = socket.create_connection(app.server_address)
+    adu = tcp.read_holding_registers(1, 0, 5 * args.devices)
+    aggregated = measure(args.reads, lambda: tcp.send_message(adu, sock))
+
+    aggregator.shutdown()
+
+    print('{0:>10} {1:>12} {2:>10}'.format('path', 'connections',
+                                           'ms/read'))
+    print('{0:>10} {1:>12} {2:>10.3f}'.format('direct', args.devices,
+                                              direct * 1000))
+    print('{0:>10} {1:>12} {2:>10.3f}'.format('aggregator', 1,
+                                              aggregated * 1000))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# scripts/benchmarks/bulk_read.py
+""" Measure how pipelining speeds up
+:func:`umodbus.client.bulk.read_holding_registers_bulk` on a link with
+latency.
+
+    $ python scripts/benchmarks/bulk_read.py --rtt 0.005 --max-in-flight 1 4 8
+
+Client and server run on localhost. A relay between them delays all data by
+half the round trip time in both directions.
+
+"""
+import time
+import socket
+import argparse
+from threading import Thread
+try:
+    from socketserver import ThreadingTCPServer
+    from queue import Queue
+except ImportError:
+    from SocketServer import ThreadingTCPServer
+    from Queue import Queue
+
+from umodbus.client import tcp
+from umodbus.client.bulk import read_holding_registers_bulk
+from umodbus.server.tcp import RequestHandler, get_server
+
+
+def forward(source, destination, delay):
+    """ Forward data from source to destination socket, delivering every
+    chunk `delay` seconds after it was received.
+    """
+    queue = Queue()
+
+    def send():
+        while True:
+            deliver_at, data = queue.get()
+            time.sleep(max(0, deliver_at - time.time()))
+            destination.sendall(data)
+
+    t = Thread(target=send)
+    t.daemon = True
+    t.start()
+
+    while True:
+        data = source.recv(4096)
+        if not data:
+            return
+        queue.put((time.time() + delay, data))
+
+
+def relay(server_address, delay):
+    """ Return address of relay which forwards connections to server. """
+    listener = socket.socket()
+    listener.bind(('localhost', 0))
+    listener.listen(1)
+
+    def accept():
+        client, _ = listener.accept()
+        server = socket.create_connection(server_address)
+
+        for source, destination in [(client, server), (server, client)]:
+            t = Thread(target=forward, args=(source, destination, delay))
+            t.daemon = True
+            t.start()
+
+    t = Thread(target=accept)
+    t.daemon = True
+    t.start()
+
+    return listener.getsockname()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rtt', type=float, default=0.005)
+    parser.add_argument('--quantity', type=int, default=2000)
+    parser.add_argument('--max-in-flight', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    app = get_server(ThreadingTCPServer, ('localhost', 0), RequestHandler)
+    app.daemon_threads = True
+
+    @app.route(slave_ids=[1], function_codes=[3],
+               addresses=list(range(args.quantity)))
+    def registers(slave_id, function_code, address):
+        return address
+
+    t = Thread(target=app.serve_forever)
+    t.daemon = True
+    t.start()
+
+    print('{0:>14} {1:>10}'.format('max in flight', 'ms/read'))
+    for max_in_flight in args.max_in_flight:
+        sock = socket.create_connection(relay(app.server_address,
+                                              args.rtt / 2))
+        start = time.time()
+
+        for _ in range(args.repeat):
+            read_holding_registers_bulk(tcp, sock, 1, 0, args.quantity,
+                                        max_in_flight)
+
+        print('{0:>14} {1:>10.1f}'.format(
+            max_in_flight, (time.time() - start) / args.repeat * 1000))
+        sock.close()
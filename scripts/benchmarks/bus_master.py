@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# scripts/benchmarks/bus_master.py
+""" Measure how long an urgent write waits for the bus while other threads
+poll, using a plain lock and using :class:`BusMaster`.
+
+Transactions are simulated by sleeping, no serial port is needed.
+
+    $ python scripts/benchmarks/bus_master.py --pollers 4 --transaction 0.005
+
+"""
+import time
+import argparse
+from threading import Thread, Lock, Event
+from contextlib import contextmanager
+
+from umodbus.client.serial.bus import BusMaster, PRIORITY_CONTROL
+
+
+class LockedBus(object):
+    """ Serial port guarded by a lock, first come first served. """
+    def __init__(self):
+        self.lock = Lock()
+
+    @contextmanager
+    def acquire(self, priority=None, timeout=None):
+        with self.lock:
+            yield
+
+
+def poller(bus, transaction, stop):
+    while not stop.is_set():
+        with bus.acquire():
+            time.sleep(transaction)
+
+
+def run(bus, pollers, transaction, writes):
+    stop = Event()
+    threads = [Thread(target=poller, args=(bus, transaction, stop))
+               for _ in range(pollers)]
+
+    for t in threads:
+        t.start()
+
+    latencies = []
+    try:
+        for _ in range(writes):
+            time.sleep(transaction * 2.5)
+            start = time.time()
+            with bus.acquire(PRIORITY_CONTROL):
+                latencies.append(time.time() - start)
+                time.sleep(transaction)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    latencies.sort()
+    return (sum(latencies) / len(latencies),
+            latencies[int(len(latencies) * 0.99) - 1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pollers', type=int, default=4)
+    parser.add_argument('--transaction', type=float, default=0.005,
+                        help='Duration of a transaction in seconds.')
+    parser.add_argument('--writes', type=int, default=200)
+    args = parser.parse_args()
+
+    print('{0:<10} {1:>14} {2:>14}'.format('', 'mean wait ms', 'p99 wait ms'))
+    for name, bus in [('lock', LockedBus()), ('bus master', BusMaster(None))]:
+        mean, p99 = run(bus, args.pollers, args.transaction, args.writes)
+        print('{0:<10} {1:>14.2f} {2:>14.2f}'.format(name, mean * 1000,
+                                                     p99 * 1000))
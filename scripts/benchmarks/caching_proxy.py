@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# scripts/benchmarks/caching_proxy.py
+""" Measure the load on a device polled by multiple clients, directly and
+through a :class:`umodbus.server.proxy.CachingProxy`.
+
+    $ python scripts/benchmarks/caching_proxy.py --clients 7 --ttl 0.1
+
+"""
+import time
+import socket
+import argparse
+from threading import Thread
+try:
+    from socketserver import ThreadingTCPServer
+except ImportError:
+    from SocketServer import ThreadingTCPServer
+
+from umodbus.client import tcp
+from umodbus.functions import READ_HOLDING_REGISTERS
+from umodbus.server import tcp as tcp_server
+from umodbus.server.proxy import CachingProxy, RequestHandler
+
+
+def serve(app):
+    t = Thread(target=app.serve_forever)
+    t.daemon = True
+    t.start()
+
+
+def create_device():
+    """ Return Modbus TCP/IP server which counts the requests it handles. """
+    device = tcp_server.get_server(ThreadingTCPServer, ('localhost', 0),
+                                   tcp_server.RequestHandler)
+    device.daemon_threads = True
+    device.requests = 0
+
+    @device.route(slave_ids=[1], function_codes=[3],
+                  addresses=list(range(10)))
+    def registers(slave_id, function_code, address):
+        if address == 0:
+            device.requests += 1
+
+        return address
+
+    serve(device)
+    return device
+
+
+def client(address, duration, results):
+    sock = socket.create_connection(address)
+    adu = tcp.read_holding_registers(slave_id=1, starting_address=0,
+                                     quantity=10)
+    count = 0
+    deadline = time.time() + duration
+
+    while time.time() < deadline:
+        tcp.send_message(adu, sock)
+        count += 1
+
+    sock.close()
+    results.append(count)
+
+
+def run(address, clients, duration):
+    results = []
+    threads = [Thread(target=client, args=(address, duration, results))
+               for _ in range(clients)]
+
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    return sum(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, default=7)
+    parser.add_argument('--ttl', type=float, default=0.1)
+    parser.add_argument('--duration', type=float, default=3)
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>16} {2:>16}'.format('path', 'client requests',
+                                          'device requests'))
+
+    device = create_device()
+    total = run(device.server_address, args.clients, args.duration)
+    print('{0:>8} {1:>16} {2:>16}'.format('direct', total, device.requests))
+
+    device = create_device()
+    proxy = CachingProxy(device.server_address)
+    proxy.add_range(1, READ_HOLDING_REGISTERS, 0, 10, args.ttl)
+
+    app = tcp_server.get_server(ThreadingTCPServer, ('localhost', 0),
+                                RequestHandler)
+    app.daemon_threads = True
+    proxy.bind_routes(app)
+    serve(app)
+
+    poller = Thread(target=proxy.poll_forever)
+    poller.start()
+
+    total = run(app.server_address, args.clients, args.duration)
+    proxy.shutdown()
+    poller.join()
+
+    print('{0:>8} {1:>16} {2:>16}'.format('proxy', total, device.requests))
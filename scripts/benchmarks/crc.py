@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# scripts/benchmarks/crc.py
+""" Compare throughput of CRC calculation of uModbus 1.0.2 with current
+implementation on frames of 256 bytes.
+
+    $ python scripts/benchmarks/crc.py
+
+"""
+import os
+import time
+import struct
+import argparse
+
+from umodbus.client.serial.redundancy_check import get_crc, look_up_table
+
+
+def get_crc_legacy(msg):
+    """ CRC calculation of uModbus 1.0.2. """
+    register = 0xFFFF
+
+    for byte_ in msg:
+        try:
+            val = struct.unpack('<B', byte_)[0]
+        except TypeError:
+            val = byte_
+
+        register = \
+            (register >> 8) ^ look_up_table[(register ^ val) & 0xFF]
+
+    return struct.pack('<H', register)
+
+
+def measure(f, frame, iterations):
+    """ Return throughput in frames per second. """
+    start = time.time()
+    for _ in range(iterations):
+        f(frame)
+
+    return iterations / (time.time() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=10000)
+    parser.add_argument('--size', type=int, default=256)
+    args = parser.parse_args()
+
+    frame = os.urandom(args.size)
+    assert get_crc(frame) == get_crc_legacy(frame)
+
+    # Generate tables before measuring.
+    get_crc(frame)
+
+    print('{0:<8} {1:>12} {2:>12}'.format('', 'frames/s', 'MB/s'))
+    for name, f in [('legacy', get_crc_legacy), ('current', get_crc)]:
+        rate = measure(f, frame, args.iterations)
+        print('{0:<8} {1:>12.0f} {2:>12.2f}'.format(
+            name, rate, rate * args.size / 1e6))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# scripts/benchmarks/execute_route.py
+""" Measure latency of RequestHandler.execute_route() for reads, writes and
+requests for addresses without route. The results are compared with
+dispatching like uModbus 1.0.2 did, which relied on catching TypeError to
+detect write functions and missing routes.
+
+    $ python scripts/benchmarks/execute_route.py
+
+"""
+import time
+import struct
+import argparse
+
+from umodbus.route import Map
+from umodbus.exceptions import ModbusError, IllegalDataAddressError
+from umodbus.functions import create_function_from_request_pdu
+from umodbus.server.tcp import RequestHandler
+from umodbus.utils import get_function_code_from_request_pdu, \
+    pack_exception_pdu
+
+
+class Server(object):
+    route_map = Map()
+    route_map.add_rule(lambda **kwargs: 0, [1], [3], [0])
+    route_map.add_rule(lambda **kwargs: None, [1], [6], [0])
+
+
+class LegacyRequestHandler(RequestHandler):
+    def execute_route(self, meta_data, request_pdu):
+        try:
+            function = create_function_from_request_pdu(request_pdu)
+
+            try:
+                results = function.execute(meta_data['unit_id'],
+                                           self.server.route_map)
+            except IllegalDataAddressError:
+                # uModbus 1.0.2 called the result of route_map.match(),
+                # which is None for a missing route.
+                endpoint = None
+                try:
+                    endpoint()
+                except TypeError:
+                    raise IllegalDataAddressError()
+
+            try:
+                return function.create_response_pdu(results)
+            except TypeError:
+                return function.create_response_pdu()
+        except ModbusError as e:
+            function_code = get_function_code_from_request_pdu(request_pdu)
+            return pack_exception_pdu(function_code, e.error_code)
+
+
+def create_handler(handler_class):
+    handler_class = type('Handler', (handler_class,),
+                         {'handle': lambda self: None})
+    return handler_class(None, ('127.0.0.1', 50000), Server())
+
+
+def measure(handler, request_pdu, iterations):
+    """ Return average latency of execute_route() in microseconds. """
+    meta_data = {'unit_id': 1}
+
+    start = time.time()
+    for _ in range(iterations):
+        handler.execute_route(meta_data, request_pdu)
+
+    return (time.time() - start) / iterations * 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    requests = [
+        ('read', struct.pack('>BHH', 3, 0, 1)),
+        ('write', struct.pack('>BHH', 6, 0, 1)),
+        ('read, no route', struct.pack('>BHH', 3, 1, 1)),
+        ('write, no route', struct.pack('>BHH', 6, 1, 1)),
+    ]
+
+    legacy = create_handler(LegacyRequestHandler)
+    current = create_handler(RequestHandler)
+
+    print('{0:<16} {1:>12} {2:>12}'.format('request', 'legacy (us)',
+                                           'current (us)'))
+    for name, request_pdu in requests:
+        print('{0:<16} {1:>12.2f} {2:>12.2f}'.format(
+            name, measure(legacy, request_pdu, args.iterations),
+            measure(current, request_pdu, args.iterations)))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# scripts/benchmarks/frame_logging.py
+""" Compare number of requests per second handled by the TCP request handler
+when frames are formatted eagerly, like uModbus 1.0.2 did, with lazy and
+sampled frame logging.
+
+    $ python scripts/benchmarks/frame_logging.py
+
+"""
+import time
+import struct
+import logging
+import argparse
+from binascii import hexlify
+
+from umodbus import conf, log
+from umodbus.route import Map
+from umodbus.server.tcp import RequestHandler
+
+
+class Socket(object):
+    def sendall(self, data):
+        pass
+
+
+class Server(object):
+    route_map = Map()
+    route_map.add_rule(lambda **kwargs: 0, [1], [3], list(range(10)))
+
+
+class EagerLoggingRequestHandler(RequestHandler):
+    """ Request handler which formats every frame, even when logging is
+    disabled.
+    """
+    def respond(self, response_adu):
+        log.info('--> {0} - {1}.'.format(self.client_address[0],
+                 hexlify(response_adu)))
+        self.request.sendall(response_adu)
+
+
+def create_handler(handler_class):
+    handler_class = type('Handler', (handler_class,),
+                         {'handle': lambda self: None})
+    return handler_class(Socket(), ('127.0.0.1', 50000), Server())
+
+
+def run(handler, iterations):
+    adu = struct.pack('>HHHBBHH', 1, 0, 6, 1, 3, 0, 10)
+
+    start = time.time()
+    for _ in range(iterations):
+        handler.respond(handler.process(adu))
+
+    return iterations / (time.time() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    log.setLevel(logging.WARNING)
+    eager = run(create_handler(EagerLoggingRequestHandler), args.iterations)
+    lazy = run(create_handler(RequestHandler), args.iterations)
+
+    log.setLevel(logging.INFO)
+    conf.FRAME_LOG_SAMPLE_RATE = 100
+    sampled = run(create_handler(RequestHandler), args.iterations)
+
+    print('{0:<32} {1:>12}'.format('frame logging', 'requests/s'))
+    print('{0:<32} {1:>12.0f}'.format('eager, level WARNING', eager))
+    print('{0:<32} {1:>12.0f}'.format('lazy, level WARNING', lazy))
+    print('{0:<32} {1:>12.0f}'.format('sampled 1/100, level INFO', sampled))
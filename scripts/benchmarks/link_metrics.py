@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# scripts/benchmarks/link_metrics.py
+""" Measure overhead of updating :class:`LinkMetrics` in
+:func:`umodbus.client.serial.rtu.send_message`.
+
+A loop back serial port is used, which echoes Write Single Register requests
+as valid responses. The silent interval between requests would dominate the
+results, so it's skipped by calling the internal `_send_message()`.
+
+    $ python scripts/benchmarks/link_metrics.py --requests 20000
+
+"""
+import time
+import argparse
+from serial import serial_for_url
+
+from umodbus.client.serial import rtu
+from umodbus.client.serial.metrics import LinkMetrics
+
+
+def run(requests, metrics):
+    serial_port = serial_for_url('loop://', baudrate=1000000, timeout=0)
+    adu = rtu.write_single_register(1, 0, 1)
+
+    start = time.time()
+    for _ in range(requests):
+        rtu._send_message(adu, serial_port, None, metrics)
+
+    return (time.time() - start) / requests
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    print('{0:<10} {1:>14}'.format('', 'us per request'))
+    for name, metrics in [('without', None),
+                          ('with', LinkMetrics(baudrate=1000000))]:
+        print('{0:<10} {1:>14.2f}'.format(name,
+                                          run(args.requests, metrics) * 1e6))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# scripts/benchmarks/multiport_rtu_server.py
+""" Compare CPU time used to serve a number of serial lines with 1 thread per
+line with :class:`umodbus.server.serial.multiport.MultiPortRTUServer`.
+
+Serial lines are pseudo terminals, so this benchmark only runs on Unix-like
+systems. The server runs in a child process which reports its CPU time.
+
+    $ python scripts/benchmarks/multiport_rtu_server.py --lines 8
+
+"""
+import os
+import time
+import select
+import argparse
+from threading import Thread
+from multiprocessing import Process, Queue
+from serial import Serial
+
+from umodbus.client.serial import rtu
+from umodbus.server.serial import get_server
+from umodbus.server.serial.rtu import RTUServer
+from umodbus.server.serial.multiport import MultiPortRTUServer
+from umodbus.server.serial.multiport import get_server as get_multiport_server
+
+
+def add_routes(app):
+    @app.route(slave_ids=[1], function_codes=[3], addresses=list(range(10)))
+    def read(slave_id, function_code, address):
+        return address
+
+
+def threaded(serial_ports, duration):
+    apps = [get_server(RTUServer, serial_port)
+            for serial_port in serial_ports]
+    threads = []
+
+    for app in apps:
+        add_routes(app)
+        t = Thread(target=app.serve_forever)
+        t.daemon = True
+        t.start()
+        threads.append(t)
+
+    time.sleep(duration)
+
+
+def multiport(serial_ports, duration):
+    app = get_multiport_server(MultiPortRTUServer, serial_ports)
+    add_routes(app)
+
+    t = Thread(target=app.serve_forever)
+    t.daemon = True
+    t.start()
+
+    time.sleep(duration)
+    app.shutdown()
+
+
+def server(serve, slave_names, duration, results):
+    serial_ports = [Serial(name, baudrate=115200) for name in slave_names]
+    start = os.times()
+    serve(serial_ports, duration)
+    end = os.times()
+
+    results.put(end[0] + end[1] - start[0] - start[1])
+
+
+def run(serve, lines, duration):
+    ptys = [os.openpty() for _ in range(lines)]
+    results = Queue()
+    p = Process(target=server, args=(serve, [os.ttyname(slave)
+                                             for _, slave in ptys],
+                                     duration, results))
+    p.start()
+    time.sleep(0.5)
+
+    request = rtu.read_holding_registers(1, 0, 10)
+    response_size = 25
+    responses = 0
+    deadline = time.time() + duration - 1
+
+    while time.time() < deadline:
+        for master, _ in ptys:
+            os.write(master, request)
+
+        for master, _ in ptys:
+            data = b''
+            while len(data) < response_size and \
+                    select.select([master], [], [], 1)[0]:
+                data += os.read(master, response_size - len(data))
+            responses += 1
+
+    cpu_time = results.get()
+    p.join()
+
+    for master, slave in ptys:
+        os.close(master)
+        os.close(slave)
+
+    return responses / (duration - 1), cpu_time
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lines', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5)
+    args = parser.parse_args()
+
+    print('{0:<10} {1:>12} {2:>12}'.format('', 'requests/s', 'CPU (s)'))
+    for name, serve in [('threads', threaded), ('multiport', multiport)]:
+        rate, cpu_time = run(serve, args.lines, args.duration)
+        print('{0:<10} {1:>12.0f} {2:>12.2f}'.format(name, rate, cpu_time))
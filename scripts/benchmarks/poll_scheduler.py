@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# scripts/benchmarks/poll_scheduler.py
+""" Compare the cycle time of polling slaves in a fixed order using a fixed
+timeout with :class:`umodbus.client.serial.poll.PollScheduler`.
+
+The serial line is simulated. Most slaves respond within a few
+milliseconds, 1 slave is slow and 1 slave is dead.
+
+    $ python scripts/benchmarks/poll_scheduler.py --slaves 40 --cycles 30
+
+"""
+import time
+import random
+import argparse
+
+from umodbus.client.serial import rtu
+from umodbus.client.serial.poll import PollScheduler
+
+
+class Bus(object):
+    """ Simulated serial line. Slaves echo Write Single Register requests
+    after their latency, slaves with latency None don't respond.
+    """
+    baudrate = 19200
+
+    def __init__(self, latencies, timeout):
+        self.latencies = latencies
+        self.timeout = timeout
+        self._response = b''
+        self._available = 0
+
+    def write(self, adu):
+        latency = self.latencies[bytearray(adu)[0]]
+
+        if latency is not None:
+            self._response = adu
+            self._available = time.time() + latency
+
+    def flush(self):
+        pass
+
+    def read(self, size):
+        wait = self._available - time.time()
+
+        if not self._response or wait > self.timeout:
+            time.sleep(self.timeout)
+            return b''
+
+        time.sleep(max(0, wait))
+        data, self._response = self._response[:size], self._response[size:]
+        return data
+
+
+def fixed(bus, requests, cycles):
+    durations = []
+
+    for _ in range(cycles):
+        start = time.time()
+        for adu in requests:
+            try:
+                rtu.send_message(adu, bus)
+            except ValueError:
+                pass
+        durations.append(time.time() - start)
+
+    return durations
+
+
+def scheduled(bus, requests, cycles, timeout):
+    scheduler = PollScheduler(bus, max_turnaround_time=timeout)
+
+    for adu in requests:
+        scheduler.add(adu)
+
+    durations = []
+    for _ in range(cycles):
+        scheduler.poll()
+        durations.append(scheduler.last_cycle_time)
+
+    return durations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--slaves', type=int, default=40)
+    parser.add_argument('--cycles', type=int, default=30)
+    parser.add_argument('--timeout', type=float, default=0.5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    latencies = dict((slave_id, random.uniform(0.001, 0.005))
+                     for slave_id in range(1, args.slaves + 1))
+    latencies[5] = 0.1
+    latencies[6] = None
+
+    requests = [rtu.write_single_register(slave_id, 0, 1)
+                for slave_id in range(1, args.slaves + 1)]
+
+    print('{0:<10} {1:>12} {2:>12}'.format('', 'first (s)', 'mean (s)'))
+    for name, durations in [
+            ('fixed', fixed(Bus(latencies, args.timeout), requests,
+                            args.cycles)),
+            ('scheduler', scheduled(Bus(latencies, args.timeout), requests,
+                                    args.cycles, args.timeout))]:
+        print('{0:<10} {1:>12.3f} {2:>12.3f}'.format(
+            name, durations[0], sum(durations) / len(durations)))
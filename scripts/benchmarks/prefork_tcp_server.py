@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# scripts/benchmarks/prefork_tcp_server.py
+""" Measure how the number of requests per second handled by
+:class:`umodbus.server.prefork.PreforkServer` scales with the number of
+workers.
+
+    $ python scripts/benchmarks/prefork_tcp_server.py --workers 1 2 4
+
+"""
+import time
+import socket
+import argparse
+from threading import Thread
+from multiprocessing import Process, Queue
+
+from umodbus.client import tcp
+from umodbus.server.data_store import SharedMemoryDataStore
+from umodbus.server.prefork import PreforkServer
+from umodbus.server.tcp import RequestHandler, get_server
+
+
+def connect(address):
+    while True:
+        try:
+            return socket.create_connection(address)
+        except socket.error:
+            time.sleep(0.01)
+
+
+def client(address, duration, results):
+    """ Send Read Holding Registers requests for `duration` seconds and put
+    number of responses in queue.
+    """
+    sock = connect(address)
+    adu = tcp.read_holding_registers(slave_id=1, starting_address=0,
+                                     quantity=10)
+    count = 0
+    deadline = time.time() + duration
+
+    while time.time() < deadline:
+        tcp.send_message(adu, sock)
+        count += 1
+
+    sock.close()
+    results.put(count)
+
+
+def run(workers, clients, duration):
+    app = get_server(PreforkServer, ('localhost', 0), RequestHandler)
+    app.workers = workers
+
+    data_store = SharedMemoryDataStore(holding_registers=10)
+    data_store.bind_routes(app, slave_ids=[1])
+
+    t = Thread(target=app.serve_forever)
+    t.start()
+
+    results = Queue()
+    processes = [Process(target=client,
+                         args=(app.server_address, duration, results))
+                 for _ in range(clients)]
+
+    try:
+        for p in processes:
+            p.start()
+
+        total = sum(results.get() for _ in processes)
+
+        for p in processes:
+            p.join()
+    finally:
+        app.shutdown()
+        t.join()
+        app.server_close()
+
+    return total / duration
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5)
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>12}'.format('workers', 'requests/s'))
+    for workers in args.workers:
+        rate = run(workers, args.clients, args.duration)
+        print('{0:>8} {1:>12.0f}'.format(workers, rate))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# scripts/benchmarks/read_planner.py
+""" Compare reading scattered tags with 1 request per tag to reading them
+with the requests planned by :func:`umodbus.client.planner.plan_reads`.
+
+    $ python scripts/benchmarks/read_planner.py --tags 300 --gaps 0 8 32
+
+The server runs on localhost, `--rtt` adds the round trip time of a real
+link to every request.
+
+"""
+import time
+import random
+import socket
+import argparse
+from functools import partial
+from threading import Thread
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import tcp
+from umodbus.client.planner import read
+from umodbus.functions import READ_HOLDING_REGISTERS
+from umodbus.server.tcp import RequestHandler, get_server
+
+ADDRESSES = 2000
+
+
+def create_device():
+    app = get_server(TCPServer, ('localhost', 0), RequestHandler)
+
+    @app.route(slave_ids=[1], function_codes=[READ_HOLDING_REGISTERS],
+               addresses=list(range(ADDRESSES)))
+    def registers(slave_id, function_code, address):
+        return address
+
+    t = Thread(target=app.serve_forever)
+    t.daemon = True
+    t.start()
+
+    return app
+
+
+class CountingSender(object):
+    def __init__(self, sock, rtt):
+        self.send_message = partial(tcp.send_message, sock=sock)
+        self.rtt = rtt
+        self.requests = 0
+
+    def __call__(self, adu):
+        self.requests += 1
+        time.sleep(self.rtt)
+        return self.send_message(adu)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tags', type=int, default=300)
+    parser.add_argument('--gaps', type=int, nargs='+', default=[0, 8, 32])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rtt', type=float, default=0.002)
+    args = parser.parse_args()
+
+    random.seed(1)
+    needs = [(1, READ_HOLDING_REGISTERS, address, random.choice([1, 2]))
+             for address in random.sample(range(ADDRESSES - 2), args.tags)]
+
+    sock = socket.create_connection(create_device().server_address)
+
+    print('{0:>10} {1:>10} {2:>10}'.format('strategy', 'requests',
+                                           'ms/scan'))
+
+    send_message = CountingSender(sock, args.rtt)
+    start = time.time()
+    for _ in range(args.repeat):
+        for slave_id, function_code, address, count in needs:
+            send_message(tcp.read_holding_registers(slave_id, address, count))
+    print('{0:>10} {1:>10} {2:>10.2f}'.format(
+        'per tag', send_message.requests // args.repeat,
+        (time.time() - start) / args.repeat * 1000))
+
+    for gap in args.gaps:
+        send_message = CountingSender(sock, args.rtt)
+        start = time.time()
+        for _ in range(args.repeat):
+            read(needs, tcp, send_message, max_gap=gap)
+        print('{0:>10} {1:>10} {2:>10.2f}'.format(
+            'gap {0}'.format(gap), send_message.requests // args.repeat,
+            (time.time() - start) / args.repeat * 1000))
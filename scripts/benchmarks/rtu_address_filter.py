@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# scripts/benchmarks/rtu_address_filter.py
+""" Measure CPU time per frame an RTU server spends on a busy bus, with and
+without ignoring frames addressed to other slaves early.
+
+The bus carries requests and responses for `--slaves` slaves, the server
+serves only slave 1.
+
+    $ python scripts/benchmarks/rtu_address_filter.py --slaves 30
+
+"""
+import time
+import argparse
+
+from umodbus.route import Map
+from umodbus.client.serial import rtu
+from umodbus.serial_framer import RTUFramer
+from umodbus.client.serial.redundancy_check import add_crc
+from umodbus.server.serial.rtu import RTUServer
+
+
+def create_traffic(slaves, frames):
+    """ Return list with frames on the bus, each followed by silence. """
+    traffic = []
+
+    for i in range(frames // 2):
+        slave_id = i % slaves + 1
+        traffic.append(rtu.read_holding_registers(slave_id, 0, 10))
+        traffic.append(add_crc(bytes(bytearray([slave_id, 3, 20])) +
+                               b'\x00' * 20))
+
+    return traffic
+
+
+def run(traffic, slave_ids):
+    server = RTUServer()
+    server.route_map = Map()
+    server.route_map.add_rule(lambda **kwargs: 0, [1], [3], range(10))
+    server.framer = RTUFramer(slave_ids=slave_ids)
+    handled = 0
+
+    start = time.time()
+    for frame in traffic:
+        request_adus = server.framer.feed(frame) + server.framer.flush()
+
+        for request_adu in request_adus:
+            super(RTUServer, server).process(request_adu)
+            handled += 1
+
+    return (time.time() - start) / len(traffic), handled
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--slaves', type=int, default=30)
+    parser.add_argument('--frames', type=int, default=20000)
+    args = parser.parse_args()
+
+    traffic = create_traffic(args.slaves, args.frames)
+
+    print('{0:<10} {1:>16} {2:>10}'.format('', 'us per frame', 'handled'))
+    for name, slave_ids in [('all', None), ('filtered', set([1]))]:
+        duration, handled = run(traffic, slave_ids)
+        print('{0:<10} {1:>16.2f} {2:>10}'.format(name, duration * 1e6,
+                                                  handled))
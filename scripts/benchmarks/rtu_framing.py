@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# scripts/benchmarks/rtu_framing.py
+""" Compare RTU framing based on timing alone, like uModbus 1.0.2 did by
+reading up to 256 bytes per frame, with :class:`RTUFramer`.
+
+A stream of requests is cut in chunks as a serial port would return them:
+some frames arrive back to back in 1 read, some are split over 2 reads and
+random noise is injected between frames.
+
+    $ python scripts/benchmarks/rtu_framing.py --noise 0.05
+
+"""
+import os
+import time
+import random
+import argparse
+
+from umodbus.client.serial import rtu
+from umodbus.serial_framer import RTUFramer
+from umodbus.client.serial.redundancy_check import validate_crc, CRCError
+
+
+def create_chunks(frames, noise, merge, split):
+    """ Return list with chunks of bytes like they're read from serial
+    port.
+    """
+    chunks = []
+    pending = b''
+
+    for frame in frames:
+        if random.random() < noise:
+            pending += os.urandom(random.randint(1, 4))
+
+        pending += frame
+
+        if random.random() < merge:
+            continue
+
+        if random.random() < split:
+            index = random.randint(1, len(pending) - 1)
+            chunks.extend([pending[:index], pending[index:]])
+        else:
+            chunks.append(pending)
+
+        pending = b''
+
+    if pending:
+        chunks.append(pending)
+
+    return chunks
+
+
+def timing_based(chunks):
+    """ Every chunk is a frame. """
+    frames = crc_errors = 0
+
+    for chunk in chunks:
+        try:
+            validate_crc(chunk)
+            frames += 1
+        except CRCError:
+            crc_errors += 1
+
+    return frames, crc_errors
+
+
+def framer_based(chunks):
+    framer = RTUFramer()
+
+    for chunk in chunks:
+        framer.feed(chunk)
+
+    framer.flush()
+
+    return framer.frames, framer.crc_errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--noise', type=float, default=0.01,
+                        help='Chance noise precedes a frame.')
+    parser.add_argument('--merge', type=float, default=0.05,
+                        help='Chance a frame is read together with the next.')
+    parser.add_argument('--split', type=float, default=0.05,
+                        help='Chance a frame is split over 2 reads.')
+    args = parser.parse_args()
+
+    random.seed(0)
+    builders = [
+        lambda i: rtu.read_holding_registers(i % 247 + 1, i, 10),
+        lambda i: rtu.write_single_coil(i % 247 + 1, i, 1),
+        lambda i: rtu.write_multiple_registers(i % 247 + 1, i,
+                                               list(range(i % 60 + 1))),
+    ]
+    frames = [builders[i % 3](i) for i in range(args.frames)]
+    chunks = create_chunks(frames, args.noise, args.merge, args.split)
+
+    print('{0:<8} {1:>10} {2:>12} {3:>12}'.format(
+        '', 'frames', 'CRC errors', 'frames/s'))
+    for name, f in [('timing', timing_based), ('framer', framer_based)]:
+        start = time.time()
+        received, crc_errors = f(chunks)
+        rate = len(frames) / (time.time() - start)
+
+        print('{0:<8} {1:>10} {2:>12} {3:>12.0f}'.format(
+            name, received, crc_errors, rate))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# scripts/benchmarks/rtu_sniffer.py
+""" Measure how many frames per second :class:`Sniffer` analyses and check
+its memory use doesn't grow with the number of frames.
+
+    $ python scripts/benchmarks/rtu_sniffer.py --frames 100000
+
+"""
+import time
+import argparse
+import tracemalloc
+
+from umodbus.client.serial import rtu
+from umodbus.client.serial.sniffer import Sniffer
+from umodbus.client.serial.redundancy_check import add_crc
+
+
+def create_traffic(slaves):
+    """ Return list with 1 poll cycle: a request and response per slave. """
+    traffic = []
+
+    for slave_id in range(1, slaves + 1):
+        traffic.append(rtu.read_holding_registers(slave_id, 0, 10))
+        traffic.append(add_crc(bytes(bytearray([slave_id, 3, 20])) +
+                               b'\x00' * 20))
+
+    return traffic
+
+
+def sniff(frames, traffic):
+    sniffer = Sniffer(baudrate=19200)
+    timestamp = 0.0
+
+    for i in range(frames):
+        frame = traffic[i % len(traffic)]
+        timestamp += rtu.get_transmission_time(len(frame), 19200) + 0.005
+        sniffer.feed(frame, timestamp)
+
+    return sniffer
+
+
+def run(frames, traffic):
+    start = time.time()
+    sniff(frames, traffic)
+    duration = time.time() - start
+
+    # Tracing slows down allocations, so memory is measured in a second run.
+    tracemalloc.start()
+    sniffer = sniff(frames, traffic)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert sniffer.frames == frames
+
+    return frames / duration, memory
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--slaves', type=int, default=30)
+    args = parser.parse_args()
+
+    traffic = create_traffic(args.slaves)
+
+    print('{0:>10} {1:>12} {2:>12}'.format('frames', 'frames/s',
+                                           'memory (B)'))
+    for frames in [args.frames // 10, args.frames]:
+        rate, memory = run(frames, traffic)
+        print('{0:>10} {1:>12.0f} {2:>12}'.format(frames, rate, memory))
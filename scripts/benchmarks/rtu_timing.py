@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# scripts/benchmarks/rtu_timing.py
+""" Measure duration of a poll cycle over a number of slaves of which some are
+offline, once using a fixed timeout and once with the response timeout
+derived from the baudrate.
+
+A loop back serial port is used. Requests to online slaves are echoed, which
+is a valid response to a Write Single Register request. Requests to offline
+slaves are dropped.
+
+    $ python scripts/benchmarks/rtu_timing.py --slaves 30 --offline 3
+
+"""
+import time
+import argparse
+from serial import serial_for_url
+
+from umodbus.client.serial import rtu
+
+
+class Bus(object):
+    """ Loop back serial port on which some slaves don't respond. """
+    def __init__(self, baudrate, timeout, offline):
+        self.port = serial_for_url('loop://', baudrate=baudrate,
+                                   timeout=timeout)
+        self.offline = offline
+
+    def __getattr__(self, name):
+        return getattr(self.port, name)
+
+    def __setattr__(self, name, value):
+        if name in ('timeout',):
+            return setattr(self.port, name, value)
+
+        object.__setattr__(self, name, value)
+
+    def write(self, data):
+        if bytearray(data)[0] not in self.offline:
+            self.port.write(data)
+
+
+def poll_cycle(bus, slaves, turnaround_time):
+    for slave_id in range(1, slaves + 1):
+        adu = rtu.write_single_register(slave_id, 0, 1)
+        try:
+            rtu.send_message(adu, bus, turnaround_time=turnaround_time)
+        except ValueError:
+            pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--slaves', type=int, default=30)
+    parser.add_argument('--offline', type=int, default=3)
+    parser.add_argument('--baudrate', type=int, default=19200)
+    parser.add_argument('--timeout', type=float, default=1,
+                        help='Fixed timeout of serial port.')
+    parser.add_argument('--turnaround', type=float, default=0.02)
+    args = parser.parse_args()
+
+    offline = set(range(1, args.offline + 1))
+
+    print('{0:<10} {1:>12}'.format('', 'cycle (s)'))
+    for name, turnaround_time in [('fixed', None),
+                                  ('derived', args.turnaround)]:
+        bus = Bus(args.baudrate, args.timeout, offline)
+        start = time.time()
+        poll_cycle(bus, args.slaves, turnaround_time)
+        print('{0:<10} {1:>12.3f}'.format(name, time.time() - start))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# scripts/benchmarks/tcp_rtu_gateway.py
+""" Measure how requests of multiple Modbus TCP/IP clients queue for the
+serial line of a :class:`umodbus.server.gateway.GatewayServer`.
+
+    $ python scripts/benchmarks/tcp_rtu_gateway.py --clients 1 4 16
+
+The serial line is a `loop://` port, which echoes the Write Single Register
+requests. That equals a valid response, so the line itself is very fast and
+the overhead of the gateway is measured.
+
+"""
+import time
+import socket
+import argparse
+from threading import Thread
+from serial import serial_for_url
+
+from umodbus.client import tcp
+from umodbus.server.gateway import GatewayServer, RequestHandler
+
+
+def client(address, duration, results):
+    sock = socket.create_connection(address)
+    adu = tcp.write_single_register(slave_id=1, address=0, value=1)
+    count = 0
+    deadline = time.time() + duration
+
+    while time.time() < deadline:
+        tcp.send_message(adu, sock)
+        count += 1
+
+    sock.close()
+    results.append(count)
+
+
+def run(clients, duration):
+    app = GatewayServer(('localhost', 0), RequestHandler)
+    line = app.add_line(serial_for_url('loop://', timeout=1), unit_ids=[1])
+
+    t = Thread(target=app.serve_forever)
+    t.start()
+
+    results = []
+    threads = [Thread(target=client,
+                      args=(app.server_address, duration, results))
+               for _ in range(clients)]
+    max_queue_depth = 0
+
+    try:
+        for c in threads:
+            c.start()
+
+        while any(c.is_alive() for c in threads):
+            max_queue_depth = max(max_queue_depth, app.queue_depths[0])
+            time.sleep(0.001)
+    finally:
+        app.shutdown()
+        t.join()
+        app.server_close()
+
+    return (sum(results) / duration, max_queue_depth,
+            line.mean_wait_time, line.occupancy)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--duration', type=float, default=3)
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>12} {2:>10} {3:>13} {4:>10}'.format(
+        'clients', 'requests/s', 'max queue', 'mean wait ms', 'occupancy'))
+    for clients in args.clients:
+        rate, depth, wait, occupancy = run(clients, args.duration)
+        print('{0:>8} {1:>12.0f} {2:>10} {3:>13.3f} {4:>10.1%}'.format(
+            clients, rate, depth, wait * 1000, occupancy))
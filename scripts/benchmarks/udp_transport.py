@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# scripts/benchmarks/udp_transport.py
+""" Compare the latency of requests send over Modbus TCP/IP with those send
+as UDP datagrams, see :mod:`umodbus.client.udp`.
+
+    $ python scripts/benchmarks/udp_transport.py --requests 10000
+
+"""
+import time
+import socket
+import argparse
+from threading import Thread
+try:
+    from socketserver import TCPServer, UDPServer
+except ImportError:
+    from SocketServer import TCPServer, UDPServer
+
+from umodbus.client import tcp, udp
+from umodbus.server import tcp as tcp_server, udp as udp_server
+
+
+def create_app(server_class, request_handler_class):
+    app = tcp_server.get_server(server_class, ('localhost', 0),
+                                request_handler_class)
+
+    @app.route(slave_ids=[1], function_codes=[3], addresses=list(range(10)))
+    def read_data_store(slave_id, function_code, address):
+        return address
+
+    return app
+
+
+def measure(app, create_socket, send_message, requests):
+    """ Return sorted list with latency of every request in seconds. """
+    t = Thread(target=app.serve_forever)
+    t.start()
+
+    sock = create_socket(app.server_address)
+    adu = tcp.read_holding_registers(slave_id=1, starting_address=0,
+                                     quantity=10)
+    latencies = []
+
+    try:
+        for _ in range(requests):
+            start = time.time()
+            send_message(adu, sock)
+            latencies.append(time.time() - start)
+    finally:
+        sock.close()
+        app.shutdown()
+        t.join()
+        app.server_close()
+
+    return sorted(latencies)
+
+
+def create_udp_socket(address):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(address)
+    sock.settimeout(0.5)
+
+    return sock
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=10000)
+    args = parser.parse_args()
+
+    transports = [
+        ('tcp', create_app(TCPServer, tcp_server.RequestHandler),
+         socket.create_connection, tcp.send_message),
+        ('udp', create_app(UDPServer, udp_server.RequestHandler),
+         create_udp_socket, udp.send_message),
+    ]
+
+    print('{0:>9} {1:>9} {2:>9} {3:>9}'.format('transport', 'p50 us',
+                                               'p99 us', 'max us'))
+    for name, app, create_socket, send_message in transports:
+        latencies = measure(app, create_socket, send_message, args.requests)
+        print('{0:>9} {1:>9.0f} {2:>9.0f} {3:>9.0f}'.format(
+            name, latencies[len(latencies) // 2] * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6,
+            latencies[-1] * 1e6))
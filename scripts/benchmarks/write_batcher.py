@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# scripts/benchmarks/write_batcher.py
+""" Compare writing changed values with 1 Write Single Register request per
+value to writing them with a :class:`umodbus.client.batcher.WriteBatcher`.
+
+    $ python scripts/benchmarks/write_batcher.py --values 500 --rtt 0.002
+
+The server runs on localhost, `--rtt` adds the round trip time of a real
+link to every request.
+
+"""
+import time
+import random
+import socket
+import argparse
+from threading import Thread
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import tcp
+from umodbus.client.batcher import WriteBatcher
+from umodbus.server.tcp import RequestHandler, get_server
+
+ADDRESSES = 1000
+
+
+class DelayedSocket(object):
+    """ Socket which waits the round trip time before every send. """
+    def __init__(self, sock, rtt):
+        self.sock = sock
+        self.rtt = rtt
+
+    def sendall(self, data):
+        time.sleep(self.rtt)
+        self.sock.sendall(data)
+
+    def recv(self, size):
+        return self.sock.recv(size)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--values', type=int, default=500)
+    parser.add_argument('--rtt', type=float, default=0.002)
+    args = parser.parse_args()
+
+    app = get_server(TCPServer, ('localhost', 0), RequestHandler)
+
+    @app.route(slave_ids=[1], function_codes=[6, 16],
+               addresses=list(range(ADDRESSES)))
+    def registers(slave_id, function_code, address, value):
+        pass
+
+    t = Thread(target=app.serve_forever)
+    t.daemon = True
+    t.start()
+
+    sock = DelayedSocket(socket.create_connection(app.server_address),
+                         args.rtt)
+
+    # Changes are clustered, like values of a few devices changing at once.
+    random.seed(1)
+    changes = []
+    while len(changes) < args.values:
+        start = random.randrange(ADDRESSES - 20)
+        changes.extend((address, random.randrange(100))
+                       for address in range(start, start + 20))
+    changes = changes[:args.values]
+
+    start = time.time()
+    for address, value in changes:
+        tcp.send_message(tcp.write_single_register(1, address, value), sock)
+    single = time.time() - start
+
+    start = time.time()
+    with WriteBatcher(tcp, sock, window=None) as batcher:
+        for address, value in changes:
+            batcher.write_single_register(1, address, value)
+    batched = time.time() - start
+
+    print('{0:>8} {1:>9} {2:>9}'.format('method', 'requests', 'ms'))
+    print('{0:>8} {1:>9} {2:>9.1f}'.format('single', len(changes),
+                                           single * 1000))
+    print('{0:>8} {1:>9} {2:>9.1f}'.format('batched', batcher.requests,
+                                           batched * 1000))
+    print('Round trips saved: {0}.'.format(batcher.round_trips_saved))
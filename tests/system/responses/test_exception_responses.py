@@ -81,3 +81,26 @@ def test_request_returning_server_device_failure_error(sock, function):
 
     validate_response_mbap(mbap, resp)
     assert struct.unpack('>BB', resp[-2:]) == (0x80 + function_code, 4)
+
+
+@pytest.mark.parametrize('function', [
+    (partial(tcp.read_coils, 1, 667, 1)),
+    (partial(tcp.read_holding_registers, 1, 667, 1)),
+    (partial(tcp.write_single_coil, 1, 667, 0)),
+    (partial(tcp.write_multiple_registers, 1, 667, [1337])),
+])
+def test_type_error_in_route_returns_server_device_failure_error(sock,
+                                                                 function):
+    """ A TypeError raised by a route is a failure of the server, not a
+    missing route. The response must contain error code 4, not 2.
+    """
+    adu = function()
+
+    mbap = adu[:7]
+    function_code = struct.unpack('>B', adu[7:8])[0]
+
+    sock.send(adu)
+    resp = sock.recv(1024)
+
+    validate_response_mbap(mbap, resp)
+    assert struct.unpack('>BB', resp[-2:]) == (0x80 + function_code, 4)
@@ -6,17 +6,24 @@ from ..validators import validate_response_mbap
 
 from umodbus.client.serial import rtu
 from umodbus.client.serial.redundancy_check import (get_crc, validate_crc,
-                                                    add_crc, CRCError)
+                                                    add_crc)
 
 
 def test_no_response_for_request_with_invalid_crc(rtu_server):
     """ Test if server doesn't respond on a request with an invalid CRC. """
-    pdu = rtu.read_coils(1, 9, 2)
+    pdu = struct.pack('>BHH', 1, 9, 2)
     adu = struct.pack('>B', 1) + pdu + struct.pack('>BB', 0, 0)
 
     rtu_server.serial_port.write(adu)
+    crc_errors = rtu_server.framer.crc_errors
 
-    with pytest.raises(CRCError):
+    rtu_server.serve_once()
+
+    assert rtu_server.serial_port.in_waiting == 0
+    assert rtu_server.framer.crc_errors > crc_errors
+
+    # Remaining bytes are discarded when the line is silent.
+    with pytest.raises(ValueError):
         rtu_server.serve_once()
 
 
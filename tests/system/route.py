@@ -4,6 +4,7 @@ def bind_routes(server):
     server.route_map.add_rule(write_status, slave_ids=[1], function_codes=[5, 15], addresses=list(range(0, 10)))  # NOQA
     server.route_map.add_rule(write_register, slave_ids=[1], function_codes=[6, 16], addresses=list(range(0, 10)))  # NOQA
     server.route_map.add_rule(failure, slave_ids=[1], function_codes=[1, 2, 3, 4, 5, 6, 15, 16], addresses=[666])  # NOQA
+    server.route_map.add_rule(type_error, slave_ids=[1], function_codes=[1, 2, 3, 4, 5, 6, 15, 16], addresses=[667])  # NOQA
 
 
 def read_status(slave_id, function_code, address):
@@ -24,3 +25,7 @@ def write_register(slave_id, function_code, address, value):
 
 def failure(*args, **kwargs):
     raise Exception
+
+
+def type_error(*args, **kwargs):
+    raise TypeError
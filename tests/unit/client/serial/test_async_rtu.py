@@ -0,0 +1,101 @@
+import os
+import asyncio
+import pytest
+from serial import Serial, serial_for_url
+
+from umodbus.exceptions import IllegalDataAddressError
+from umodbus.client.serial.rtu import read_coils, write_single_register
+from umodbus.client.serial.redundancy_check import add_crc, CRCError
+from umodbus.client.serial.async_rtu import AsyncRTUClient, wait_for_data
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_send_message():
+    """ The loop echoes the request, which equals a valid response to a Write
+    Single Register request.
+    """
+    message = write_single_register(slave_id=1, address=2, value=1337)
+
+    async def send():
+        client = AsyncRTUClient(serial_for_url('loop://', timeout=1))
+        return await client.send_message(message)
+
+    assert run(send()) == 1337
+
+
+def test_send_message_with_timeout():
+    message = read_coils(slave_id=1, starting_address=1, quantity=40)
+
+    async def send():
+        client = AsyncRTUClient(serial_for_url('loop://', timeout=1))
+        await client.send_message(message, turnaround_time=0.01)
+
+    with pytest.raises(ValueError):
+        run(send())
+
+
+def test_concurrent_messages_are_serialised():
+    messages = [write_single_register(slave_id=1, address=2, value=value)
+                for value in range(5)]
+
+    async def send():
+        client = AsyncRTUClient(serial_for_url('loop://', timeout=1))
+        return await asyncio.gather(*[client.send_message(message)
+                                      for message in messages])
+
+    assert run(send()) == list(range(5))
+
+
+@pytest.mark.parametrize('response, exception', [
+    (add_crc(b'\x01\x81\x02'), IllegalDataAddressError),
+    # Exception code has been corrupted on the line.
+    (b'\x01\x81\x04' + add_crc(b'\x01\x81\x02')[-2:], CRCError),
+])
+def test_send_message_with_exception_response(response, exception):
+    """ The response is written to the loop before the request, so it's
+    received before the echo of the request.
+    """
+    message = read_coils(slave_id=1, starting_address=1, quantity=40)
+    client = AsyncRTUClient(serial_for_url('loop://', timeout=1))
+    client.serial_port.write(response)
+
+    with pytest.raises(exception):
+        run(client.send_message(message))
+
+    assert client.metrics.exception_responses == \
+        int(exception is IllegalDataAddressError)
+    assert client.metrics.crc_errors == int(exception is CRCError)
+
+
+def test_client_created_outside_event_loop():
+    """ Client can be created before the event loop it's used from. """
+    client = AsyncRTUClient(serial_for_url('loop://', timeout=1))
+    message = write_single_register(slave_id=1, address=2, value=1337)
+
+    assert run(client.send_message(message)) == 1337
+    assert run(client.send_message(message)) == 1337
+
+
+def test_wait_for_data_on_file_descriptor():
+    master, slave = os.openpty()
+    serial_port = Serial(os.ttyname(slave), baudrate=19200, timeout=0)
+
+    async def wait():
+        assert not await wait_for_data(serial_port, 0.01)
+
+        asyncio.get_event_loop().call_later(0.01, os.write, master, b'\x01')
+        assert await wait_for_data(serial_port, 1)
+
+    try:
+        run(wait())
+    finally:
+        serial_port.close()
+        os.close(slave)
+        os.close(master)
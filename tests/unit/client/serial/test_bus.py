@@ -0,0 +1,109 @@
+import time
+import pytest
+from threading import Thread
+from serial import serial_for_url
+
+from umodbus.client.serial.rtu import write_single_register
+from umodbus.client.serial.bus import (BusMaster, DeadlineExceededError,
+                                       PRIORITY_CONTROL, PRIORITY_POLL)
+
+
+@pytest.fixture
+def bus():
+    return BusMaster(serial_for_url('loop://', timeout=0))
+
+
+def wait_for_queue_depth(bus, depth):
+    while bus.queue_depth < depth:
+        time.sleep(0.001)
+
+
+def test_send_message(bus):
+    """ The loop echoes the request, which equals a valid response to a Write
+    Single Register request.
+    """
+    message = write_single_register(slave_id=1, address=2, value=1337)
+
+    assert bus.send_message(message) == 1337
+    assert bus.transactions == 1
+    assert bus.queue_depth == 0
+    assert (bus.metrics.frames_out, bus.metrics.frames_in) == (1, 1)
+
+    bus.reset_metrics()
+    assert bus.metrics.frames_out == 0
+
+
+def test_requests_are_served_by_priority(bus):
+    """ Requests waiting for the bus are served by priority, requests with
+    equal priority in order of arrival.
+    """
+    order = []
+
+    def request(name, priority):
+        with bus.acquire(priority):
+            order.append(name)
+
+    threads = []
+    with bus.acquire():
+        for name, priority in [('poll 1', PRIORITY_POLL),
+                               ('control', PRIORITY_CONTROL),
+                               ('poll 2', PRIORITY_POLL)]:
+            t = Thread(target=request, args=(name, priority))
+            t.start()
+            threads.append(t)
+            wait_for_queue_depth(bus, len(threads))
+
+    for t in threads:
+        t.join()
+
+    assert order == ['control', 'poll 1', 'poll 2']
+
+
+def test_deadline_exceeded(bus):
+    """ A request which doesn't get the bus in time is removed from the
+    queue.
+    """
+    with bus.acquire():
+        with pytest.raises(DeadlineExceededError):
+            with bus.acquire(PRIORITY_CONTROL, timeout=0.01):
+                pass
+
+        assert bus.queue_depth == 0
+
+    assert bus.expired_requests == 1
+
+    # The bus must still be usable.
+    with bus.acquire(timeout=0):
+        pass
+
+
+def test_bus_is_released_after_error(bus):
+    with pytest.raises(ValueError):
+        with bus.acquire():
+            raise ValueError
+
+    with bus.acquire(timeout=0):
+        pass
+
+
+def test_metrics(bus):
+    def request():
+        with bus.acquire():
+            pass
+
+    with bus.acquire():
+        t = Thread(target=request)
+        t.start()
+        wait_for_queue_depth(bus, 1)
+        time.sleep(0.02)
+
+    t.join()
+
+    assert bus.transactions == 2
+    assert bus.max_wait_time >= 0.02
+    assert bus.mean_wait_time == bus.wait_time / 2
+    assert 0 < bus.occupancy <= 1
+
+    bus.reset_metrics()
+    assert bus.transactions == 0
+    assert bus.busy_time == 0
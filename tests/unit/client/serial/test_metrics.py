@@ -0,0 +1,59 @@
+import pytest
+from serial import serial_for_url
+
+from umodbus.client.serial.rtu import (send_message, read_coils,
+                                       write_single_register)
+from umodbus.client.serial.metrics import LinkMetrics
+
+
+@pytest.fixture
+def metrics():
+    return LinkMetrics(baudrate=19200)
+
+
+def test_link_metrics(metrics):
+    metrics.frame_sent(b'\x00' * 8)
+    metrics.frame_received(b'\x00' * 5)
+
+    assert (metrics.frames_out, metrics.bytes_out) == (1, 8)
+    assert (metrics.frames_in, metrics.bytes_in) == (1, 5)
+    assert 0 < metrics.utilisation <= 1
+
+    metrics.reset()
+    assert metrics.bytes_in == 0
+
+
+def test_link_metrics_utilisation_at_high_baudrate():
+    """ Above 19200 baud a character still takes 11 bits on the line. """
+    metrics = LinkMetrics(baudrate=115200)
+    metrics.started -= 1
+    metrics.frame_sent(b'\x00' * 5760)
+
+    assert metrics.utilisation == pytest.approx(0.55, rel=0.01)
+
+
+def test_link_metrics_without_baudrate():
+    assert LinkMetrics().utilisation is None
+
+
+def test_send_message_updates_metrics(metrics):
+    s = serial_for_url('loop://', timeout=0)
+    message = write_single_register(slave_id=1, address=2, value=1337)
+
+    send_message(message, s, metrics=metrics)
+
+    assert (metrics.frames_out, metrics.frames_in) == (1, 1)
+    assert metrics.bytes_in == metrics.bytes_out == len(message)
+
+
+def test_send_message_counts_timeouts(metrics):
+    s = serial_for_url('loop://', timeout=0)
+    # The echoed request is shorter than the response.
+    message = read_coils(slave_id=1, starting_address=1, quantity=40)
+
+    with pytest.raises(ValueError):
+        send_message(message, s, metrics=metrics)
+
+    assert metrics.timeouts == 1
+    assert metrics.frames_in == 0
+    assert metrics.bytes_in == len(message)
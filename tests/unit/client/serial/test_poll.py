@@ -0,0 +1,132 @@
+import time
+import pytest
+
+from umodbus.client.serial.rtu import write_single_register
+from umodbus.client.serial.poll import PollScheduler, SlaveStatistics
+
+
+class Bus(object):
+    """ Simulated serial line. Slaves echo Write Single Register requests
+    after their latency, slaves with latency None don't respond.
+    """
+    baudrate = 115200
+
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.timeout = 1
+        self.requests = []
+        self._response = b''
+        self._available = 0
+
+    def write(self, adu):
+        self.requests.append(adu)
+        latency = self.latencies[bytearray(adu)[0]]
+
+        if latency is not None:
+            self._response = adu
+            self._available = time.time() + latency
+
+    def flush(self):
+        pass
+
+    def read(self, size):
+        wait = self._available - time.time()
+
+        if not self._response or wait > self.timeout:
+            time.sleep(self.timeout)
+            return b''
+
+        time.sleep(max(0, wait))
+        data, self._response = self._response[:size], self._response[size:]
+        return data
+
+
+@pytest.fixture
+def bus():
+    return Bus({1: 0, 2: None, 3: 0.01})
+
+
+@pytest.fixture
+def scheduler(bus):
+    scheduler = PollScheduler(bus, max_turnaround_time=0.05)
+
+    for slave_id in [2, 3, 1]:
+        scheduler.add(write_single_register(slave_id, 0, slave_id))
+
+    return scheduler
+
+
+def test_slave_statistics():
+    statistics = SlaveStatistics()
+    assert statistics.get_turnaround_time(0.005, 1) == 1
+
+    statistics.add_response(0.01)
+    assert statistics.latency == 0.01
+    assert statistics.get_turnaround_time(0.005, 1) == pytest.approx(0.03)
+
+    statistics.add_response(0.01)
+    assert statistics.deviation < 0.005
+
+    statistics.add_failure(max_backoff=4)
+    assert statistics.get_turnaround_time(0.005, 1) == 1
+
+
+def test_slave_statistics_backoff():
+    statistics = SlaveStatistics()
+
+    skip_cycles = []
+    for _ in range(5):
+        statistics.add_failure(max_backoff=4)
+        skip_cycles.append(statistics.skip_cycles)
+
+    assert skip_cycles == [0, 1, 3, 3, 3]
+
+    statistics.add_response()
+    assert statistics.skip_cycles == 0
+
+
+def test_poll(scheduler):
+    results = scheduler.poll()
+
+    assert isinstance(results[0], ValueError)
+    assert results[1:] == [3, 1]
+    assert scheduler.cycles == 1
+    assert scheduler.last_cycle_time == scheduler.mean_cycle_time
+
+    assert scheduler.statistics[1].latency < scheduler.statistics[3].latency
+    assert scheduler.statistics[2].consecutive_failures == 1
+
+    metrics = scheduler.metrics
+    assert (metrics.frames_out, metrics.frames_in, metrics.timeouts) == \
+        (3, 2, 1)
+
+
+def test_poll_learns_latency_at_high_baudrate(scheduler, bus):
+    """ At 115200 baud the 16 bytes of request and response take 1.5 ms, so
+    at least 8.5 ms of the 10 ms it takes slave 3 to respond is latency.
+    """
+    scheduler.poll()
+
+    assert 0.0085 <= scheduler.statistics[3].latency < 0.02
+
+
+def test_poll_orders_slaves_by_latency(scheduler, bus):
+    scheduler.poll()
+    bus.requests = []
+    scheduler.poll()
+
+    assert [bytearray(adu)[0] for adu in bus.requests] == [1, 3, 2]
+
+
+def test_poll_skips_dead_slave(scheduler, bus):
+    scheduler.poll()
+    scheduler.poll()
+    bus.requests = []
+
+    # Slave 2 failed twice, so it's skipped for 1 cycle.
+    results = scheduler.poll()
+    assert results == [None, 3, 1]
+    assert len(bus.requests) == 2
+
+    scheduler.poll()
+    assert len(bus.requests) == 5
@@ -2,7 +2,7 @@ import struct
 import pytest
 
 from umodbus.client.serial.redundancy_check import (get_crc, validate_crc,
-                                                    CRCError)
+                                                    CRCAccumulator, CRCError)
 
 
 def test_get_crc():
@@ -22,3 +22,65 @@ def test_validate_invalid_crc():
     """" Method should raise assertion error. """
     with pytest.raises(CRCError):
         validate_crc(b'\x01\x02\x07')
+
+
+def get_crc_bitwise(msg):
+    """ Calculate CRC bit by bit, without look up tables. """
+    register = 0xFFFF
+
+    for byte_ in bytearray(msg):
+        register ^= byte_
+        for _ in range(8):
+            if register & 0x0001:
+                register = (register >> 1) ^ 0xA001
+            else:
+                register >>= 1
+
+    return struct.pack('<H', register)
+
+
+@pytest.mark.parametrize('msg', [
+    b'',
+    b'\x02',
+    b'\x01\x03\x00\x00\x00\x0a',
+    b'\x01\x10\x00\x01\x00\x02\x04\x00\x0a\x01\x02',
+    bytes(bytearray(range(256))),
+    bytes(bytearray(range(255))),
+])
+def test_get_crc_equals_bitwise_crc(msg):
+    """ CRC calculated 2 bytes at the time must equal CRC calculated bit by
+    bit, for messages of even and odd length.
+    """
+    assert get_crc(msg) == get_crc_bitwise(msg)
+    assert get_crc(bytearray(msg)) == get_crc_bitwise(msg)
+    assert get_crc(memoryview(msg)) == get_crc_bitwise(msg)
+
+
+def test_validate_crc_of_too_short_message():
+    with pytest.raises(CRCError):
+        validate_crc(b'\x01')
+
+
+def test_crc_accumulator():
+    """ CRC calculated chunk by chunk must equal CRC of whole message. """
+    msg = bytes(bytearray(range(50)))
+    crc = CRCAccumulator()
+
+    for chunk in [msg[:1], msg[1:4], msg[4:5], msg[5:]]:
+        crc.update(chunk)
+
+    assert crc.crc == get_crc(msg)
+    assert crc.size == 50
+    assert not crc.valid
+
+    crc.update(get_crc(msg))
+    assert crc.valid
+
+
+def test_crc_accumulator_reset():
+    crc = CRCAccumulator(b'\x00\x01\x02\xf1\x91')
+    assert crc.valid
+
+    crc.reset()
+    assert not crc.valid
+    assert crc.crc == get_crc(b'')
@@ -1,7 +1,13 @@
+import time
 import pytest
 from serial import serial_for_url
 
-from umodbus.client.serial.rtu import send_message, read_coils
+from umodbus.client.serial.rtu import (send_message, read_coils,
+                                       write_single_register, is_broadcast,
+                                       get_silent_interval,
+                                       get_response_timeout,
+                                       get_transmission_time,
+                                       get_broadcast_turnaround_time)
 
 
 def test_send_message_with_timeout():
@@ -15,3 +21,103 @@ def test_send_message_with_timeout():
 
     with pytest.raises(ValueError):
         send_message(message, s)
+
+
+def test_send_message():
+    """ The loop echoes the request, which equals a valid response to a Write
+    Single Register request.
+    """
+    s = serial_for_url('loop://', timeout=0)
+    message = write_single_register(slave_id=1, address=2, value=1337)
+
+    assert send_message(message, s) == 1337
+
+
+@pytest.mark.parametrize('adu, expected', [
+    (write_single_register(slave_id=0, address=2, value=1), True),
+    (write_single_register(slave_id=1, address=2, value=1), False),
+    (read_coils(slave_id=0, starting_address=1, quantity=1), False),
+])
+def test_is_broadcast(adu, expected):
+    assert is_broadcast(adu) is expected
+
+
+def test_send_broadcast_message():
+    """ No response is read for a broadcast request. """
+    s = serial_for_url('loop://', timeout=0)
+    message = write_single_register(slave_id=0, address=2, value=1337)
+
+    assert send_message(message, s) is None
+    assert s.read(len(message)) == message
+
+
+def test_send_broadcast_message_waits_turnaround_time():
+    """ Without turnaround time slaves get the time a response of max size
+    takes to process the broadcast.
+    """
+    s = serial_for_url('loop://', baudrate=115200, timeout=0)
+    message = write_single_register(slave_id=0, address=2, value=1337)
+
+    start = time.time()
+    send_message(message, s)
+    assert time.time() - start >= get_broadcast_turnaround_time(115200)
+
+    start = time.time()
+    send_message(message, s, turnaround_time=0)
+    assert time.time() - start < get_broadcast_turnaround_time(115200)
+
+
+def test_get_broadcast_turnaround_time():
+    assert get_broadcast_turnaround_time(115200) == \
+        pytest.approx(256 * 11 / 115200.0 + 0.00175)
+
+
+def test_get_silent_interval():
+    assert get_silent_interval(11) == 3.5
+    assert get_silent_interval(19201) == 0.00175
+
+
+def test_get_transmission_time():
+    assert get_transmission_time(8, 9600) == pytest.approx(8 * 11 / 9600.0)
+    assert get_transmission_time(8, 115200) == \
+        pytest.approx(8 * 11 / 115200.0)
+
+
+def test_get_response_timeout():
+    # 8 bytes response plus silent interval of 3.5 characters.
+    assert get_response_timeout(11, 8, 0.1) == 11.6
+
+    # Above 19200 baud a byte still takes 11 bits, but t3.5 is fixed.
+    assert get_response_timeout(115200, 8, 0.1) == \
+        pytest.approx(0.1 + 8 * 11 / 115200.0 + 0.00175)
+
+
+def test_send_message_with_turnaround_time():
+    """ Timeout of serial port is derived from baudrate while reading the
+    response and restored afterwards.
+    """
+    s = serial_for_url('loop://', baudrate=19201, timeout=1)
+    message = write_single_register(slave_id=1, address=2, value=1337)
+
+    assert send_message(message, s, turnaround_time=0.01) == 1337
+    assert s.timeout == 1
+
+    message = read_coils(slave_id=1, starting_address=1, quantity=40)
+
+    start = time.time()
+    with pytest.raises(ValueError):
+        send_message(message, s, turnaround_time=0.01)
+
+    assert time.time() - start < 0.5
+    assert s.timeout == 1
+
+
+def test_send_message_respects_silent_interval():
+    s = serial_for_url('loop://', baudrate=1100, timeout=0)
+    message = write_single_register(slave_id=0, address=2, value=1337)
+
+    send_message(message, s, turnaround_time=0)
+    start = time.time()
+    send_message(message, s, turnaround_time=0)
+
+    assert time.time() - start >= get_silent_interval(1100)
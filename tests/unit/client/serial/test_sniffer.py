@@ -0,0 +1,117 @@
+import pytest
+
+from umodbus.client.serial import rtu
+from umodbus.client.serial.sniffer import Sniffer
+from umodbus.client.serial.redundancy_check import add_crc
+
+
+@pytest.fixture
+def sniffer():
+    """ Sniffer on a bus where 1 character takes 1 ms. """
+    return Sniffer(baudrate=11000)
+
+
+def test_sniffer_pairs_requests_and_responses(sniffer):
+    traffic = [
+        (rtu.read_holding_registers(1, 0, 2), 0.0),
+        (add_crc(b'\x01\x03\x04\x00\x01\x00\x02'), 0.019),
+        # Slave 2 doesn't respond.
+        (rtu.read_holding_registers(2, 0, 2), 0.1),
+        (rtu.read_coils(1, 0, 1), 0.2),
+        (add_crc(b'\x01\x81\x02'), 0.225),
+        # Write Single Register request and response are equal.
+        (rtu.write_single_register(1, 0, 5), 0.3),
+        (rtu.write_single_register(1, 0, 5), 0.318),
+    ]
+
+    for frame, timestamp in traffic:
+        sniffer.feed(frame, timestamp)
+
+    assert sniffer.frames == len(traffic)
+
+    slave = sniffer.slaves[1]
+    assert (slave.requests, slave.responses, slave.exception_responses) == \
+        (3, 3, 1)
+    assert slave.missing_responses == 0
+    assert slave.latency_min == pytest.approx(0.01)
+    assert slave.latency_max == pytest.approx(0.02)
+    assert sniffer.slaves[2].missing_responses == 1
+
+    assert sniffer.function_codes[3].frames == 3
+    assert sniffer.function_codes[3].bytes == 8 + 9 + 8
+    assert sniffer.function_codes[1].frames == 2
+
+
+def test_sniffer_counts_crc_errors(sniffer):
+    request = rtu.read_holding_registers(1, 0, 2)
+
+    sniffer.feed(request[:-1] + b'\x00', 0.0)
+    sniffer.flush(0.01)
+    sniffer.feed(request, 0.02)
+
+    assert sniffer.frames == 1
+    assert sniffer.crc_errors == 1
+    assert sniffer.crc_error_rate == 0.5
+
+
+def test_sniffer_crc_error_rate(sniffer):
+    good = rtu.write_multiple_registers(1, 0, list(range(59)))
+    damaged = bytearray(good)
+    damaged[60] ^= 0xff
+    timestamp = 0.0
+
+    for _ in range(10):
+        for frame in [bytes(damaged), good]:
+            sniffer.feed(frame, timestamp)
+            sniffer.flush(timestamp + 0.01)
+            timestamp += 0.2
+
+    assert (sniffer.frames, sniffer.crc_errors) == (10, 10)
+    assert sniffer.crc_error_rate == 0.5
+
+
+def test_sniffer_utilisation(sniffer):
+    request = rtu.read_holding_registers(1, 0, 2)
+
+    # 8 characters take 8 ms, the bus is busy half of the time.
+    sniffer.feed(request, 0.0)
+    sniffer.feed(request, 0.024)
+
+    assert sniffer.utilisation == pytest.approx(0.5)
+
+
+def test_sniffer_report(sniffer):
+    sniffer.feed(rtu.read_holding_registers(1, 0, 2), 0.0)
+
+    report = sniffer.report()
+    assert 'Frames: 1' in report
+
+
+def test_sniffer_counts_late_echo_as_request(sniffer):
+    """ Write Single Register request and response are equal. A frame which
+    starts after the turnaround time is a retry by the master.
+    """
+    request = rtu.write_single_register(1, 0, 5)
+
+    sniffer.feed(request, 0.0)
+    sniffer.feed(request, 0.5)
+    sniffer.feed(request, 0.52)
+
+    slave = sniffer.slaves[1]
+    assert (slave.requests, slave.responses, slave.missing_responses) == \
+        (2, 1, 1)
+    assert slave.latency_max == pytest.approx(0.012)
+
+
+def test_sniffer_utilisation_at_high_baudrate():
+    """ Above 19200 baud t1.5 and t3.5 are fixed, but a character still takes
+    11 bits on the line.
+    """
+    sniffer = Sniffer(baudrate=115200)
+    request = rtu.read_holding_registers(1, 0, 2)
+    transmission_time = 8 * 11 / 115200.
+
+    sniffer.feed(request, 0.0)
+    sniffer.feed(request, 3 * transmission_time)
+
+    assert sniffer.utilisation == pytest.approx(0.5)
@@ -0,0 +1,99 @@
+import time
+import socket
+import pytest
+from threading import Thread
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import tcp
+from umodbus.client.serial import rtu
+from umodbus.client.batcher import WriteBatcher, COILS, REGISTERS
+from umodbus.server.tcp import RequestHandler, get_server
+
+
+@pytest.yield_fixture
+def app():
+    app = get_server(TCPServer, ('localhost', 0), RequestHandler)
+    app.writes = []
+
+    @app.route(slave_ids=[1, 2], function_codes=[5, 6, 15, 16],
+               addresses=list(range(500)))
+    def write(slave_id, function_code, address, value):
+        app.writes.append((slave_id, function_code, address, value))
+
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.create_connection(app.server_address)
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+def test_flush_merges_contiguous_writes(app, sock):
+    batcher = WriteBatcher(tcp, sock, window=None)
+
+    for address in [2, 0, 1, 5]:
+        batcher.write_single_register(1, address, address * 10)
+    batcher.write_single_coil(1, 0, 1)
+    batcher.write_single_coil(1, 1, 0)
+
+    assert batcher.pending == 6
+    assert app.writes == []
+
+    assert batcher.flush() == 3
+    assert sorted(app.writes) == [
+        (1, 6, 5, 50), (1, 15, 0, 1), (1, 15, 1, 0),
+        (1, 16, 0, 0), (1, 16, 1, 10), (1, 16, 2, 20)]
+    assert batcher.pending == 0
+    assert batcher.round_trips_saved == 3
+
+
+def test_last_write_wins(app, sock):
+    with WriteBatcher(tcp, sock, window=None) as batcher:
+        batcher.write_single_register(1, 0, 1)
+        batcher.write_single_register(1, 0, 2)
+        batcher.write_single_register(2, 0, 3)
+
+    assert sorted(app.writes) == [(1, 6, 0, 2), (2, 6, 0, 3)]
+    assert batcher.requests == 2
+    assert batcher.round_trips_saved == 1
+
+
+def test_window(app, sock):
+    batcher = WriteBatcher(tcp, sock, window=0.01)
+    batcher.write_single_register(1, 0, 1)
+    batcher.write_single_register(1, 1, 2)
+
+    deadline = time.time() + 1
+    while len(app.writes) < 2 and time.time() < deadline:
+        time.sleep(0.001)
+
+    assert app.writes == [(1, 16, 0, 1), (1, 16, 1, 2)]
+    assert batcher.requests == 1
+
+
+def test_create_adus_respects_limits():
+    batcher = WriteBatcher(rtu, None, window=None)
+    pending = {
+        (1, REGISTERS): dict((address, 0) for address in range(200)),
+        (1, COILS): dict((address, 1) for address in range(1970)),
+    }
+
+    assert batcher.create_adus(pending) == [
+        rtu.write_multiple_coils(1, 0, [1] * 1968),
+        rtu.write_multiple_coils(1, 1968, [1, 1]),
+        rtu.write_multiple_registers(1, 0, [0] * 123),
+        rtu.write_multiple_registers(1, 123, [0] * 77),
+    ]
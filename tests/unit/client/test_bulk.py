@@ -0,0 +1,123 @@
+import struct
+import socket
+import pytest
+from threading import Thread
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import tcp
+from umodbus.client.serial import rtu
+from umodbus.client.bulk import (send_pipelined, read_coils_bulk,
+                                 read_holding_registers_bulk,
+                                 write_multiple_coils_bulk,
+                                 write_multiple_registers_bulk)
+from umodbus.exceptions import IllegalDataAddressError
+from umodbus.server.tcp import RequestHandler, get_server
+
+
+@pytest.yield_fixture
+def app():
+    app = get_server(TCPServer, ('localhost', 0), RequestHandler)
+    app.coils = [0] * 5000
+    app.registers = list(range(1000))
+
+    @app.route(slave_ids=[1], function_codes=[1, 15],
+               addresses=list(range(5000)))
+    def coils(slave_id, function_code, address, value=None):
+        if value is None:
+            return app.coils[address]
+
+        app.coils[address] = value
+
+    @app.route(slave_ids=[1], function_codes=[3, 16],
+               addresses=list(range(1000)))
+    def registers(slave_id, function_code, address, value=None):
+        if value is None:
+            return app.registers[address]
+
+        app.registers[address] = value
+
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.create_connection(app.server_address)
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+@pytest.mark.parametrize('max_in_flight', [1, 3, 8])
+def test_read_holding_registers_bulk(sock, max_in_flight):
+    assert read_holding_registers_bulk(tcp, sock, 1, 10, 990,
+                                       max_in_flight) == list(range(10, 1000))
+
+
+def test_write_bulk(app, sock):
+    values = [i % 3 % 2 for i in range(4500)]
+
+    assert write_multiple_coils_bulk(tcp, sock, 1, 100, values) == 4500
+    assert app.coils[100:4600] == values
+    assert read_coils_bulk(tcp, sock, 1, 100, 4500) == values
+
+    assert write_multiple_registers_bulk(tcp, sock, 1, 0,
+                                         [7] * 500) == 500
+    assert app.registers[:501] == [7] * 500 + [500]
+
+
+def test_send_pipelined_raises_first_error(sock):
+    adus = [tcp.read_holding_registers(1, 0, 1),
+            tcp.read_holding_registers(1, 1000, 1),
+            tcp.read_holding_registers(1, 1, 1)]
+
+    with pytest.raises(IllegalDataAddressError):
+        send_pipelined(adus, sock)
+
+    # All responses have been read, socket is still usable.
+    assert tcp.send_message(tcp.read_holding_registers(1, 5, 1), sock) == [5]
+
+
+def test_send_pipelined_matches_transaction_ids():
+    """ Responses are matched with requests, also out of order. """
+    client, server = socket.socketpair()
+    adus = [tcp.read_holding_registers(1, 0, 1),
+            tcp.read_holding_registers(1, 1, 1)]
+
+    def respond():
+        requests = server.recv(24)
+        server.sendall(requests[12:16] + b'\x00\x05\x01\x03\x02\x00\x02' +
+                       requests[:4] + b'\x00\x05\x01\x03\x02\x00\x01')
+
+    t = Thread(target=respond)
+    t.start()
+
+    assert send_pipelined(adus, client) == [[1], [2]]
+
+    t.join()
+    client.close()
+    server.close()
+
+
+def test_rtu_requests_are_send_one_after_another(monkeypatch):
+    adus = []
+
+    def send_message(adu, serial_port):
+        adus.append(adu)
+        return [1] * struct.unpack('>H', adu[4:6])[0]
+
+    monkeypatch.setattr(rtu, 'send_message', send_message)
+
+    assert read_holding_registers_bulk(rtu, None, 1, 0, 300) == [1] * 300
+    assert adus == [rtu.read_holding_registers(1, 0, 125),
+                    rtu.read_holding_registers(1, 125, 125),
+                    rtu.read_holding_registers(1, 250, 50)]
@@ -0,0 +1,93 @@
+import pytest
+
+from umodbus.client import tcp
+from umodbus.client.serial import rtu
+from umodbus.client.planner import (ReadRequest, plan_reads, split_responses,
+                                    read)
+from umodbus.functions import (READ_COILS, READ_HOLDING_REGISTERS,
+                               WRITE_SINGLE_COIL)
+
+
+def ranges(requests):
+    return [(request.slave_id, request.function_code,
+             request.starting_address, request.quantity)
+            for request in requests]
+
+
+def test_plan_reads_merges_contiguous_needs():
+    needs = [(1, 3, 4, 2), (1, 3, 0, 4), (1, 3, 5, 3), (2, 3, 6, 1)]
+
+    assert ranges(plan_reads(needs)) == [(1, 3, 0, 8), (2, 3, 6, 1)]
+
+
+@pytest.mark.parametrize('max_gap,expected', [
+    (0, [(1, 3, 0, 1), (1, 3, 5, 1), (1, 3, 11, 1)]),
+    (4, [(1, 3, 0, 6), (1, 3, 11, 1)]),
+    (5, [(1, 3, 0, 12)]),
+])
+def test_plan_reads_with_max_gap(max_gap, expected):
+    needs = [(1, 3, 0, 1), (1, 3, 5, 1), (1, 3, 11, 1)]
+
+    assert ranges(plan_reads(needs, max_gap=max_gap)) == expected
+
+
+def test_plan_reads_respects_limits():
+    needs = [(1, READ_HOLDING_REGISTERS, 0, 100),
+             (1, READ_HOLDING_REGISTERS, 100, 100),
+             (1, READ_COILS, 0, 2500)]
+
+    assert ranges(plan_reads(needs)) == [
+        (1, READ_COILS, 0, 2000), (1, READ_COILS, 2000, 500),
+        (1, READ_HOLDING_REGISTERS, 0, 125),
+        (1, READ_HOLDING_REGISTERS, 125, 75)]
+
+    assert ranges(plan_reads(needs[:2], max_quantity=60)) == [
+        (1, READ_HOLDING_REGISTERS, 0, 60),
+        (1, READ_HOLDING_REGISTERS, 60, 60),
+        (1, READ_HOLDING_REGISTERS, 120, 60),
+        (1, READ_HOLDING_REGISTERS, 180, 20)]
+
+
+def test_plan_reads_doesnt_read_gap_past_limit():
+    needs = [(1, 3, 0, 120), (1, 3, 124, 10)]
+
+    assert ranges(plan_reads(needs, max_gap=10)) == \
+        [(1, 3, 0, 125), (1, 3, 125, 9)]
+
+
+@pytest.mark.parametrize('need', [(1, WRITE_SINGLE_COIL, 0, 1), (1, 3, 0, 0)])
+def test_plan_reads_with_invalid_need(need):
+    with pytest.raises(ValueError):
+        plan_reads([need])
+
+
+def test_split_responses():
+    needs = [(1, 3, 4, 2), (1, 3, 0, 1), (1, 3, 4, 1)]
+    requests = plan_reads(needs, max_gap=3)
+
+    assert split_responses(needs, requests, [[10, 11, 12, 13, 14, 15]]) == \
+        [[14, 15], [10], [14]]
+
+
+def test_create_adu():
+    request = ReadRequest(1, READ_HOLDING_REGISTERS, 10, 2)
+
+    assert request.create_adu(rtu) == rtu.read_holding_registers(1, 10, 2)
+    assert request.create_adu(tcp)[7:] == \
+        tcp.read_holding_registers(1, 10, 2)[7:]
+
+
+def test_read():
+    needs = [(1, 3, 2, 1), (1, 3, 0, 1), (1, 1, 0, 3)]
+    adus = []
+
+    def send_message(adu):
+        adus.append(adu)
+
+        if adu == rtu.read_coils(1, 0, 3):
+            return [1, 0, 1]
+
+        return [5, 6, 7]
+
+    assert read(needs, rtu, send_message, max_gap=1) == [[7], [5], [1, 0, 1]]
+    assert len(adus) == 2
@@ -0,0 +1,53 @@
+import socket
+import pytest
+
+from umodbus.exceptions import IllegalDataAddressError
+from umodbus.client.serial import rtu
+from umodbus.client.rtu_over_tcp import send_message
+from umodbus.client.serial.redundancy_check import add_crc, CRCError
+
+
+@pytest.yield_fixture
+def sockets():
+    client, server = socket.socketpair()
+    yield client, server
+    client.close()
+    server.close()
+
+
+def test_send_message(sockets):
+    client, server = sockets
+    server.sendall(add_crc(b'\x01\x03\x04\x00\x01\x00\x02'))
+
+    assert send_message(rtu.read_holding_registers(1, 0, 2), client) == \
+        [1, 2]
+    assert server.recv(8) == rtu.read_holding_registers(1, 0, 2)
+
+
+def test_send_message_with_invalid_crc(sockets):
+    client, server = sockets
+    server.sendall(b'\x01\x03\x04\x00\x01\x00\x02\x00\x00')
+
+    with pytest.raises(CRCError):
+        send_message(rtu.read_holding_registers(1, 0, 2), client)
+
+
+def test_send_message_with_exception_response(sockets):
+    client, server = sockets
+    server.sendall(add_crc(b'\x01\x83\x02'))
+
+    with pytest.raises(IllegalDataAddressError):
+        send_message(rtu.read_holding_registers(1, 0, 2), client)
+
+
+def test_send_message_with_corrupted_exception_response(sockets):
+    """ A corrupted exception code must raise a CRCError, not a (possibly
+    wrong) exception response.
+    """
+    client, server = sockets
+    adu = bytearray(add_crc(b'\x01\x83\x02'))
+    adu[2] = 0x04
+    server.sendall(bytes(adu))
+
+    with pytest.raises(CRCError):
+        send_message(rtu.read_holding_registers(1, 0, 2), client)
@@ -0,0 +1,81 @@
+import struct
+import socket
+import pytest
+from threading import Thread
+
+from umodbus.client import tcp
+from umodbus.client.udp import send_message
+from umodbus.exceptions import IllegalDataAddressError
+
+
+@pytest.yield_fixture
+def sockets():
+    client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    client.settimeout(0.05)
+    yield client, server
+    client.close()
+    server.close()
+
+
+def response(request_adu, pdu):
+    """ Return response ADU with MBAP header matching request ADU. """
+    return request_adu[:4] + struct.pack('>H', len(pdu) + 1) + \
+        request_adu[6:7] + pdu
+
+
+def test_send_message(sockets):
+    client, server = sockets
+    adu = tcp.read_holding_registers(1, 0, 2)
+    server.send(response(adu, b'\x03\x04\x00\x01\x00\x02'))
+
+    assert send_message(adu, client) == [1, 2]
+    assert server.recv(260) == adu
+
+
+def test_send_message_discards_other_transactions(sockets):
+    client, server = sockets
+    adu = tcp.read_holding_registers(1, 0, 1)
+    other_adu = tcp.read_holding_registers(2, 0, 1)
+    server.send(b'\x00\x01')
+    server.send(response(other_adu, b'\x03\x02\x00\x02'))
+    server.send(response(adu, b'\x03\x02\x00\x01'))
+
+    assert send_message(adu, client) == [1]
+
+
+def test_send_message_retransmits(sockets):
+    client, server = sockets
+    adu = tcp.read_holding_registers(1, 0, 1)
+
+    def respond_to_retransmission():
+        server.recv(260)
+        server.send(response(server.recv(260), b'\x03\x02\x00\x01'))
+
+    t = Thread(target=respond_to_retransmission)
+    t.start()
+
+    assert send_message(adu, client, retries=1) == [1]
+    t.join()
+    assert client.gettimeout() == 0.05
+
+
+def test_send_message_timeout(sockets):
+    client, server = sockets
+
+    with pytest.raises(socket.timeout):
+        send_message(tcp.read_holding_registers(1, 0, 1), client, retries=2)
+
+    # Request has been send 3 times.
+    server.setblocking(False)
+    assert len([server.recv(260) for _ in range(3)]) == 3
+    with pytest.raises(socket.error):
+        server.recv(260)
+
+
+def test_send_message_with_exception_response(sockets):
+    client, server = sockets
+    adu = tcp.read_holding_registers(1, 0, 1)
+    server.send(response(adu, b'\x83\x02'))
+
+    with pytest.raises(IllegalDataAddressError):
+        send_message(adu, client)
@@ -0,0 +1,63 @@
+import pytest
+from threading import Thread
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import tcp
+from umodbus.client.upstream import Upstream
+from umodbus.exceptions import (IllegalDataAddressError,
+                                GatewayPathUnavailableError)
+from umodbus.server import tcp as tcp_server
+
+
+@pytest.yield_fixture
+def device():
+    device = tcp_server.get_server(TCPServer, ('localhost', 0),
+                                   tcp_server.RequestHandler)
+
+    @device.route(slave_ids=[1], function_codes=[3], addresses=[0])
+    def register(slave_id, function_code, address):
+        return 5
+
+    t = Thread(target=device.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    yield device
+
+    device.shutdown()
+    device.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def upstream(device):
+    upstream = Upstream(device.server_address)
+    yield upstream
+    upstream.close()
+
+
+def test_send_message(upstream):
+    for _ in range(2):
+        assert upstream.send_message(tcp.read_holding_registers(1, 0, 1)) == \
+            [5]
+
+    assert upstream.requests == 2
+
+
+def test_send_request_returns_exception_response(upstream):
+    with pytest.raises(IllegalDataAddressError):
+        upstream.send_message(tcp.read_holding_registers(1, 1, 1))
+
+    assert upstream.send_request(tcp.read_holding_registers(1, 1, 1))[7:] == \
+        b'\x83\x02'
+
+
+def test_device_unavailable(device):
+    address = device.server_address
+    device.shutdown()
+    device.server_close()
+
+    with pytest.raises(GatewayPathUnavailableError):
+        Upstream(address).send_message(tcp.read_holding_registers(1, 0, 1))
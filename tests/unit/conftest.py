@@ -1,8 +1,16 @@
+import sys
 import pytest
 
 from umodbus import conf
 from umodbus.config import Config
 
+# Modules for asyncio use `async def`, which is a syntax error before Python
+# 3.5.
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore += ['client/serial/test_async_rtu.py',
+                       'server/serial/test_async_rtu.py']
+
 
 @pytest.fixture(scope='module', autouse=True)
 def enable_signed_values(request):
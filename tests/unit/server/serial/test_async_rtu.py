@@ -0,0 +1,73 @@
+import os
+import select
+import asyncio
+import pytest
+from serial import Serial
+
+from umodbus.client.serial.rtu import write_single_register
+from umodbus.server.serial import get_server
+from umodbus.server.serial.async_rtu import AsyncRTUServer
+
+
+@pytest.yield_fixture
+def pty():
+    """ Yield file descriptor of master and a serial port connected to the
+    slave side of a pseudo terminal.
+    """
+    master, slave = os.openpty()
+    serial_port = Serial(os.ttyname(slave), baudrate=1200)
+
+    yield master, serial_port
+
+    serial_port.close()
+    os.close(slave)
+    os.close(master)
+
+
+async def read(fd, size, timeout=1):
+    data = b''
+    deadline = asyncio.get_event_loop().time() + timeout
+
+    while len(data) < size and \
+            asyncio.get_event_loop().time() < deadline:
+        if select.select([fd], [], [], 0)[0]:
+            data += os.read(fd, size - len(data))
+        else:
+            await asyncio.sleep(0.001)
+
+    return data
+
+
+def test_async_rtu_server(pty):
+    master, serial_port = pty
+    app = get_server(AsyncRTUServer, serial_port)
+    written = []
+
+    @app.route(slave_ids=[1], function_codes=[6], addresses=[0])
+    def write(slave_id, function_code, address, value):
+        written.append(value)
+
+    request = write_single_register(1, 0, 5)
+
+    async def exchange():
+        server = asyncio.ensure_future(app.serve_forever(poll_interval=0.01))
+
+        os.write(master, request[:3])
+        await asyncio.sleep(0.001)
+        os.write(master, request[3:])
+
+        # Response of Write Single Register is equal to request.
+        response = await read(master, len(request))
+
+        app.shutdown()
+        await server
+
+        return response
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(exchange()) == request
+    finally:
+        loop.close()
+
+    assert written == [5]
@@ -0,0 +1,98 @@
+import os
+import time
+import select
+import pytest
+from threading import Thread
+from serial import Serial
+
+from umodbus.client.serial.rtu import write_single_register
+from umodbus.client.serial.redundancy_check import add_crc
+from umodbus.server.serial.multiport import MultiPortRTUServer, get_server
+
+
+def read(fd, size, timeout=1):
+    """ Read up to size bytes from file descriptor. """
+    data = b''
+    deadline = time.time() + timeout
+
+    while len(data) < size:
+        remaining = deadline - time.time()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            break
+        data += os.read(fd, size - len(data))
+
+    return data
+
+
+@pytest.yield_fixture
+def ptys():
+    """ Yield 2 tuples with file descriptor of master and a serial port
+    connected to the slave side of a pseudo terminal.
+    """
+    ptys = []
+    for _ in range(2):
+        master, slave = os.openpty()
+        ptys.append((master, slave, Serial(os.ttyname(slave),
+                                           baudrate=1200)))
+
+    yield [(master, serial_port) for master, _, serial_port in ptys]
+
+    for master, slave, serial_port in ptys:
+        serial_port.close()
+        os.close(slave)
+        os.close(master)
+
+
+@pytest.yield_fixture
+def app(ptys):
+    app = get_server(MultiPortRTUServer,
+                     [serial_port for _, serial_port in ptys])
+    app.written = []
+
+    @app.route(slave_ids=[1], function_codes=[6], addresses=[0, 1])
+    def write(slave_id, function_code, address, value):
+        app.written.append((address, value))
+
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    t.join()
+
+
+def test_serial_ports_share_route_map(app):
+    assert len(app.lines) == 2
+    assert all(line.route_map is app.route_map for line in app.lines)
+
+
+def test_requests_on_multiple_ports(app, ptys):
+    requests = [write_single_register(1, 0, 5), write_single_register(1, 1, 6)]
+
+    for (master, _), request in zip(ptys, requests):
+        os.write(master, request)
+
+    for (master, _), request in zip(ptys, requests):
+        # Response of Write Single Register is equal to request.
+        assert read(master, len(request)) == request
+
+    assert sorted(app.written) == [(0, 5), (1, 6)]
+
+
+def test_request_split_over_multiple_writes(app, ptys):
+    master, _ = ptys[1]
+    request = write_single_register(1, 0, 5)
+
+    os.write(master, request[:3])
+    time.sleep(0.001)
+    os.write(master, request[3:])
+
+    assert read(master, len(request)) == request
+
+
+def test_unknown_function_code_is_answered_after_silence(app, ptys):
+    master, _ = ptys[0]
+    os.write(master, add_crc(b'\x01\x2b\x00\x00'))
+
+    assert read(master, 5) == add_crc(b'\x01\xab\x01')
@@ -1,5 +1,11 @@
 import pytest
 from serial import Serial, serial_for_url
+
+from umodbus.route import Map
+from umodbus.client.serial.rtu import (read_coils, write_single_register,
+                                       read_holding_registers,
+                                       write_multiple_registers)
+from umodbus.client.serial.redundancy_check import add_crc
 from umodbus.server.serial.rtu import RTUServer, get_char_size
 
 
@@ -34,3 +40,154 @@ def test_rtu_server_send_empty_message(rtu_server):
 
     with pytest.raises(ValueError):
         rtu_server.serve_once()
+
+
+def test_rtu_server_handles_requests_received_back_to_back(rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+    rtu_server.route_map.add_rule(lambda **kwargs: None, [1], [6], [0, 1])
+
+    requests = [write_single_register(1, 0, 5), write_single_register(1, 1, 6)]
+    rtu_server.serial_port.write(b''.join(requests))
+    rtu_server.serve_once()
+
+    # Response of Write Single Register is equal to request.
+    assert rtu_server.serial_port.read(16) == b''.join(requests)
+
+
+def test_rtu_server_responds_to_unknown_function_code_after_silence(
+        rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+    rtu_server.route_map.add_rule(lambda **kwargs: None, [1], [1], [0])
+    rtu_server.serial_port.write(add_crc(b'\x01\x2b\x00\x00'))
+
+    rtu_server.serve_once()
+    assert rtu_server.serial_port.in_waiting == 0
+
+    rtu_server.serve_once()
+    assert rtu_server.serial_port.read(5) == add_crc(b'\x01\xab\x01')
+
+
+def test_rtu_server_executes_broadcast_without_response(rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+
+    written = []
+    rtu_server.route_map.add_rule(
+        lambda slave_id, address, value, **kwargs:
+            written.append((slave_id, address, value)), [1, 2], [6], [2])
+
+    rtu_server.serial_port.write(write_single_register(0, 2, 1337))
+    rtu_server.serve_once()
+
+    # No route for slave id 0 is needed, the broadcast is executed for every
+    # slave id served.
+    assert written == [(1, 2, 1337), (2, 2, 1337)]
+    assert rtu_server.serial_port.in_waiting == 0
+
+
+def test_rtu_server_executes_broadcast_for_slaves_serving_address(
+        rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+
+    written = []
+    rtu_server.route_map.add_rule(
+        lambda slave_id, address, value, **kwargs:
+            written.append((slave_id, address, value)), [1], [6], [2])
+    rtu_server.route_map.add_rule(lambda **kwargs: None, [3], [6], [5])
+
+    rtu_server.serial_port.write(write_single_register(0, 2, 1337))
+    rtu_server.serve_once()
+
+    assert written == [(1, 2, 1337)]
+    assert rtu_server.serial_port.in_waiting == 0
+
+
+def test_rtu_server_ignores_broadcast_read(rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+
+    read = []
+    rtu_server.route_map.add_rule(lambda **kwargs: read.append(kwargs), [0],
+                                  [1], [1])
+
+    rtu_server.serial_port.write(read_coils(0, 1, 1))
+    rtu_server.serve_once()
+
+    assert read == []
+    assert rtu_server.serial_port.in_waiting == 0
+
+
+def test_rtu_server_ignores_requests_for_other_slaves(rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+    rtu_server.route_map.add_rule(lambda **kwargs: None, [1], [6], [0])
+
+    rtu_server.serial_port.write(write_single_register(2, 0, 5))
+    rtu_server.serve_once()
+
+    assert rtu_server.framer.foreign_frames == 1
+    assert rtu_server.framer.crc_errors == 0
+
+    # Silence ends the ignored frame.
+    with pytest.raises(ValueError):
+        rtu_server.serve_once()
+
+    request = write_single_register(1, 0, 5)
+    rtu_server.serial_port.write(request)
+    rtu_server.serve_once()
+
+    assert rtu_server.serial_port.read(len(request)) == request
+
+
+def test_rtu_server_updates_metrics(rtu_server):
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+    rtu_server.route_map.add_rule(lambda **kwargs: None, [1], [6], [1])
+
+    request = write_single_register(1, 0, 5)
+    rtu_server.serial_port.write(request)
+    rtu_server.serve_once()
+
+    # No route for address 0, so an exception response is sent.
+    assert rtu_server.metrics.frames_in == 1
+    assert rtu_server.metrics.bytes_in == len(request)
+    assert rtu_server.metrics.frames_out == 1
+    assert rtu_server.metrics.exception_responses == 1
+
+
+def test_rtu_server_counts_damaged_frame_once(rtu_server):
+    request = write_multiple_registers(1, 0, list(range(59)))
+    damaged = bytearray(request)
+    damaged[60] ^= 0xff
+
+    assert rtu_server.feed(bytes(damaged) + request) == [request]
+    assert rtu_server.metrics.crc_errors == 1
+
+
+def test_rtu_server_responds_after_frames_for_other_slaves(rtu_server):
+    """ Frames for other slaves on a busy bus must not make the server deaf
+    until the line is silent.
+    """
+    rtu_server.serial_port = serial_for_url('loop://')
+    rtu_server.route_map = Map()
+    read = []
+    rtu_server.route_map.add_rule(lambda **kwargs: read.append(kwargs) or 0,
+                                  [1], [3], [0])
+
+    foreign_request = read_holding_registers(2, 0, 1)
+    foreign_response = add_crc(b'\x02\x03\x02\x00\x00')
+    request = read_holding_registers(1, 0, 1)
+
+    rtu_server.serial_port.write(foreign_request + foreign_response +
+                                 request)
+
+    # The line isn't silent between the frames, so the framer must not wait
+    # for silence.
+    while not read:
+        assert rtu_server.serial_port.in_waiting > 0
+        rtu_server.serve_once()
+
+    assert rtu_server.serial_port.read(7) == add_crc(b'\x01\x03\x02\x00\x00')
@@ -0,0 +1,199 @@
+import time
+import socket
+import pytest
+from threading import Thread
+from serial import serial_for_url
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import tcp
+from umodbus.client.serial import rtu
+from umodbus.functions import READ_COILS, READ_HOLDING_REGISTERS
+from umodbus.exceptions import (IllegalDataValueError,
+                                GatewayTargetDeviceFailedToRespondError)
+from umodbus.server import tcp as tcp_server
+from umodbus.client.upstream import Upstream
+from umodbus.server.aggregator import Aggregator
+
+
+def serve(app):
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    return t
+
+
+@pytest.yield_fixture
+def devices():
+    """ Yield 2 Modbus TCP/IP servers of which register n has value n plus
+    100 times the number of the device.
+    """
+    devices = []
+    threads = []
+
+    for i in range(2):
+        device = tcp_server.get_server(TCPServer, ('localhost', 0),
+                                       tcp_server.RequestHandler)
+
+        @device.route(slave_ids=[1], function_codes=[1, 3],
+                      addresses=list(range(10)))
+        def registers(slave_id, function_code, address, i=i):
+            if function_code == READ_COILS:
+                return address % 2
+
+            return 100 * i + address
+
+        devices.append(device)
+        threads.append(serve(device))
+
+    yield devices
+
+    for device, t in zip(devices, threads):
+        device.shutdown()
+        device.server_close()
+        t.join()
+
+
+@pytest.yield_fixture
+def aggregator(devices):
+    aggregator = Aggregator()
+    upstreams = [Upstream(device.server_address) for device in devices]
+
+    for i, upstream in enumerate(upstreams):
+        aggregator.add_mapping(
+            10 * i, aggregator.add_device(upstream.send_message),
+            address=5, quantity=5)
+
+    yield aggregator
+
+    # Devices handle 1 connection at a time, until it's closed.
+    for upstream in upstreams:
+        upstream.close()
+
+
+@pytest.yield_fixture
+def app():
+    app = tcp_server.get_server(TCPServer, ('localhost', 0),
+                                tcp_server.RequestHandler)
+    t = serve(app)
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.create_connection(app.server_address)
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+def test_read_values_of_multiple_devices(aggregator, app, sock):
+    aggregator.add_mapping(5, aggregator.devices[1], address=0, quantity=5)
+    aggregator.bind_routes(app, slave_ids=[1])
+    aggregator.poll()
+
+    assert tcp.send_message(tcp.read_holding_registers(1, 3, 9), sock) == \
+        [8, 9, 100, 101, 102, 103, 104, 105, 106]
+
+
+def test_virtual_function_code(aggregator, app, sock):
+    aggregator.add_mapping(0, aggregator.devices[0], address=0, quantity=4,
+                           function_code=READ_HOLDING_REGISTERS,
+                           virtual_function_code=READ_COILS)
+    aggregator.add_mapping(4, aggregator.devices[0], address=0, quantity=4,
+                           function_code=READ_COILS)
+    aggregator.bind_routes(app, slave_ids=[1])
+    aggregator.poll()
+
+    assert tcp.send_message(tcp.read_coils(1, 0, 8), sock) == \
+        [0, 1, 1, 1, 0, 1, 0, 1]
+
+
+def test_values_not_read_yet(aggregator, app, sock):
+    aggregator.bind_routes(app, slave_ids=[1])
+
+    with pytest.raises(GatewayTargetDeviceFailedToRespondError):
+        tcp.send_message(tcp.read_holding_registers(1, 0, 1), sock)
+
+
+def test_values_too_old(aggregator, app, sock):
+    aggregator.bind_routes(app, slave_ids=[1])
+    aggregator.max_age = 0.01
+    aggregator.poll()
+    time.sleep(0.02)
+
+    with pytest.raises(GatewayTargetDeviceFailedToRespondError):
+        tcp.send_message(tcp.read_holding_registers(1, 0, 1), sock)
+
+
+def test_failing_device_doesnt_stop_others(aggregator, devices):
+    devices[0].shutdown()
+    devices[0].server_close()
+
+    aggregator.poll()
+
+    assert aggregator.devices[0].errors == 1
+    assert aggregator.mappings[0].values is None
+    assert aggregator.mappings[1].values == [105, 106, 107, 108, 109]
+
+
+def test_add_mapping_validates_mapping(aggregator):
+    with pytest.raises(ValueError):
+        aggregator.add_mapping(14, aggregator.devices[0], address=0)
+
+    with pytest.raises(IllegalDataValueError):
+        aggregator.add_mapping(20, aggregator.devices[0], address=0,
+                               quantity=126)
+
+    assert len(aggregator.mappings) == 2
+
+
+def test_rtu_device():
+    """ The loop echoes the request, which isn't a valid response. """
+    aggregator = Aggregator()
+    device = aggregator.add_device(
+        lambda adu: rtu.send_message(adu, serial_for_url('loop://',
+                                                         timeout=0)),
+        client=rtu, slave_id=3)
+    mapping = aggregator.add_mapping(0, device, address=0, quantity=2)
+
+    assert mapping.create_request_adu() == \
+        rtu.read_holding_registers(3, 0, 2)
+
+    aggregator.poll()
+    assert device.errors == 1
+
+
+def test_polls_have_new_transaction_id():
+    aggregator = Aggregator()
+    adus = []
+    device = aggregator.add_device(adus.append)
+    aggregator.add_mapping(0, device, address=0, quantity=2)
+
+    for _ in range(3):
+        aggregator.poll()
+
+    # Transaction ids are random, 3 equal ids are very unlikely.
+    assert len(set(adu[:2] for adu in adus)) > 1
+    assert len(set(adu[2:] for adu in adus)) == 1
+
+
+def test_start_and_shutdown(aggregator):
+    for device in aggregator.devices:
+        device.interval = 0.01
+
+    aggregator.start()
+
+    while not all(device.polls > 1 for device in aggregator.devices):
+        time.sleep(0.001)
+
+    aggregator.shutdown()
+
+    assert all(mapping.values is not None for mapping in aggregator.mappings)
@@ -0,0 +1,47 @@
+import pytest
+
+from umodbus import conf
+from umodbus.route import Map
+from umodbus.server.data_store import SharedMemoryDataStore
+
+
+class Server(object):
+    route_map = Map()
+
+
+@pytest.fixture
+def data_store():
+    return SharedMemoryDataStore(coils=10, holding_registers=5)
+
+
+def test_data_store_read_and_write(data_store):
+    """ Values written using one function code must be read by the function
+    codes accessing the same table.
+    """
+    data_store.write(slave_id=1, function_code=5, address=3, value=1)
+    data_store.write(slave_id=1, function_code=16, address=4, value=1337)
+
+    assert data_store.read(slave_id=1, function_code=1, address=3) == 1
+    assert data_store.read(slave_id=1, function_code=3, address=4) == 1337
+    assert data_store.coils[3] == 1
+
+
+def test_data_store_signed_registers(monkeypatch):
+    monkeypatch.setattr(conf, 'SIGNED_VALUES', True)
+    data_store = SharedMemoryDataStore(input_registers=1)
+    data_store.input_registers[0] = -5
+
+    assert data_store.read(slave_id=1, function_code=4, address=0) == -5
+
+
+def test_data_store_bind_routes(data_store):
+    """ Routes must only be added for tables which have addresses. """
+    server = Server()
+    data_store.bind_routes(server, slave_ids=[1])
+
+    assert server.route_map.match(1, 1, 9) == data_store.read
+    assert server.route_map.match(1, 15, 0) == data_store.write
+    assert server.route_map.match(1, 16, 4) == data_store.write
+    assert server.route_map.match(1, 3, 5) is None
+    assert server.route_map.match(1, 2, 0) is None
+    assert server.route_map.match(2, 1, 0) is None
@@ -0,0 +1,125 @@
+import os
+import tty
+import socket
+import pytest
+from threading import Thread
+from serial import Serial, serial_for_url
+
+from umodbus.client import tcp
+from umodbus.client.serial import rtu
+from umodbus.client.serial.redundancy_check import add_crc
+from umodbus.exceptions import (GatewayPathUnavailableError,
+                                GatewayTargetDeviceFailedToRespondError)
+from umodbus.server.gateway import GatewayServer, RequestHandler
+
+
+@pytest.yield_fixture
+def app():
+    app = GatewayServer(('localhost', 0), RequestHandler)
+
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.create_connection(app.server_address)
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+@pytest.yield_fixture
+def pty():
+    """ Yield file descriptor of master and a serial port connected to the
+    slave side of a pseudo terminal.
+    """
+    master, slave = os.openpty()
+    serial_port = Serial(os.ttyname(slave), timeout=0.05)
+    tty.setraw(master)
+
+    yield master, serial_port
+
+    serial_port.close()
+    os.close(slave)
+    os.close(master)
+
+
+def test_forward_request(app, sock):
+    """ The loop echoes the request, which equals a valid response to a Write
+    Single Register request.
+    """
+    line = app.add_line(serial_for_url('loop://', timeout=0.1),
+                        unit_ids=[1, 2])
+
+    assert tcp.send_message(tcp.write_single_register(2, 3, 1337), sock) == \
+        1337
+    assert line.transactions == 1
+    assert app.queue_depths == [0]
+
+
+def test_unit_id_without_line(app, sock):
+    app.add_line(serial_for_url('loop://', timeout=0.1), unit_ids=[1])
+
+    with pytest.raises(GatewayPathUnavailableError):
+        tcp.send_message(tcp.write_single_register(2, 3, 1337), sock)
+
+
+def test_line_not_available_in_time(app, sock):
+    app.queue_timeout = 0.01
+    line = app.add_line(serial_for_url('loop://', timeout=0.1), unit_ids=[1])
+
+    with line.acquire():
+        with pytest.raises(GatewayPathUnavailableError):
+            tcp.send_message(tcp.write_single_register(1, 3, 1337), sock)
+
+    assert line.expired_requests == 1
+
+
+def test_forward_read_request(app, sock, pty):
+    master, serial_port = pty
+    app.add_line(serial_port, unit_ids=[1])
+
+    def respond():
+        assert os.read(master, 8) == rtu.read_holding_registers(1, 0, 2)
+        os.write(master, add_crc(b'\x01\x03\x04\x00\x01\x00\x02'))
+
+    t = Thread(target=respond)
+    t.start()
+
+    assert tcp.send_message(tcp.read_holding_registers(1, 0, 2), sock) == \
+        [1, 2]
+    t.join()
+
+
+def test_slave_fails_to_respond(app, sock, pty):
+    app.add_line(pty[1], unit_ids=[1])
+
+    with pytest.raises(GatewayTargetDeviceFailedToRespondError):
+        tcp.send_message(tcp.read_holding_registers(1, 0, 2), sock)
+
+
+def test_response_is_forwarded_unchanged(app, sock, pty):
+    """ Exception code 7 isn't known by uModbus, but the response of the
+    slave is forwarded anyway.
+    """
+    master, serial_port = pty
+    app.add_line(serial_port, unit_ids=[1])
+
+    def respond():
+        os.read(master, 8)
+        os.write(master, add_crc(b'\x01\x83\x07'))
+
+    t = Thread(target=respond)
+    t.start()
+
+    response_adu = tcp.send_request(tcp.read_holding_registers(1, 0, 2), sock)
+    t.join()
+
+    assert response_adu[7:] == b'\x83\x07'
@@ -0,0 +1,91 @@
+import time
+import socket
+import pytest
+from threading import Thread
+
+from umodbus.client import tcp
+from umodbus.server.data_store import SharedMemoryDataStore
+from umodbus.server.prefork import PreforkServer
+from umodbus.server.tcp import RequestHandler, get_server
+
+
+def connect(address, timeout=5):
+    """ Connect to address, retry until workers are listening. """
+    deadline = time.time() + timeout
+
+    while True:
+        try:
+            return socket.create_connection(address)
+        except socket.error:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+@pytest.yield_fixture
+def prefork_server():
+    app = get_server(PreforkServer, ('localhost', 0), RequestHandler)
+    app.workers = 2
+
+    data_store = SharedMemoryDataStore(holding_registers=10)
+    data_store.bind_routes(app, slave_ids=[1])
+
+    t = Thread(target=app.serve_forever)
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    t.join()
+    app.server_close()
+
+
+def test_prefork_server_reserves_port(prefork_server):
+    assert prefork_server.server_address[1] != 0
+
+
+def test_prefork_server_shares_data_store(prefork_server):
+    """ A value written over one connection must be read over all other
+    connections, regardless of the worker handling the connection.
+    """
+    writer = connect(prefork_server.server_address)
+    tcp.send_message(tcp.write_single_register(1, 3, 1337), writer)
+    writer.close()
+
+    for _ in range(4):
+        reader = connect(prefork_server.server_address)
+        assert tcp.send_message(tcp.read_holding_registers(1, 3, 1),
+                                reader) == [1337]
+        reader.close()
+
+
+def test_prefork_server_shutdown(prefork_server):
+    prefork_server.shutdown()
+
+    for _ in range(100):
+        if not prefork_server._worker_pids:
+            break
+        time.sleep(0.01)
+
+    assert prefork_server._worker_pids == set()
+
+
+def test_prefork_server_shutdown_before_serve_forever():
+    """ A shutdown requested before :meth:`serve_forever` runs must not be
+    lost.
+    """
+    app = get_server(PreforkServer, ('localhost', 0), RequestHandler)
+    app.workers = 2
+    app.shutdown()
+
+    t = Thread(target=app.serve_forever)
+    t.start()
+    t.join(timeout=5)
+
+    try:
+        assert not t.is_alive()
+        assert app._worker_pids == set()
+    finally:
+        app.shutdown()
+        t.join()
+        app.server_close()
@@ -0,0 +1,216 @@
+import time
+import socket
+import pytest
+from threading import Thread
+try:
+    from socketserver import TCPServer, ThreadingTCPServer
+except ImportError:
+    from SocketServer import TCPServer, ThreadingTCPServer
+
+from umodbus.client import tcp
+from umodbus.functions import READ_COILS, READ_HOLDING_REGISTERS
+from umodbus.exceptions import (IllegalDataAddressError,
+                                GatewayPathUnavailableError,
+                                ServerDeviceBusyError)
+from umodbus.server import tcp as tcp_server
+from umodbus.server.proxy import CachingProxy, RequestHandler
+
+
+def serve(app):
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    return t
+
+
+@pytest.yield_fixture
+def device():
+    """ Yield Modbus TCP/IP server which counts the requests it handles. """
+    device = tcp_server.get_server(TCPServer, ('localhost', 0),
+                                   tcp_server.RequestHandler)
+    device.registers = [0] * 10
+    device.requests = 0
+    # First address the device answers with Server Device Busy.
+    device.busy_from = 10
+
+    @device.route(slave_ids=[1], function_codes=[1, 3, 6, 16],
+                  addresses=list(range(10)))
+    def registers(slave_id, function_code, address, value=None):
+        if address == 0:
+            device.requests += 1
+
+        if address >= device.busy_from:
+            raise ServerDeviceBusyError()
+
+        if value is None:
+            return device.registers[address]
+
+        device.registers[address] = value
+
+    t = serve(device)
+
+    yield device
+
+    device.shutdown()
+    device.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def proxy(device):
+    proxy = CachingProxy(device.server_address)
+    proxy.add_range(slave_id=1, function_code=READ_HOLDING_REGISTERS,
+                    starting_address=0, quantity=5, ttl=60)
+    proxy.add_range(slave_id=1, function_code=READ_HOLDING_REGISTERS,
+                    starting_address=5, quantity=5, ttl=60)
+
+    yield proxy
+
+    proxy.shutdown()
+
+
+@pytest.yield_fixture
+def app(proxy):
+    app = tcp_server.get_server(ThreadingTCPServer, ('localhost', 0),
+                                RequestHandler)
+    app.daemon_threads = True
+    proxy.bind_routes(app)
+    t = serve(app)
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.create_connection(app.server_address)
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+def test_reads_are_answered_from_cache(device, proxy, sock):
+    device.registers[:2] = [1, 2]
+
+    for _ in range(3):
+        assert tcp.send_message(tcp.read_holding_registers(1, 0, 2),
+                                sock) == [1, 2]
+
+    assert proxy.misses == 1
+    assert proxy.upstream_requests == 1
+
+
+def test_expired_range_is_refreshed(device, proxy, sock):
+    proxy.ranges[0].ttl = 0.01
+    assert tcp.send_message(tcp.read_holding_registers(1, 0, 1), sock) == [0]
+
+    device.registers[0] = 5
+    time.sleep(0.02)
+
+    assert tcp.send_message(tcp.read_holding_registers(1, 0, 1), sock) == [5]
+    assert proxy.misses == 2
+
+
+def test_write_expires_touched_ranges(device, proxy, sock):
+    proxy.poll()
+    assert all(cached_range.fresh for cached_range in proxy.ranges)
+
+    assert tcp.send_message(tcp.write_multiple_registers(1, 4, [7, 8]),
+                            sock) == 2
+    assert not any(cached_range.fresh for cached_range in proxy.ranges)
+
+    assert tcp.send_message(tcp.read_holding_registers(1, 3, 3), sock) == \
+        [0, 7, 8]
+
+
+def test_write_doesnt_expire_other_ranges(proxy):
+    proxy.add_range(slave_id=1, function_code=READ_COILS, starting_address=0,
+                    quantity=10, ttl=60)
+    proxy.poll()
+
+    proxy.write(1, tcp.write_single_register(1, 9, 1)[7:])
+
+    assert [cached_range.fresh for cached_range in proxy.ranges] == \
+        [True, False, True]
+
+
+def test_read_is_answered_from_1_refresh(device, proxy, sock):
+    """ A range which expires while a read is answered isn't refreshed
+    again for the remaining addresses of the read.
+    """
+    proxy.ranges[0].ttl = 1e-9
+    device.registers[:5] = [1, 2, 3, 4, 5]
+
+    assert tcp.send_message(tcp.read_holding_registers(1, 0, 5), sock) == \
+        [1, 2, 3, 4, 5]
+    assert proxy.upstream_requests == 1
+
+
+def test_read_spanning_ranges(device, proxy):
+    device.registers[3:7] = [3, 4, 5, 6]
+
+    assert proxy.read(1, READ_HOLDING_REGISTERS, 3, 4) == [3, 4, 5, 6]
+    assert proxy.upstream_requests == 2
+
+
+def test_add_range_without_ttl(proxy):
+    with pytest.raises(ValueError):
+        proxy.add_range(slave_id=1, function_code=READ_COILS,
+                        starting_address=0, quantity=10, ttl=0)
+
+
+def test_read_outside_ranges(sock):
+    with pytest.raises(IllegalDataAddressError):
+        tcp.send_message(tcp.read_holding_registers(1, 9, 2), sock)
+
+
+def test_device_unavailable(device, proxy, sock):
+    device.shutdown()
+    device.server_close()
+
+    with pytest.raises(GatewayPathUnavailableError):
+        tcp.send_message(tcp.read_holding_registers(1, 0, 1), sock)
+
+
+def test_poll_forever(proxy):
+    t = Thread(target=proxy.poll_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    while proxy.upstream_requests < 2:
+        time.sleep(0.001)
+
+    proxy.shutdown()
+    t.join()
+
+    assert all(cached_range.fresh for cached_range in proxy.ranges)
+
+
+def test_poll_continues_after_exception_response(device, proxy):
+    device.busy_from = 5
+
+    assert proxy.poll() > 0
+    assert [cached_range.fresh for cached_range in proxy.ranges] == \
+        [True, False]
+    assert proxy.errors == 1
+
+
+def test_poll_forever_survives_exception_responses(device, proxy):
+    device.busy_from = 0
+    t = Thread(target=proxy.poll_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    try:
+        while proxy.errors < 4:
+            time.sleep(0.001)
+
+        assert t.is_alive()
+        device.busy_from = 10
+
+        while not all(cached_range.fresh for cached_range in proxy.ranges):
+            time.sleep(0.001)
+    finally:
+        proxy.shutdown()
+        t.join()
@@ -0,0 +1,88 @@
+import socket
+import pytest
+from threading import Thread
+try:
+    from socketserver import TCPServer
+except ImportError:
+    from SocketServer import TCPServer
+
+from umodbus.client import rtu_over_tcp
+from umodbus.client.serial import rtu
+from umodbus.utils import recv_exactly
+from umodbus.exceptions import IllegalDataAddressError
+from umodbus.server.tcp import get_server
+from umodbus.server.rtu_over_tcp import RequestHandler
+
+
+@pytest.yield_fixture
+def app():
+    app = get_server(TCPServer, ('localhost', 0), RequestHandler)
+    app.data = {}
+
+    @app.route(slave_ids=[0, 1], function_codes=[3, 6], addresses=[0, 1])
+    def registers(slave_id, function_code, address, value=None):
+        if value is None:
+            return app.data.get(address, 0)
+
+        app.data[address] = value
+
+    t = Thread(target=app.serve_forever)
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.create_connection(app.server_address)
+    yield sock
+    sock.close()
+
+
+def test_send_message(sock):
+    assert rtu_over_tcp.send_message(rtu.write_single_register(1, 1, 1337),
+                                     sock) == 1337
+    assert rtu_over_tcp.send_message(rtu.read_holding_registers(1, 0, 2),
+                                     sock) == [0, 1337]
+
+
+def test_exception_response(sock):
+    with pytest.raises(IllegalDataAddressError):
+        rtu_over_tcp.send_message(rtu.read_holding_registers(1, 5, 1), sock)
+
+
+def test_pipelined_requests_split_over_segments(sock):
+    requests = rtu.write_single_register(1, 0, 5) + \
+        rtu.write_single_register(1, 1, 6)
+
+    sock.sendall(requests[:3])
+    sock.sendall(requests[3:11])
+    sock.sendall(requests[11:])
+
+    # Responses of Write Single Register are equal to requests.
+    assert recv_exactly(sock.recv, len(requests)) == requests
+
+
+def test_broadcast(app, sock):
+    assert rtu_over_tcp.send_message(rtu.write_single_register(0, 0, 7),
+                                     sock) is None
+    assert rtu_over_tcp.send_message(rtu.read_holding_registers(1, 0, 1),
+                                     sock) == [7]
+
+
+def test_broadcast_is_executed_for_every_slave_id(app, sock):
+    slave_ids = []
+
+    @app.route(slave_ids=[2], function_codes=[6], addresses=[0])
+    def register(slave_id, function_code, address, value):
+        slave_ids.append(slave_id)
+
+    assert rtu_over_tcp.send_message(rtu.write_single_register(0, 0, 9),
+                                     sock) is None
+    assert rtu_over_tcp.send_message(rtu.read_holding_registers(1, 0, 1),
+                                     sock) == [9]
+    assert slave_ids == [2]
@@ -2,12 +2,18 @@
 those parts which can't be tested by system tests should be tested using
 unit tests.
 """
+import time
 import struct
+import socket
 import pytest
+from threading import Thread, Event
 
-from umodbus.exceptions import ServerDeviceFailureError
+from umodbus.route import Map
+from umodbus.utils import recv_exactly
+from umodbus.exceptions import ServerDeviceFailureError, ServerDeviceBusyError
+from umodbus.client import tcp
 from umodbus.client.tcp import read_coils
-from umodbus.server.tcp import RequestHandler
+from umodbus.server.tcp import RequestHandler, ThreadPoolTCPServer, get_server
 
 
 @pytest.fixture
@@ -65,3 +71,181 @@ def def_test_get_request_pdu(request_handler, mbap_header):
 
 def test_response_adu(request_handler, mbap_header, meta_data):
     assert len(request_handler.create_response_adu(meta_data, b'')) == 7
+
+
+class SmallThreadPoolTCPServer(ThreadPoolTCPServer):
+    pool_size = 1
+    max_queue_size = 1
+
+
+@pytest.yield_fixture
+def thread_pool_server():
+    server = get_server(SmallThreadPoolTCPServer, ('localhost', 0),
+                        RequestHandler)
+    server.executing = Event()
+    server.release = Event()
+    server.release.set()
+
+    def read(slave_id, function_code, address):
+        server.executing.set()
+        server.release.wait(5)
+        return address
+
+    server.route_map.add_rule(read, [1], [3], [0, 1])
+
+    t = Thread(target=server.serve_forever)
+    t.start()
+
+    yield server
+
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+    t.join()
+
+
+def wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        time.sleep(0.01)
+
+    assert condition()
+
+
+def test_thread_pool_server_doesnt_pin_workers_to_connections(
+        thread_pool_server):
+    """ A connection which stays open must not keep the only worker from
+    executing requests of other connections.
+    """
+    address = thread_pool_server.socket.getsockname()
+    adu = tcp.read_holding_registers(1, 0, 1)
+
+    first = socket.create_connection(address)
+    second = socket.create_connection(address)
+
+    for _ in range(3):
+        assert tcp.send_message(adu, first) == [0]
+        assert tcp.send_message(adu, second) == [0]
+
+    first.close()
+    second.close()
+
+
+def test_thread_pool_server_sheds_requests_when_queue_is_full(
+        thread_pool_server):
+    """ With 1 worker and a queue of 1, the third request must receive a
+    ServerDeviceBusyError immediately.
+    """
+    address = thread_pool_server.socket.getsockname()
+    adu = tcp.read_holding_registers(1, 0, 1)
+    thread_pool_server.release.clear()
+
+    executed = socket.create_connection(address)
+    executed.sendall(adu)
+    wait_until(thread_pool_server.executing.is_set)
+
+    queued = socket.create_connection(address)
+    queued.sendall(adu)
+    wait_until(lambda: thread_pool_server.queue_depth == 1)
+
+    refused = socket.create_connection(address)
+    with pytest.raises(ServerDeviceBusyError):
+        tcp.send_message(adu, refused)
+
+    assert thread_pool_server.shed_requests == 1
+
+    # The refused connection stays open, its next request is executed when a
+    # worker is available.
+    thread_pool_server.release.set()
+    assert tcp.send_message(adu, refused) == [0]
+
+    for sock in [executed, queued, refused]:
+        sock.close()
+
+
+def test_thread_pool_server_sheds_requests_waiting_too_long(
+        thread_pool_server):
+    thread_pool_server.max_queue_time = 0.05
+    address = thread_pool_server.socket.getsockname()
+    adu = tcp.read_holding_registers(1, 0, 1)
+    thread_pool_server.release.clear()
+
+    executed = socket.create_connection(address)
+    executed.sendall(adu)
+    wait_until(thread_pool_server.executing.is_set)
+
+    queued = socket.create_connection(address)
+    queued.sendall(adu)
+    wait_until(lambda: thread_pool_server.queue_depth == 1)
+
+    time.sleep(0.1)
+    thread_pool_server.release.set()
+
+    with pytest.raises(ServerDeviceBusyError):
+        tcp.send_message(adu, queued)
+
+    assert thread_pool_server.shed_requests == 1
+
+    executed.close()
+    queued.close()
+
+
+def test_thread_pool_server_executes_pipelined_requests_in_order(
+        thread_pool_server):
+    address = thread_pool_server.socket.getsockname()
+    sock = socket.create_connection(address)
+
+    first = tcp.read_holding_registers(1, 1, 1)
+    second = tcp.read_holding_registers(1, 0, 1)
+    sock.sendall(first + second)
+
+    assert tcp.parse_response_adu(recv_exactly(sock.recv, 11), first) == [1]
+    assert tcp.parse_response_adu(recv_exactly(sock.recv, 11), second) == [0]
+
+    sock.close()
+
+
+class FakeSocket(object):
+    """ Socket which returns chunks of data on recv() and records data passed
+    to sendall().
+    """
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.sent = []
+
+    def recv(self, size):
+        if not self.chunks:
+            return b''
+
+        return self.chunks.pop(0)
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+
+class FakeServer(object):
+    def __init__(self):
+        self.route_map = Map()
+        self.route_map.add_rule(lambda **kwargs: kwargs['address'], [1], [3],
+                                list(range(10)))
+
+
+def test_request_handler_handles_pipelined_requests():
+    """ Requests received at once must be answered with 1 call to
+    sendall(), a request split over multiple reads must be answered when it's
+    complete.
+    """
+    adus = [struct.pack('>HHHB', i, 0, 6, 1) + struct.pack('>BHH', 3, i, 1)
+            for i in range(3)]
+    data = b''.join(adus)
+
+    request = FakeSocket([data[:20], data[20:]])
+    RequestHandler(request, ('localhost', 502), FakeServer())
+
+    assert len(request.sent) == 2
+
+    responses = b''.join(request.sent)
+    for i in range(3):
+        response = responses[i * 11:(i + 1) * 11]
+        assert struct.unpack('>HHHBBBh', response) == (i, 0, 5, 1, 3, 2, i)
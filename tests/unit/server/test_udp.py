@@ -0,0 +1,72 @@
+import socket
+import pytest
+from threading import Thread
+try:
+    from socketserver import UDPServer
+except ImportError:
+    from SocketServer import UDPServer
+
+from umodbus.client import tcp, udp
+from umodbus.exceptions import IllegalDataAddressError
+from umodbus.server.tcp import get_server
+from umodbus.server.udp import RequestHandler
+
+
+@pytest.yield_fixture
+def app():
+    app = get_server(UDPServer, ('localhost', 0), RequestHandler)
+    app.data = {}
+
+    @app.route(slave_ids=[1], function_codes=[3, 6], addresses=[0, 1])
+    def registers(slave_id, function_code, address, value=None):
+        if value is None:
+            return app.data.get(address, 0)
+
+        app.data[address] = value
+
+    t = Thread(target=app.serve_forever, kwargs={'poll_interval': 0.01})
+    t.start()
+
+    yield app
+
+    app.shutdown()
+    app.server_close()
+    t.join()
+
+
+@pytest.yield_fixture
+def sock(app):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(app.server_address)
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+def test_send_message(sock):
+    assert udp.send_message(tcp.write_single_register(1, 1, 1337), sock) == \
+        1337
+    assert udp.send_message(tcp.read_holding_registers(1, 0, 2), sock) == \
+        [0, 1337]
+
+
+def test_exception_response(sock):
+    with pytest.raises(IllegalDataAddressError):
+        udp.send_message(tcp.read_holding_registers(1, 5, 1), sock)
+
+
+def test_multiple_requests_in_datagram(sock):
+    requests = tcp.write_single_register(1, 0, 5) + \
+        tcp.write_single_register(1, 1, 6)
+    sock.send(requests)
+
+    # Responses of Write Single Register are equal to requests.
+    assert sock.recv(260) == requests
+
+
+def test_malformed_datagram_is_discarded(sock):
+    adu = tcp.read_holding_registers(1, 0, 1)
+    sock.send(adu[:-1])
+    sock.send(adu)
+
+    assert sock.recv(260) == adu[:4] + b'\x00\x05\x01\x03\x02\x00\x00'
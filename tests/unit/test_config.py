@@ -4,6 +4,7 @@ class TestConfig:
         assert config.SINGLE_BIT_VALUE_FORMAT_CHARACTER == 'B'
         assert config.MULTI_BIT_VALUE_FORMAT_CHARACTER == 'H'
         assert not config.SIGNED_VALUES
+        assert config.FRAME_LOG_SAMPLE_RATE == 1
 
     def test_multi_bit_value_signed(self, config):
         """  Test if MULTI_BIT_VALUE_FORMAT_CHARACTER changes when setting
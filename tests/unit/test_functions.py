@@ -15,7 +15,10 @@ from umodbus.exceptions import (IllegalFunctionError, IllegalDataAddressError,
                                 GatewayPathUnavailableError,
                                 GatewayTargetDeviceFailedToRespondError)
 from umodbus.functions import (create_function_from_response_pdu,
-                               create_function_from_request_pdu, ReadCoils,
+                               create_function_from_request_pdu,
+                               expected_request_pdu_size_from_pdu_head,
+                               expected_response_pdu_size_from_pdu_head,
+                               ReadCoils,
                                ReadDiscreteInputs, ReadHoldingRegisters,
                                ReadInputRegisters, WriteSingleCoil,
                                WriteSingleRegister, WriteMultipleCoils,
@@ -143,6 +146,40 @@ def test_create_function_from_request_pdu_raising_illegal_function_error():
         create_function_from_request_pdu(b'\x00')
 
 
+@pytest.mark.parametrize('pdu_head, size', [
+    (b'\x01', 5),
+    (b'\x06\x00\x01', 5),
+    (b'\x0f\x00\x01\x00\x0a', None),
+    (b'\x0f\x00\x01\x00\x0a\x02', 8),
+    (b'\x10\x00\x01\x00\x02\x04', 10),
+])
+def test_expected_request_pdu_size_from_pdu_head(pdu_head, size):
+    assert expected_request_pdu_size_from_pdu_head(pdu_head) == size
+
+
+@pytest.mark.parametrize('pdu_head, size', [
+    (b'\x01', None),
+    (b'\x01\x02', 4),
+    (b'\x03\x14', 22),
+    (b'\x05', 5),
+    (b'\x10', 5),
+    (b'\x83', 2),
+])
+def test_expected_response_pdu_size_from_pdu_head(pdu_head, size):
+    assert expected_response_pdu_size_from_pdu_head(pdu_head) == size
+
+
+@pytest.mark.parametrize('pdu_size_function', [
+    expected_request_pdu_size_from_pdu_head,
+    expected_response_pdu_size_from_pdu_head,
+])
+@pytest.mark.parametrize('pdu_head', [b'\x00', b'\x07', b'\xff'])
+def test_expected_pdu_size_from_pdu_head_raising_illegal_function_error(
+        pdu_size_function, pdu_head):
+    with pytest.raises(IllegalFunctionError):
+        pdu_size_function(pdu_head)
+
+
 def test_read_coils_class_attributes():
     assert ReadCoils.function_code == 1
     assert ReadCoils.max_quantity == 2000
@@ -306,6 +343,20 @@ def test_write_multiple_coils_request_pdu(write_multiple_coils):
     assert instance.values == [1, 0]
 
 
+@pytest.mark.parametrize('quantity', [7, 8, 9, 16])
+def test_write_multiple_coils_request_pdu_byte_count(quantity):
+    instance = WriteMultipleCoils()
+    instance.starting_address = 100
+    instance.values = [1] * quantity
+
+    byte_count = (quantity + 7) // 8
+    assert struct.unpack('>B', instance.request_pdu[5:6])[0] == byte_count
+    assert len(instance.request_pdu) == 6 + byte_count
+
+    assert WriteMultipleCoils.create_from_request_pdu(
+        instance.request_pdu).values == [1] * quantity
+
+
 def test_write_multiple_coils_response_pdu(write_multiple_coils):
     response_pdu = write_multiple_coils.create_response_pdu()
     instance = WriteMultipleCoils.create_from_response_pdu(response_pdu)
@@ -0,0 +1,169 @@
+import struct
+import pytest
+
+from umodbus.functions import (expected_request_pdu_size_from_pdu_head,
+                               expected_response_pdu_size_from_pdu_head)
+from umodbus.client.serial import rtu
+from umodbus.serial_framer import RTUFramer
+from umodbus.client.serial.redundancy_check import add_crc
+
+
+@pytest.fixture
+def framer():
+    return RTUFramer()
+
+
+@pytest.fixture
+def requests():
+    return [
+        rtu.read_coils(1, 0, 10),
+        rtu.write_multiple_registers(2, 100, [1, 2, 3]),
+        rtu.write_single_coil(3, 5, 1),
+    ]
+
+
+def test_framer_splits_frames_received_back_to_back(framer, requests):
+    assert framer.feed(b''.join(requests)) == requests
+    assert framer.frames == 3
+    assert framer.dropped_bytes == 0
+
+
+def test_framer_assembles_frames_split_over_chunks(framer, requests):
+    """ A frame must be emitted as soon as its last byte arrives. """
+    data = b''.join(requests)
+    frames = []
+
+    for i in range(len(data)):
+        frames.extend(framer.feed(data[i:i + 1]))
+
+        if i == len(requests[0]) - 1:
+            assert frames == requests[:1]
+
+    assert frames == requests
+
+
+def test_framer_resynchronises_after_garbage(framer, requests):
+    garbage = b'\x01\x03\xff\x00\x17'
+
+    assert framer.feed(garbage + requests[0] + garbage + requests[1]) == \
+        requests[:2]
+    assert framer.dropped_bytes == 2 * len(garbage)
+    assert framer.crc_errors == 2
+
+
+def test_framer_counts_damaged_frame_once(framer):
+    """ Resynchronising after a damaged frame of 127 bytes slides over many
+    offsets, but it's 1 CRC error.
+    """
+    good = rtu.write_multiple_registers(1, 0, list(range(59)))
+    damaged = bytearray(good)
+    damaged[60] ^= 0xff
+
+    assert framer.feed((bytes(damaged) + good) * 10) == [good] * 10
+    assert (framer.frames, framer.crc_errors) == (10, 10)
+
+    framer.feed(bytes(damaged))
+    framer.flush()
+    assert framer.crc_errors == 11
+
+
+def test_framer_missing(framer, requests):
+    assert framer.missing == 2
+
+    framer.feed(requests[1][:3])
+    assert framer.missing == 4
+
+    framer.feed(requests[1][3:7])
+    assert framer.missing == len(requests[1]) - 7
+
+
+def test_framer_flush(framer, requests):
+    """ After silence bytes of an incomplete frame must be discarded. """
+    framer.feed(requests[0][:5])
+
+    assert framer.flush() == []
+    assert framer.dropped_bytes == 5
+    assert framer.feed(requests[0]) == requests[:1]
+
+
+def test_framer_flush_emits_frame_with_unknown_function_code(framer):
+    """ A frame with an unknown function code can only be recognized when the
+    line is silent after it.
+    """
+    adu = add_crc(struct.pack('>BBH', 1, 0x2b, 0))
+
+    assert framer.feed(adu) == []
+    assert framer.flush() == [adu]
+    assert framer.dropped_bytes == 0
+
+
+def test_framer_for_responses():
+    framer = RTUFramer(
+        pdu_size_functions=[expected_response_pdu_size_from_pdu_head])
+    responses = [
+        add_crc(struct.pack('>BBBHH', 1, 3, 4, 1, 2)),
+        add_crc(struct.pack('>BBB', 1, 0x83, 2)),
+        add_crc(struct.pack('>BBHH', 1, 6, 1, 1337)),
+    ]
+
+    assert framer.feed(b''.join(responses)) == responses
+
+
+def test_framer_for_requests_and_responses(requests):
+    framer = RTUFramer(
+        pdu_size_functions=[expected_request_pdu_size_from_pdu_head,
+                            expected_response_pdu_size_from_pdu_head])
+    response = add_crc(struct.pack('>BBBH', 1, 1, 2, 0x155))
+
+    assert framer.feed(requests[0] + response + requests[1]) == \
+        [requests[0], response, requests[1]]
+
+
+def test_framer_ignores_frames_for_other_slaves(requests):
+    framer = RTUFramer(slave_ids=set([1, 3]))
+
+    assert framer.feed(requests[0]) == requests[:1]
+    assert framer.feed(requests[1] + requests[2]) == requests[2:]
+    assert framer.foreign_frames == 1
+    assert not framer.receiving
+    assert framer.dropped_bytes == 0
+
+
+def test_framer_skips_foreign_frames_received_back_to_back():
+    """ A request and response of another slave, followed without silence by
+    a request for this slave.
+    """
+    framer = RTUFramer(slave_ids=set([1]))
+    foreign_request = rtu.read_holding_registers(2, 0, 3)
+    foreign_response = add_crc(struct.pack('>BBBHHH', 2, 3, 6, 1, 2, 3))
+    request = rtu.read_holding_registers(1, 0, 3)
+
+    assert framer.feed(foreign_request + foreign_response + request) == \
+        [request]
+    assert framer.foreign_frames == 2
+    assert framer.dropped_bytes == 0
+
+
+def test_framer_skips_foreign_frames_byte_by_byte():
+    framer = RTUFramer(slave_ids=set([1]))
+    foreign_request = rtu.write_single_register(2, 0, 1)
+    foreign_response = foreign_request
+    request = rtu.write_single_register(1, 0, 1)
+
+    data = foreign_request + foreign_response + request
+    frames = []
+
+    for i in range(len(data)):
+        assert framer.missing >= 1
+        frames.extend(framer.feed(data[i:i + 1]))
+
+    assert frames == [request]
+    assert framer.foreign_frames == 2
+
+
+def test_framer_assembles_broadcasts_for_other_slaves():
+    framer = RTUFramer(slave_ids=set([1]))
+    broadcast = rtu.write_single_register(0, 2, 1337)
+
+    assert framer.feed(broadcast) == [broadcast]
+    assert framer.foreign_frames == 0
@@ -1,10 +1,12 @@
 import sys
+import socket
 import logging
 from logging import getLogger
 
-from umodbus.utils import (log_to_stream, unpack_mbap, pack_mbap,
+from umodbus import conf
+from umodbus.utils import (log_to_stream, log_frame, unpack_mbap, pack_mbap,
                            pack_exception_pdu,
-                           get_function_code_from_request_pdu)
+                           get_function_code_from_request_pdu, wait_readable)
 
 
 def test_log_to_stream():
@@ -44,3 +46,44 @@ def test_pack_exception_pdu():
 def test_get_function_code_from_request_pdu():
     """ Get correct function code from PDU. """
     assert get_function_code_from_request_pdu(b'\x01\x00d\x00\x03') == 1
+
+
+def test_log_frame_does_nothing_when_level_is_disabled(caplog):
+    """ Frame must not be formatted when level isn't enabled. Formatting None
+    would raise a TypeError.
+    """
+    caplog.set_level(logging.INFO, logger='uModbus')
+    log_frame(logging.DEBUG, '--> {frame}', None)
+
+    assert caplog.records == []
+
+
+def test_log_frame(caplog):
+    caplog.set_level(logging.DEBUG, logger='uModbus')
+    log_frame(logging.INFO, '--> {0} - {frame}.', b'\x01\xff', '1.2.3.4')
+
+    assert caplog.records[0].getMessage() == "--> 1.2.3.4 - b'01ff'."
+    assert caplog.records[0].levelno == logging.INFO
+
+
+def test_log_frame_with_sample_rate(caplog, monkeypatch):
+    """ Only 1 in every 3 frames must be logged. """
+    monkeypatch.setattr(conf, 'FRAME_LOG_SAMPLE_RATE', 3)
+    caplog.set_level(logging.DEBUG, logger='uModbus')
+
+    for _ in range(6):
+        log_frame(logging.DEBUG, '<-- {frame}', b'\x01')
+
+    assert len(caplog.records) == 2
+
+
+def test_wait_readable():
+    a, b = socket.socketpair()
+
+    assert wait_readable([a, b.fileno()], timeout=0) == []
+
+    a.send(b'\x00')
+    assert wait_readable([a, b.fileno()], timeout=1) == [b.fileno()]
+
+    a.close()
+    b.close()
@@ -0,0 +1,182 @@
+""" Merge writes of single values into Write Multiple requests.
+
+Writing every changed value with its own request costs a round trip per
+value. :class:`WriteBatcher` collects writes for a short window, or until
+:meth:`WriteBatcher.flush` is called, and writes values of contiguous
+addresses with 1 Write Multiple Coils or Write Multiple Registers request::
+
+    import socket
+
+    from umodbus.client import tcp
+    from umodbus.client.batcher import WriteBatcher
+
+    sock = socket.create_connection(('192.168.1.20', 502))
+
+    with WriteBatcher(tcp, sock, window=None) as batcher:
+        for address, value in enumerate([3, 1, 4, 1, 5]):
+            batcher.write_single_register(1, address, value)
+
+    # 1 request has been send instead of 5.
+    print(batcher.round_trips_saved)
+
+When an address is written more than once before the writes are send, only
+the last value is written. Writes to different addresses are not send in the
+order they were made.
+
+"""
+from threading import Lock, Timer
+
+from umodbus import log
+from umodbus.client.bulk import (send_messages, MAX_WRITE_COILS,
+                                 MAX_WRITE_REGISTERS)
+
+COILS = 'coils'
+REGISTERS = 'registers'
+
+# Tuples with names of functions to create a request for 1 and for multiple
+# values, and max number of values per request.
+_functions = {
+    COILS: ('write_single_coil', 'write_multiple_coils', MAX_WRITE_COILS),
+    REGISTERS: ('write_single_register', 'write_multiple_registers',
+                MAX_WRITE_REGISTERS),
+}
+
+
+class WriteBatcher(object):
+    """ Collect writes and send them in as few requests as possible.
+
+    :param client: Module to create requests with, :mod:`umodbus.client.tcp`
+        or :mod:`umodbus.client.serial.rtu`.
+    :param transport: Socket or serial port instance.
+    :param window: Number of seconds after the first pending write at which
+        all pending writes are send, from a timer thread. None to send only
+        when :meth:`flush` is called.
+    :param max_in_flight: Max number of pipelined requests, see
+        :func:`umodbus.client.bulk.send_messages`.
+    """
+    def __init__(self, client, transport, window=0.05, max_in_flight=8):
+        self.client = client
+        self.transport = transport
+        self.window = window
+        self.max_in_flight = max_in_flight
+
+        self.writes = 0
+        """ Number of values written by application. """
+
+        self.requests = 0
+        """ Number of requests send. """
+
+        self.errors = 0
+        """ Number of flushes from timer thread which failed. """
+
+        # Dict with tuple of slave id and table as key and dict with address
+        # and value as value.
+        self._pending = {}
+        self._lock = Lock()
+        self._timer = None
+
+    @property
+    def round_trips_saved(self):
+        """ Number of requests saved by merging writes. """
+        return self.writes - self.pending - self.requests
+
+    @property
+    def pending(self):
+        """ Number of values waiting to be written. """
+        return sum(len(values) for values in self._pending.values())
+
+    def _write(self, slave_id, table, address, value):
+        with self._lock:
+            self._pending.setdefault((slave_id, table), {})[address] = value
+            self.writes += 1
+
+            if self.window is not None and self._timer is None:
+                self._timer = Timer(self.window, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def write_single_coil(self, slave_id, address, value):
+        """ Write value of coil when writes are flushed.
+
+        :param slave_id: Number of slave.
+        :param address: Address of coil.
+        :param value: Value, 0 or 1.
+        """
+        self._write(slave_id, COILS, address, value)
+
+    def write_single_register(self, slave_id, address, value):
+        """ Write value of holding register when writes are flushed.
+
+        :param slave_id: Number of slave.
+        :param address: Address of holding register.
+        :param value: Value.
+        """
+        self._write(slave_id, REGISTERS, address, value)
+
+    def create_adus(self, pending):
+        """ Return request ADU's which write pending values. Values of
+        contiguous addresses are written with 1 request.
+
+        :param pending: Dict with tuple of slave id and table as key and a
+            dict with address and value as value.
+        :return: List with request ADU's.
+        """
+        adus = []
+
+        for (slave_id, table), values in sorted(pending.items()):
+            single, multiple, max_quantity = _functions[table]
+            run = []
+
+            for address in sorted(values) + [None]:
+                if run and (address != run[0] + len(run) or
+                            len(run) == max_quantity):
+                    if len(run) == 1:
+                        adus.append(getattr(self.client, single)(
+                            slave_id, run[0], values[run[0]]))
+                    else:
+                        adus.append(getattr(self.client, multiple)(
+                            slave_id, run[0], [values[a] for a in run]))
+                    run = []
+
+                run.append(address)
+
+        return adus
+
+    def flush(self):
+        """ Send all pending writes.
+
+        :return: Number of requests send.
+        :raises ModbusError: When a write fails. The values of all pending
+            writes are discarded.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            pending, self._pending = self._pending, {}
+            adus = self.create_adus(pending)
+
+            if adus:
+                self.requests += len(adus)
+                send_messages(adus, self.client, self.transport,
+                              self.max_in_flight)
+
+            return len(adus)
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            self.errors += 1
+            log.error('Can\'t flush writes: {0!r}.'.format(e))
+
+    def close(self):
+        """ Send pending writes and stop timer. """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,225 @@
+""" Read and write more values than fit in 1 request.
+
+A request reads at most 2000 coils or 125 registers and writes at most 1968
+coils or 123 registers. The functions in this module split a read or write
+in requests which fit and reassemble the responses in 1 list::
+
+    import socket
+
+    from umodbus.client import tcp
+    from umodbus.client.bulk import read_holding_registers_bulk
+
+    sock = socket.create_connection(('192.168.1.20', 502))
+
+    # 8 requests, send without waiting for the previous response.
+    values = read_holding_registers_bulk(tcp, sock, slave_id=1,
+                                         starting_address=0, quantity=1000)
+
+With :mod:`umodbus.client.tcp` the requests are pipelined: up to
+`max_in_flight` requests are send before their responses are read, so the
+round trips of the requests overlap. Responses are matched with their
+request by transaction id. With other clients, like
+:mod:`umodbus.client.serial.rtu`, requests are send one after another.
+
+"""
+import struct
+from random import randint
+
+from umodbus.client import tcp
+from umodbus.utils import unpack_mbap, recv_exactly
+from umodbus.functions import (function_code_to_function_map, READ_COILS,
+                               READ_DISCRETE_INPUTS, READ_HOLDING_REGISTERS,
+                               READ_INPUT_REGISTERS)
+
+# Max number of values written by 1 Write Multiple Coils or Write Multiple
+# Registers request.
+MAX_WRITE_COILS = 0x07B0
+MAX_WRITE_REGISTERS = 0x007B
+
+
+def _split(starting_address, quantity, max_quantity):
+    """ Return list with tuples of address and quantity of every chunk. """
+    return [(address, min(max_quantity, starting_address + quantity - address))
+            for address in range(starting_address, starting_address + quantity,
+                                 max_quantity)]
+
+
+def send_pipelined(adus, sock, max_in_flight=8):
+    """ Send Modbus TCP/IP ADU's over socket without waiting for the response
+    of previous ADU's and return the parsed responses.
+
+    Transaction ids of the ADU's are replaced by unique ones. When a response
+    contains an error, the responses of requests already send are read
+    before the error is raised, so the socket can still be used.
+
+    :param adus: List with request ADU's, see :mod:`umodbus.client.tcp`.
+    :param sock: Socket instance.
+    :param max_in_flight: Max number of requests send of which the response
+        hasn't been received.
+    :return: List with parsed responses, in order of ADU's.
+    :raises ModbusError: When a response contains an error code, the first
+        error is raised.
+    """
+    first_transaction_id = randint(0, 65535)
+    adus = [struct.pack('>H', (first_transaction_id + i) & 0xFFFF) + adu[2:]
+            for i, adu in enumerate(adus)]
+    responses = [None] * len(adus)
+    # Dict with transaction id as key and index of request as value.
+    in_flight = {}
+    next_index = 0
+    error = None
+
+    while True:
+        # After an error no more requests are send, only the responses of
+        # pending requests are read.
+        window = []
+        while error is None and next_index < len(adus) and \
+                len(in_flight) < max_in_flight:
+            in_flight[(first_transaction_id + next_index) & 0xFFFF] = \
+                next_index
+            window.append(adus[next_index])
+            next_index += 1
+
+        if window:
+            sock.sendall(b''.join(window))
+
+        if not in_flight:
+            break
+
+        mbap = recv_exactly(sock.recv, 7)
+        transaction_id, _, length, _ = unpack_mbap(mbap)
+        response_adu = mbap + recv_exactly(sock.recv, length - 1)
+
+        try:
+            index = in_flight.pop(transaction_id)
+        except KeyError:
+            raise ValueError('Unexpected transaction id {0}.'
+                             .format(transaction_id))
+
+        try:
+            tcp.raise_for_exception_adu(response_adu)
+            responses[index] = tcp.parse_response_adu(response_adu,
+                                                      adus[index])
+        except Exception as e:
+            if error is None:
+                error = e
+
+    if error is not None:
+        raise error
+
+    return responses
+
+
+def send_messages(adus, client, transport, max_in_flight=8):
+    """ Send ADU's and return parsed responses.
+
+    :param adus: List with request ADU's.
+    :param client: Module which created the ADU's, like
+        :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+    :param transport: Socket or serial port instance, as accepted by the
+        `send_message` function of client.
+    :param max_in_flight: Max number of pipelined requests, only used with
+        :mod:`umodbus.client.tcp`.
+    :return: List with parsed responses, in order of ADU's.
+    """
+    if client is tcp:
+        return send_pipelined(adus, transport, max_in_flight)
+
+    return [client.send_message(adu, transport) for adu in adus]
+
+
+def _read(function_name, function_code, client, transport, slave_id,
+          starting_address, quantity, max_in_flight):
+    create_adu = getattr(client, function_name)
+    chunks = _split(starting_address, quantity,
+                    function_code_to_function_map[function_code].max_quantity)
+
+    adus = [create_adu(slave_id, address, count) for address, count in chunks]
+
+    values = []
+    for response in send_messages(adus, client, transport, max_in_flight):
+        values.extend(response)
+
+    return values
+
+
+def _write(function_name, max_quantity, client, transport, slave_id,
+           starting_address, values, max_in_flight):
+    create_adu = getattr(client, function_name)
+    chunks = _split(starting_address, len(values), max_quantity)
+
+    return sum(send_messages(
+        [create_adu(slave_id, address,
+                    values[address - starting_address:
+                           address - starting_address + count])
+         for address, count in chunks],
+        client, transport, max_in_flight))
+
+
+def read_coils_bulk(client, transport, slave_id, starting_address, quantity,
+                    max_in_flight=8):
+    """ Read any number of coils.
+
+    :param client: Module to create requests with,
+        :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+    :param transport: Socket or serial port instance.
+    :param slave_id: Number of slave.
+    :param starting_address: First address to read.
+    :param quantity: Number of coils to read.
+    :param max_in_flight: Max number of pipelined requests.
+    :return: List with values.
+    """
+    return _read('read_coils', READ_COILS, client, transport, slave_id,
+                 starting_address, quantity, max_in_flight)
+
+
+def read_discrete_inputs_bulk(client, transport, slave_id, starting_address,
+                              quantity, max_in_flight=8):
+    """ Read any number of discrete inputs, see :func:`read_coils_bulk`. """
+    return _read('read_discrete_inputs', READ_DISCRETE_INPUTS, client,
+                 transport, slave_id, starting_address, quantity,
+                 max_in_flight)
+
+
+def read_holding_registers_bulk(client, transport, slave_id,
+                                starting_address, quantity, max_in_flight=8):
+    """ Read any number of holding registers, see :func:`read_coils_bulk`.
+    """
+    return _read('read_holding_registers', READ_HOLDING_REGISTERS, client,
+                 transport, slave_id, starting_address, quantity,
+                 max_in_flight)
+
+
+def read_input_registers_bulk(client, transport, slave_id, starting_address,
+                              quantity, max_in_flight=8):
+    """ Read any number of input registers, see :func:`read_coils_bulk`. """
+    return _read('read_input_registers', READ_INPUT_REGISTERS, client,
+                 transport, slave_id, starting_address, quantity,
+                 max_in_flight)
+
+
+def write_multiple_coils_bulk(client, transport, slave_id, starting_address,
+                              values, max_in_flight=8):
+    """ Write any number of coils.
+
+    :param client: Module to create requests with,
+        :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+    :param transport: Socket or serial port instance.
+    :param slave_id: Number of slave.
+    :param starting_address: First address to write.
+    :param values: List with values.
+    :param max_in_flight: Max number of pipelined requests.
+    :return: Number of values written.
+    """
+    return _write('write_multiple_coils', MAX_WRITE_COILS, client, transport,
+                  slave_id, starting_address, values, max_in_flight)
+
+
+def write_multiple_registers_bulk(client, transport, slave_id,
+                                  starting_address, values, max_in_flight=8):
+    """ Write any number of holding registers, see
+    :func:`write_multiple_coils_bulk`.
+    """
+    return _write('write_multiple_registers', MAX_WRITE_REGISTERS, client,
+                  transport, slave_id, starting_address, values,
+                  max_in_flight)
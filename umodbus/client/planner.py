@@ -0,0 +1,181 @@
+""" Merge reads of many scattered addresses into few requests.
+
+Reading every tag with its own request costs a round trip per tag.
+:func:`plan_reads` merges the needs of many tags into the fewest requests
+which respect the limits of the protocol. Needs are tuples with 4 values:
+slave id, function code, address and number of values::
+
+    import socket
+    from functools import partial
+
+    from umodbus.client import tcp
+    from umodbus.client.planner import read
+    from umodbus.functions import READ_COILS, READ_HOLDING_REGISTERS
+
+    sock = socket.create_connection(('192.168.1.20', 502))
+
+    needs = [
+        (1, READ_HOLDING_REGISTERS, 0, 2),
+        (1, READ_HOLDING_REGISTERS, 10, 1),
+        (1, READ_HOLDING_REGISTERS, 4, 1),
+        (1, READ_COILS, 100, 8),
+    ]
+
+    # 1 request reads holding registers 0 to 10, another the coils.
+    print(read(needs, tcp, partial(tcp.send_message, sock=sock), max_gap=8))
+
+The planner only creates requests, it works with the functions of both
+:mod:`umodbus.client.tcp` and :mod:`umodbus.client.serial.rtu`.
+
+"""
+from umodbus.functions import (function_code_to_function_map, READ_COILS,
+                               READ_DISCRETE_INPUTS, READ_HOLDING_REGISTERS,
+                               READ_INPUT_REGISTERS)
+
+_function_names = {
+    READ_COILS: 'read_coils',
+    READ_DISCRETE_INPUTS: 'read_discrete_inputs',
+    READ_HOLDING_REGISTERS: 'read_holding_registers',
+    READ_INPUT_REGISTERS: 'read_input_registers',
+}
+
+
+class ReadRequest(object):
+    """ Request which reads a range of addresses for 1 or more needs.
+
+    :param slave_id: Slave id.
+    :param function_code: Function code.
+    :param starting_address: First address to read.
+    :param quantity: Number of addresses to read.
+    """
+    def __init__(self, slave_id, function_code, starting_address, quantity):
+        self.slave_id = slave_id
+        self.function_code = function_code
+        self.starting_address = starting_address
+        self.quantity = quantity
+
+    def __repr__(self):
+        return '<ReadRequest slave_id={0} function_code={1} ' \
+            'starting_address={2} quantity={3}>'.format(
+                self.slave_id, self.function_code, self.starting_address,
+                self.quantity)
+
+    def create_adu(self, client):
+        """ Return request ADU.
+
+        :param client: Module with functions to create request ADU's,
+            :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+        :return: Byte array with ADU.
+        """
+        return getattr(client, _function_names[self.function_code])(
+            self.slave_id, self.starting_address, self.quantity)
+
+
+def plan_reads(needs, max_gap=0, max_quantity=None):
+    """ Return fewest requests which read all addresses of needs.
+
+    Needs of the same slave and function code are merged when the number of
+    unneeded addresses between them is at most `max_gap`, and the request
+    doesn't exceed the maximum quantity of its function code. A need which
+    doesn't fit in 1 request is spread over multiple requests.
+
+    :param needs: Iterable with tuples of slave id, function code, address
+        and number of values.
+    :param max_gap: Max number of unneeded addresses read to merge 2 needs.
+    :param max_quantity: Max number of addresses read by a request, for
+        devices which support less than the protocol does. Default is the
+        maximum of the protocol: 2000 coils or discrete inputs, 125
+        registers.
+    :return: List with instances of :class:`ReadRequest`.
+    :raises ValueError: When a need has a function code which doesn't read
+        or a count lower than 1.
+    """
+    groups = {}
+
+    for slave_id, function_code, address, count in needs:
+        if function_code not in _function_names:
+            raise ValueError('Function code {0} doesn\'t read.'
+                             .format(function_code))
+
+        if count < 1:
+            raise ValueError('Count must be at least 1, not {0}.'
+                             .format(count))
+
+        groups.setdefault((slave_id, function_code), []).append(
+            (address, address + count))
+
+    requests = []
+
+    for (slave_id, function_code), ranges in sorted(groups.items()):
+        limit = function_code_to_function_map[function_code].max_quantity
+
+        if max_quantity is not None:
+            limit = min(limit, max_quantity)
+
+        request = None
+
+        for start, end in sorted(ranges):
+            while True:
+                if request is not None:
+                    request_end = request.starting_address + request.quantity
+                    # Part of range might be read already.
+                    start = max(start, request_end)
+
+                    if start >= end:
+                        break
+
+                    if start - request_end <= max_gap and \
+                            start < request.starting_address + limit:
+                        request.quantity = min(end - request.starting_address,
+                                               limit)
+                        continue
+
+                request = ReadRequest(slave_id, function_code, start,
+                                      min(end - start, limit))
+                requests.append(request)
+
+    return requests
+
+
+def split_responses(needs, requests, responses):
+    """ Return values of every need from responses of requests.
+
+    :param needs: Iterable with needs passed to :func:`plan_reads`.
+    :param requests: List with instances of :class:`ReadRequest` returned by
+        :func:`plan_reads`.
+    :param responses: List with parsed responses, 1 for every request.
+    :return: List with list of values for every need, in order of needs.
+    """
+    tables = {}
+
+    for request, values in zip(requests, responses):
+        table = tables.setdefault((request.slave_id, request.function_code),
+                                  {})
+
+        for i, value in enumerate(values):
+            table[request.starting_address + i] = value
+
+    return [[tables[(slave_id, function_code)][address]
+             for address in range(starting_address, starting_address + count)]
+            for slave_id, function_code, starting_address, count in needs]
+
+
+def read(needs, client, send_message, max_gap=0, max_quantity=None):
+    """ Read needs with fewest requests, see :func:`plan_reads`.
+
+    :param needs: Iterable with tuples of slave id, function code, address
+        and number of values.
+    :param client: Module with functions to create request ADU's,
+        :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+    :param send_message: Function which sends a request ADU and returns the
+        parsed response.
+    :param max_gap: Max number of unneeded addresses read to merge 2 needs.
+    :param max_quantity: Max number of addresses read by a request.
+    :return: List with list of values for every need, in order of needs.
+    """
+    needs = list(needs)
+    requests = plan_reads(needs, max_gap, max_quantity)
+    responses = [send_message(request.create_adu(client))
+                 for request in requests]
+
+    return split_responses(needs, requests, responses)
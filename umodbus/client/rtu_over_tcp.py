@@ -0,0 +1,72 @@
+""" Send Modbus RTU frames over a TCP connection.
+
+Many serial to Ethernet converters forward raw RTU frames, address field,
+PDU and CRC, over a TCP socket instead of translating them to Modbus TCP/IP.
+Request ADU's are created with the functions in
+:mod:`umodbus.client.serial.rtu`, :func:`send_message` sends them over a
+socket::
+
+    import socket
+
+    from umodbus.client.serial import rtu
+    from umodbus.client import rtu_over_tcp
+
+    sock = socket.create_connection(('192.168.1.20', 4001))
+
+    adu = rtu.read_holding_registers(slave_id=1, starting_address=0,
+                                     quantity=10)
+    print(rtu_over_tcp.send_message(adu, sock))
+
+    sock.close()
+
+TCP is a stream, so there is no silence to delimit frames. Responses are
+read based on their expected size.
+
+"""
+import struct
+
+from umodbus.utils import recv_exactly
+from umodbus.functions import expected_response_pdu_size_from_request_pdu
+from umodbus.client.serial.rtu import (read_with_crc, parse_response_pdu,
+                                       is_broadcast, raise_for_exception_adu)
+from umodbus.client.serial.redundancy_check import CRCAccumulator, CRCError
+
+
+def send_message(adu, sock):
+    """ Send RTU ADU over socket to server and return parsed response.
+
+    The CRC of the response is calculated chunk by chunk while the response is
+    received.
+
+    :param adu: Request ADU, see :mod:`umodbus.client.serial.rtu`.
+    :param sock: Socket instance.
+    :return: Parsed response from server, None for broadcast requests.
+    """
+    sock.sendall(adu)
+
+    if is_broadcast(adu):
+        return None
+
+    crc = CRCAccumulator()
+    read = read_with_crc(sock.recv, crc)
+
+    # Check exception ADU (which is shorter than all other responses) first.
+    exception_adu_size = 5
+    response_error_adu = recv_exactly(read, exception_adu_size)
+    is_exception = struct.unpack('>B', response_error_adu[1:2])[0] & 0x80
+    response_remainder = b''
+
+    if not is_exception:
+        expected_response_size = \
+            expected_response_pdu_size_from_request_pdu(adu[1:-2]) + 3
+        response_remainder = recv_exactly(
+            read, expected_response_size - exception_adu_size)
+
+    # A corrupted error code must not be raised as exception response.
+    if not crc.valid:
+        raise CRCError('CRC validation failed.')
+
+    raise_for_exception_adu(response_error_adu)
+
+    response_adu = response_error_adu + response_remainder
+    return parse_response_pdu(response_adu[1:-2], adu)
@@ -0,0 +1,230 @@
+""" Modbus RTU client for :mod:`asyncio` applications.
+
+:func:`umodbus.client.serial.rtu.send_message` blocks until the response has
+been received. :class:`AsyncRTUClient` waits for the response without
+blocking the event loop. The ADU's are created with the functions in
+:mod:`umodbus.client.serial.rtu`::
+
+    import asyncio
+    from serial import Serial
+
+    from umodbus.client.serial import rtu
+    from umodbus.client.serial.async_rtu import AsyncRTUClient
+
+    async def main():
+        client = AsyncRTUClient(Serial(port='/dev/ttyS1', baudrate=19200))
+        adu = rtu.read_holding_registers(slave_id=1, starting_address=0,
+                                         quantity=10)
+
+        print(await client.send_message(adu, turnaround_time=0.02))
+
+    asyncio.get_event_loop().run_until_complete(main())
+
+The event loop is notified when data arrives on the file descriptor of the
+serial port. Serial ports without file descriptor, like those created with
+`serial_for_url('loop://')`, are polled.
+
+.. note:: This module requires Python 3.5 or newer.
+
+"""
+import io
+import struct
+import asyncio
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.client.serial import rtu
+from umodbus.client.serial.metrics import LinkMetrics
+from umodbus.functions import expected_response_pdu_size_from_request_pdu
+from umodbus.client.serial.redundancy_check import CRCAccumulator, CRCError
+
+# Number of seconds between 2 checks for data on serial ports without file
+# descriptor.
+POLL_INTERVAL = 0.001
+
+
+def _get_fileno(serial_port):
+    """ Return file descriptor of serial port, None if it hasn't one. """
+    try:
+        return serial_port.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+
+
+async def wait_for_data(serial_port, timeout=None):
+    """ Wait until data is available on serial port.
+
+    :param serial_port: Serial port instance.
+    :param timeout: Max number of seconds to wait, None to wait forever.
+    :return: True if data is available, False if timeout expired.
+    """
+    if serial_port.in_waiting:
+        return True
+
+    loop = asyncio.get_event_loop()
+    fd = _get_fileno(serial_port)
+
+    if fd is None:
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while not serial_port.in_waiting:
+            if deadline is not None and monotonic() >= deadline:
+                return False
+
+            await asyncio.sleep(POLL_INTERVAL)
+
+        return True
+
+    future = loop.create_future()
+    loop.add_reader(fd, lambda: future.done() or future.set_result(True))
+
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        loop.remove_reader(fd)
+
+
+class AsyncRTUClient(object):
+    """ Send requests over a serial port. Concurrent calls of
+    :meth:`send_message` are handled one after another.
+
+    :param serial_port: Serial port instance. The client sets its timeout to
+        0, reads never block.
+    :param timeout: Number of seconds to wait for a response when no
+        turnaround time is given. Default is the timeout of the serial port.
+    """
+    def __init__(self, serial_port, timeout=None):
+        if timeout is None:
+            timeout = serial_port.timeout
+
+        self.timeout = timeout
+
+        serial_port.timeout = 0
+        self.serial_port = serial_port
+
+        self.metrics = LinkMetrics(serial_port.baudrate)
+        """ Instance of :class:`umodbus.client.serial.metrics.LinkMetrics`.
+        """
+
+        # Created by send_message(), so it's bound to the event loop the
+        # client is used from instead of the one current at construction.
+        self._lock = None
+        self._last_activity = None
+
+    async def _wait_for_silent_interval(self):
+        """ Keep line silent for t3.5 after last frame. """
+        if self._last_activity is None:
+            return
+
+        remaining = self._last_activity + \
+            rtu.get_silent_interval(self.serial_port.baudrate) - monotonic()
+
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    async def _recv_exactly(self, size, timeout, crc):
+        """ Return exactly `size` bytes and update CRC with them.
+
+        :raises ValueError: When not enough bytes are received in time.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        data = b''
+
+        while len(data) < size:
+            remaining = None if deadline is None else deadline - monotonic()
+
+            if not await wait_for_data(self.serial_port, remaining):
+                raise ValueError
+
+            chunk = self.serial_port.read(min(size - len(data),
+                                              self.serial_port.in_waiting))
+            crc.update(chunk)
+            data += chunk
+
+        return data
+
+    def _get_timeout(self, response_size, turnaround_time):
+        if turnaround_time is None:
+            return self.timeout
+
+        return rtu.get_response_timeout(self.serial_port.baudrate,
+                                        response_size, turnaround_time)
+
+    async def _send_message(self, adu, turnaround_time):
+        self.serial_port.write(adu)
+        self.metrics.frame_sent(adu)
+
+        if rtu.is_broadcast(adu):
+            if turnaround_time is None:
+                turnaround_time = rtu.get_broadcast_turnaround_time(
+                    self.serial_port.baudrate)
+
+            await asyncio.sleep(turnaround_time)
+            return None
+
+        exception_adu_size = 5
+        expected_response_size = \
+            expected_response_pdu_size_from_request_pdu(adu[1:-2]) + 3
+        crc = CRCAccumulator()
+
+        try:
+            # Transmission time of request counts towards the timeout,
+            # because write() doesn't block until the request has been sent.
+            response_error_adu = await self._recv_exactly(
+                exception_adu_size,
+                self._get_timeout(len(adu) + exception_adu_size,
+                                  turnaround_time),
+                crc)
+
+            is_exception = \
+                struct.unpack('>B', response_error_adu[1:2])[0] & 0x80
+            response_remainder = b''
+
+            if not is_exception:
+                response_remainder = await self._recv_exactly(
+                    expected_response_size - exception_adu_size,
+                    self._get_timeout(
+                        expected_response_size - exception_adu_size, 0),
+                    crc)
+        except ValueError:
+            self.metrics.timeouts += 1
+            self.metrics.bytes_in += crc.size
+            raise
+
+        if not crc.valid:
+            self.metrics.crc_errors += 1
+            self.metrics.bytes_in += crc.size
+            raise CRCError('CRC validation failed.')
+
+        response_adu = response_error_adu + response_remainder
+        self.metrics.frame_received(response_adu)
+
+        if is_exception:
+            self.metrics.exception_responses += 1
+            rtu.raise_for_exception_adu(response_adu)
+
+        return rtu.parse_response_pdu(response_adu[1:-2], adu)
+
+    async def send_message(self, adu, turnaround_time=None):
+        """ Send ADU and return parsed response. See
+        :func:`umodbus.client.serial.rtu.send_message`.
+
+        :param adu: Request ADU.
+        :param turnaround_time: Number of seconds a slave needs before it
+            starts to respond, None to use :attr:`timeout`.
+        :return: Parsed response from server, None for broadcast requests.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            await self._wait_for_silent_interval()
+
+            try:
+                return await self._send_message(adu, turnaround_time)
+            finally:
+                self._last_activity = monotonic()
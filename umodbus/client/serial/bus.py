@@ -0,0 +1,196 @@
+""" Share one serial line between multiple threads.
+
+A Modbus RTU bus has exactly one master and only 1 transaction can be in
+flight at the same time. :func:`umodbus.client.serial.rtu.send_message`
+assumes the caller owns the serial port. :class:`BusMaster` serialises access
+to a serial port. Requests waiting for the bus are served by priority and in
+order of arrival within a priority, so urgent writes don't have to wait for a
+long poll cycle::
+
+    from serial import Serial
+
+    from umodbus.client.serial import rtu
+    from umodbus.client.serial.bus import BusMaster, PRIORITY_CONTROL
+
+    bus = BusMaster(Serial(port='/dev/ttyS1', baudrate=9600, timeout=1))
+
+    # In a polling thread.
+    values = bus.send_message(rtu.read_holding_registers(1, 0, 10))
+
+    # In another thread, served before all waiting polls.
+    bus.send_message(rtu.write_single_coil(1, 0, 1),
+                     priority=PRIORITY_CONTROL, timeout=0.5)
+
+"""
+import heapq
+import itertools
+from threading import Condition, Lock
+from contextlib import contextmanager
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.client.serial import rtu
+from umodbus.client.serial.metrics import LinkMetrics
+
+PRIORITY_CONTROL = 0
+PRIORITY_POLL = 10
+
+
+class DeadlineExceededError(Exception):
+    """ Bus didn't become available before deadline of request. """
+    pass
+
+
+class BusMaster(object):
+    """ Serialise transactions on a serial port. Lower priorities are served
+    first.
+
+    :param serial_port: Serial port instance.
+    """
+    def __init__(self, serial_port):
+        self.serial_port = serial_port
+
+        self.metrics = LinkMetrics(serial_port.baudrate)
+        """ Instance of :class:`umodbus.client.serial.metrics.LinkMetrics`,
+        updated by :meth:`send_message`. Pass it to
+        :func:`umodbus.client.serial.rtu.send_message` to count transactions
+        done with :meth:`acquire` too.
+        """
+
+        self._condition = Condition(Lock())
+        self._queue = []
+        self._counter = itertools.count()
+        self._busy = False
+
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        """ Reset all counters, including those of :attr:`metrics`. """
+        with self._condition:
+            self.metrics.reset()
+
+            self.transactions = 0
+            """ Number of transactions which got access to the bus. """
+
+            self.expired_requests = 0
+            """ Number of requests which didn't get access to the bus before
+            their deadline.
+            """
+
+            self.wait_time = 0.0
+            """ Total number of seconds transactions waited for the bus. """
+
+            self.max_wait_time = 0.0
+            """ Longest number of seconds a transaction waited for the bus. """
+
+            self.busy_time = 0.0
+            """ Total number of seconds the bus has been in use. """
+
+            self._metrics_start = monotonic()
+
+    @property
+    def queue_depth(self):
+        """ Number of requests waiting for the bus. """
+        return len(self._queue)
+
+    @property
+    def mean_wait_time(self):
+        """ Mean number of seconds transactions waited for the bus. """
+        if self.transactions == 0:
+            return 0.0
+
+        return self.wait_time / self.transactions
+
+    @property
+    def occupancy(self):
+        """ Fraction of time the bus was in use since creation or last call
+        to :meth:`reset_metrics`.
+        """
+        elapsed = monotonic() - self._metrics_start
+
+        if elapsed <= 0:
+            return 0.0
+
+        return min(1.0, self.busy_time / elapsed)
+
+    def _wait_for_turn(self, entry, deadline):
+        """ Block until entry is first in queue and bus is free.
+
+        :param entry: Tuple with priority and sequence number.
+        :param deadline: Time as returned by `monotonic()` or None.
+        :raises DeadlineExceededError: When deadline passes.
+        """
+        while self._busy or self._queue[0] != entry:
+            remaining = None
+
+            if deadline is not None:
+                remaining = deadline - monotonic()
+
+                if remaining <= 0:
+                    self.expired_requests += 1
+                    raise DeadlineExceededError(
+                        'Bus not available before deadline.')
+
+            self._condition.wait(remaining)
+
+    @contextmanager
+    def acquire(self, priority=PRIORITY_POLL, timeout=None):
+        """ Context manager which waits for exclusive access to the bus and
+        yields the serial port. Use it for transactions which can't be done
+        with :meth:`send_message`.
+
+        :param priority: Priority, lower is served first. Default is
+            :data:`PRIORITY_POLL`.
+        :param timeout: Max number of seconds to wait for the bus, None to
+            wait forever.
+        :raises DeadlineExceededError: When bus isn't available in time.
+        """
+        enqueued = monotonic()
+        deadline = None if timeout is None else enqueued + timeout
+        entry = (priority, next(self._counter))
+
+        with self._condition:
+            heapq.heappush(self._queue, entry)
+
+            try:
+                self._wait_for_turn(entry, deadline)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                # Another request might be first in the queue now.
+                self._condition.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._busy = True
+
+            started = monotonic()
+            wait_time = started - enqueued
+            self.transactions += 1
+            self.wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        try:
+            yield self.serial_port
+        finally:
+            with self._condition:
+                self._busy = False
+                self.busy_time += monotonic() - started
+                self._condition.notify_all()
+
+    def send_message(self, adu, priority=PRIORITY_POLL, timeout=None):
+        """ Wait for bus, send ADU and return parsed response.
+
+        :param adu: Request ADU.
+        :param priority: Priority, lower is served first. Default is
+            :data:`PRIORITY_POLL`.
+        :param timeout: Max number of seconds to wait for the bus, None to
+            wait forever. The timeout of the serial port limits the time
+            waiting for the response.
+        :return: Parsed response from server.
+        :raises DeadlineExceededError: When bus isn't available in time.
+        """
+        with self.acquire(priority, timeout) as serial_port:
+            return rtu.send_message(adu, serial_port, metrics=self.metrics)
@@ -0,0 +1,98 @@
+""" Counters to monitor the health of a serial link.
+
+Both :func:`umodbus.client.serial.rtu.send_message` and
+:class:`umodbus.server.serial.rtu.RTUServer` can update a
+:class:`LinkMetrics`. :class:`umodbus.client.serial.bus.BusMaster`,
+:class:`umodbus.client.serial.poll.PollScheduler` and
+:class:`umodbus.client.serial.async_rtu.AsyncRTUClient` keep one in their
+`metrics` attribute. A rising number of CRC errors or timeouts often shows
+a degrading link before it fails::
+
+    from serial import Serial
+
+    from umodbus.client.serial import rtu
+    from umodbus.client.serial.metrics import LinkMetrics
+
+    serial_port = Serial(port='/dev/ttyS1', baudrate=19200, timeout=1)
+    metrics = LinkMetrics(serial_port.baudrate)
+
+    rtu.send_message(rtu.read_coils(1, 0, 10), serial_port, metrics=metrics)
+
+    print(metrics.frames_out, metrics.crc_errors, metrics.utilisation)
+
+"""
+from __future__ import division
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.client.serial.rtu import get_transmission_time
+
+
+class LinkMetrics(object):
+    """ Counters of traffic over 1 serial link. Updating a counter is a
+    plain attribute increment, counters can be read at any time.
+
+    :param baudrate: Baudrate of link, needed for :attr:`utilisation`.
+    """
+    def __init__(self, baudrate=None):
+        self.baudrate = baudrate
+        self.reset()
+
+    def reset(self):
+        """ Set all counters to 0. """
+        self.frames_in = 0
+        """ Number of valid frames received. """
+
+        self.frames_out = 0
+        """ Number of frames sent. """
+
+        self.bytes_in = 0
+        """ Number of bytes received, including those of invalid frames. """
+
+        self.bytes_out = 0
+        """ Number of bytes sent. """
+
+        self.crc_errors = 0
+        """ Number of frames received with an invalid CRC. """
+
+        self.timeouts = 0
+        """ Number of requests which weren't answered in time. """
+
+        self.exception_responses = 0
+        """ Number of exception responses, received by a client or sent by
+        a server.
+        """
+
+        self.started = monotonic()
+
+    def frame_received(self, frame):
+        """ Count valid frame received.
+
+        :param frame: Byte array with frame.
+        """
+        self.frames_in += 1
+        self.bytes_in += len(frame)
+
+    def frame_sent(self, frame):
+        """ Count frame sent.
+
+        :param frame: Byte array with frame.
+        """
+        self.frames_out += 1
+        self.bytes_out += len(frame)
+
+    @property
+    def utilisation(self):
+        """ Estimate of the fraction of time the link was transmitting since
+        creation or last :meth:`reset`, based on the number of bytes sent
+        and received. None if baudrate is unknown.
+        """
+        elapsed = monotonic() - self.started
+
+        if self.baudrate is None or elapsed <= 0:
+            return None
+
+        return min(1.0, get_transmission_time(
+            self.bytes_in + self.bytes_out, self.baudrate) / elapsed)
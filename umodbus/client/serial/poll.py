@@ -0,0 +1,260 @@
+""" Poll a list of requests over one serial line as fast as the slaves allow.
+
+A poll cycle sends every request once. With a fixed timeout, one slow or dead
+slave stalls the whole cycle. :class:`PollScheduler` learns the response
+latency of every slave and uses it to limit the time waiting for a response,
+see :func:`umodbus.client.serial.rtu.get_response_timeout`. Slaves which don't
+respond are skipped for an increasing number of cycles. Requests are ordered
+so the slaves which respond fast and reliably are polled first::
+
+    from serial import Serial
+
+    from umodbus.client.serial import rtu
+    from umodbus.client.serial.poll import PollScheduler
+
+    scheduler = PollScheduler(Serial(port='/dev/ttyS1', baudrate=19200))
+
+    for slave_id in range(1, 41):
+        scheduler.add(rtu.read_holding_registers(slave_id, 0, 10))
+
+    while True:
+        results = scheduler.poll()
+        print('Cycle took {0:.3f} s.'.format(scheduler.last_cycle_time))
+
+"""
+from __future__ import division
+import struct
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.client.serial import rtu
+from umodbus.exceptions import ModbusError
+from umodbus.functions import expected_response_pdu_size_from_request_pdu
+from umodbus.client.serial.metrics import LinkMetrics
+from umodbus.client.serial.redundancy_check import CRCError
+
+
+class SlaveStatistics(object):
+    """ Response latency and availability of 1 slave.
+
+    The latency is the turnaround time: the time between the end of a
+    request and the start of its response. Like TCP does for round trip
+    times, a smoothed latency and its mean deviation are kept.
+    """
+    alpha = 1 / 8
+    beta = 1 / 4
+
+    def __init__(self):
+        self.latency = None
+        """ Smoothed latency in seconds, None until first response. """
+
+        self.deviation = 0.0
+        """ Smoothed mean deviation of latency in seconds. """
+
+        self.responses = 0
+        """ Number of responses received. """
+
+        self.failures = 0
+        """ Number of requests which timed out or had an invalid CRC. """
+
+        self.consecutive_failures = 0
+        """ Number of failures since last response. """
+
+        self.skip_cycles = 0
+        """ Number of cycles this slave won't be polled. """
+
+    def add_response(self, latency=None):
+        """ Register a response.
+
+        :param latency: Latency in seconds or None if unknown.
+        """
+        self.responses += 1
+        self.consecutive_failures = 0
+        self.skip_cycles = 0
+
+        if latency is None:
+            return
+
+        if self.latency is None:
+            self.latency = latency
+            self.deviation = latency / 2
+            return
+
+        self.deviation += self.beta * (abs(latency - self.latency) -
+                                       self.deviation)
+        self.latency += self.alpha * (latency - self.latency)
+
+    def add_failure(self, max_backoff):
+        """ Register a failed request. After `n` consecutive failures the
+        slave is skipped for `2 ** (n - 1) - 1` cycles, at most
+        `max_backoff - 1` cycles.
+
+        :param max_backoff: Max number of cycles between 2 attempts.
+        """
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.skip_cycles = \
+            min(2 ** (self.consecutive_failures - 1), max_backoff) - 1
+
+    def get_turnaround_time(self, min_turnaround_time, max_turnaround_time):
+        """ Return time to wait for slave to start responding.
+
+        :param min_turnaround_time: Lower limit in seconds.
+        :param max_turnaround_time: Upper limit in seconds. Used when latency
+            isn't known or when slave failed last time.
+        :return: Number of seconds.
+        """
+        if self.latency is None or self.consecutive_failures > 0:
+            return max_turnaround_time
+
+        return min(max(self.latency + 4 * self.deviation,
+                       min_turnaround_time), max_turnaround_time)
+
+
+class PollScheduler(object):
+    """ Poll requests over a serial port in cycles.
+
+    :param serial_port: Serial port instance.
+    :param min_turnaround_time: Min number of seconds to wait for a slave to
+        start responding. Default is 5 ms.
+    :param max_turnaround_time: Max number of seconds to wait for a slave to
+        start responding. Used for slaves of which the latency is unknown.
+        Default is 1 s.
+    :param max_backoff: Max number of cycles between 2 attempts to poll a
+        slave which doesn't respond. Default is 8.
+    """
+    def __init__(self, serial_port, min_turnaround_time=0.005,
+                 max_turnaround_time=1.0, max_backoff=8):
+        self.serial_port = serial_port
+        self.min_turnaround_time = min_turnaround_time
+        self.max_turnaround_time = max_turnaround_time
+        self.max_backoff = max_backoff
+
+        self.requests = []
+        self.statistics = {}
+        """ Dict with slave id as key and :class:`SlaveStatistics` as
+        value.
+        """
+
+        self.metrics = LinkMetrics(serial_port.baudrate)
+        """ Instance of :class:`umodbus.client.serial.metrics.LinkMetrics`.
+        """
+
+        self.cycles = 0
+        """ Number of cycles polled. """
+
+        self.last_cycle_time = None
+        """ Duration in seconds of last cycle. """
+
+        self.mean_cycle_time = None
+        """ Smoothed duration in seconds of a cycle. """
+
+    def add(self, adu):
+        """ Add request to poll cycle.
+
+        :param adu: Request ADU.
+        """
+        slave_id = struct.unpack('>B', adu[:1])[0]
+        self.requests.append((slave_id, adu))
+        self.statistics.setdefault(slave_id, SlaveStatistics())
+
+    def get_order(self):
+        """ Return indices of requests in order they're polled: first
+        requests of slaves which responded last time, ordered by latency.
+        Requests of the same slave are kept together and in order.
+
+        :return: List with indices in :attr:`requests`.
+        """
+        def key(index):
+            slave_id = self.requests[index][0]
+            statistics = self.statistics[slave_id]
+            latency = statistics.latency
+
+            if latency is None:
+                latency = self.max_turnaround_time
+
+            return (statistics.consecutive_failures > 0, latency, slave_id,
+                    index)
+
+        return sorted(range(len(self.requests)), key=key)
+
+    def _send_message(self, slave_id, adu):
+        """ Send request and update statistics of slave.
+
+        :return: Parsed response.
+        """
+        statistics = self.statistics[slave_id]
+        response_size = expected_response_pdu_size_from_request_pdu(
+            adu[1:-2]) + 3
+
+        rtu.wait_for_silent_interval(self.serial_port)
+        start = monotonic()
+
+        try:
+            result = rtu.send_message(
+                adu, self.serial_port,
+                statistics.get_turnaround_time(self.min_turnaround_time,
+                                               self.max_turnaround_time),
+                metrics=self.metrics)
+        except ModbusError:
+            # The slave responds, but the response is shorter than normal.
+            statistics.add_response()
+            raise
+        except (ValueError, CRCError):
+            statistics.add_failure(self.max_backoff)
+            raise
+
+        # Time spent transmitting request and response isn't latency.
+        transmission_time = rtu.get_transmission_time(
+            len(adu) + response_size, self.serial_port.baudrate)
+        statistics.add_response(max(0.0, monotonic() - start -
+                                    transmission_time))
+
+        return result
+
+    def poll(self):
+        """ Poll all requests once.
+
+        :return: List with result per request, in order requests were
+            added. The result is the parsed response, the exception if the
+            request failed or None if the slave is skipped.
+        """
+        start = monotonic()
+        results = [None] * len(self.requests)
+        skipped = set()
+        failed = set()
+
+        for index in self.get_order():
+            slave_id, adu = self.requests[index]
+            statistics = self.statistics[slave_id]
+
+            if slave_id in failed:
+                # Don't wait for a slave which failed already this cycle.
+                continue
+
+            if statistics.skip_cycles > 0:
+                if slave_id not in skipped:
+                    statistics.skip_cycles -= 1
+                    skipped.add(slave_id)
+                continue
+
+            try:
+                results[index] = self._send_message(slave_id, adu)
+            except ModbusError as e:
+                results[index] = e
+            except (ValueError, CRCError) as e:
+                results[index] = e
+                failed.add(slave_id)
+
+        self.cycles += 1
+        self.last_cycle_time = monotonic() - start
+
+        if self.mean_cycle_time is None:
+            self.mean_cycle_time = self.last_cycle_time
+        else:
+            self.mean_cycle_time += (self.last_cycle_time -
+                                     self.mean_cycle_time) / 8
+
+        return results
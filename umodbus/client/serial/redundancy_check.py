@@ -31,6 +31,66 @@ def generate_look_up_table():
 look_up_table = generate_look_up_table()
 
 
+def generate_word_look_up_table(table):
+    """ Generate look up table to calculate CRC of 2 bytes at once.
+
+    The CRC register after processing a word w is equal to the register
+    after processing 2 zero bytes on register (register ^ w). So that result
+    can be looked up for all 65536 possible values.
+
+    :param table: Look up table for single bytes.
+    :return: List with 65536 entries.
+    """
+    word_table = []
+
+    for index in range(65536):
+        register = (index >> 8) ^ table[index & 0xFF]
+        word_table.append((register >> 8) ^ table[register & 0xFF])
+
+    return word_table
+
+
+_word_look_up_table = None
+
+
+def get_word_look_up_table():
+    """ Return look up table for words. The table is generated on first use
+    and cached.
+
+    :return: List with 65536 entries.
+    """
+    global _word_look_up_table
+
+    if _word_look_up_table is None:
+        _word_look_up_table = generate_word_look_up_table(look_up_table)
+
+    return _word_look_up_table
+
+
+def update_crc(register, msg):
+    """ Process message and return new value of CRC register.
+
+    :param register: Value of CRC register, 0xFFFF for a new message.
+    :param msg: A byte array.
+    :return: Value of CRC register.
+    """
+    word_count = len(msg) // 2
+
+    if word_count > 0:
+        word_table = get_word_look_up_table()
+
+        # Modbus CRC is little-endian, so words are unpacked little-endian as
+        # well.
+        for word in struct.unpack_from('<{0}H'.format(word_count), msg):
+            register = word_table[register ^ word]
+
+    if len(msg) % 2:
+        byte_ = bytearray(msg[-1:])[0]
+        register = (register >> 8) ^ look_up_table[(register ^ byte_) & 0xFF]
+
+    return register
+
+
 def get_crc(msg):
     """ Return CRC of 2 byte for message.
 
@@ -39,21 +99,8 @@ def get_crc(msg):
     :param msg: A byte array.
     :return: Byte array of 2 bytes.
     """
-    register = 0xFFFF
-
-    for byte_ in msg:
-        try:
-            val = struct.unpack('<B', byte_)[0]
-        # Iterating over a bit-like objects in Python 3 gets you ints.
-        # Because fuck logic.
-        except TypeError:
-            val = byte_
-
-        register = \
-            (register >> 8) ^ look_up_table[(register ^ val) & 0xFF]
-
     # CRC is little-endian!
-    return struct.pack('<H', register)
+    return struct.pack('<H', update_crc(0xFFFF, msg))
 
 
 def add_crc(msg):
@@ -71,11 +118,62 @@ def validate_crc(msg):
     :param msg: Byte array with message with CRC.
     :raise: CRCError.
     """
-    if not struct.unpack('<H', get_crc(msg[:-2])) ==\
-            struct.unpack('<H', msg[-2:]):
+    if not CRCAccumulator(msg).valid:
         raise CRCError('CRC validation failed.')
 
 
+class CRCAccumulator(object):
+    """ Calculate CRC of a message which is received in chunks. Each chunk is
+    processed when it arrives, so the CRC is known as soon as the last byte of
+    a message has been received::
+
+        >>> crc = CRCAccumulator()
+        >>> crc.update(b'\\x00\\x01')
+        >>> crc.update(b'\\x02')
+        >>> crc.crc == get_crc(b'\\x00\\x01\\x02')
+        True
+
+    When the CRC of the message itself is processed too, the message is valid
+    if :attr:`valid` is True::
+
+        >>> crc.update(b'\\xf1\\x91')
+        >>> crc.valid
+        True
+
+    :param msg: A byte array to start with, default empty.
+    """
+    def __init__(self, msg=b''):
+        self.reset()
+        self.update(msg)
+
+    def reset(self):
+        """ Reset accumulator to start with a new message. """
+        self.register = 0xFFFF
+        self.size = 0
+
+    def update(self, msg):
+        """ Process next chunk of message.
+
+        :param msg: A byte array.
+        """
+        self.register = update_crc(self.register, msg)
+        self.size += len(msg)
+
+    @property
+    def crc(self):
+        """ CRC of 2 bytes of all chunks processed so far. """
+        return struct.pack('<H', self.register)
+
+    @property
+    def valid(self):
+        """ Whether the chunks processed so far form a message ending with a
+        correct CRC.
+        """
+        # Processing a message including its CRC results in a register of 0
+        # if the CRC is correct.
+        return self.size >= 2 and self.register == 0
+
+
 class CRCError(Exception):
     """ Valid error to raise when CRC isn't correct. """
     pass
@@ -42,20 +42,157 @@ The lenght of this ADU is 8 bytes::
     8
 
 """
+from __future__ import division
+import time
 import struct
-
-from umodbus.client.serial.redundancy_check import get_crc, validate_crc
+from weakref import WeakKeyDictionary
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.client.serial.redundancy_check import (get_crc, validate_crc,
+                                                    CRCAccumulator, CRCError)
 from umodbus.functions import (create_function_from_response_pdu,
                                expected_response_pdu_size_from_request_pdu,
                                pdu_to_function_code_or_raise_error, ReadCoils,
                                ReadDiscreteInputs, ReadHoldingRegisters,
                                ReadInputRegisters, WriteSingleCoil,
                                WriteSingleRegister, WriteMultipleCoils,
-                               WriteMultipleRegisters)
+                               WriteMultipleRegisters, WRITE_SINGLE_COIL,
+                               WRITE_SINGLE_REGISTER, WRITE_MULTIPLE_COILS,
+                               WRITE_MULTIPLE_REGISTERS)
 from umodbus.utils import recv_exactly
 
+# Requests send to this address are executed by all slaves. Slaves don't
+# respond to broadcast requests.
+BROADCAST_ADDRESS = 0
+
+# Only write requests can be broadcast.
+_broadcast_function_codes = (WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
+                             WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS)
+
+# Size of an exception response ADU, which is shorter than all other
+# responses.
+_EXCEPTION_ADU_SIZE = 5
+
+# Max size of an RTU ADU.
+_MAX_ADU_SIZE = 256
+
+# Per serial port the time the last frame was send or received, used to keep
+# the line silent between 2 frames.
+_last_activity = WeakKeyDictionary()
+
+
+def get_char_size(baudrate):
+    """ Get the size of 1 character in seconds.
+
+    From the implementation guide:
+
+        "The implementation of RTU reception driver may imply the management of
+        a lot of interruptions due to the t 1.5  and t 3.5  timers. With high
+
+        communication baud rates, this leads to a heavy CPU load. Consequently
+        these two timers must be strictly respected when the baud rate is equal
+        or lower than 19200 Bps. For baud rates greater than 19200 Bps, fixed
+        values for the 2 timers should be used:  it is recommended to use a
+        value of 750us for the inter-character time-out (t 1.5) and a value of
+        1.750ms for inter-frame delay (t 3.5)."
+    """
+    if baudrate <= 19200:
+        # One frame is 11 bits.
+        return 11 / baudrate
+
+    # 750 us / 1.5 = 500 us or 0.0005 s.
+    return 0.0005
+
+
+def get_transmission_time(size, baudrate):
+    """ Return the time in seconds it takes to transmit a number of bytes.
+
+    Unlike :func:`get_char_size`, which returns fixed timer values for
+    baudrates above 19200, this is the time the bytes are on the line.
+
+    :param size: Number of bytes.
+    :param baudrate: Baudrate of serial line.
+    :return: Number of seconds.
+    """
+    # One character is 11 bits.
+    return size * 11 / baudrate
+
+
+def get_silent_interval(baudrate):
+    """ Return the minimum time in seconds the line must be silent between
+    2 frames, also known as t3.5.
+
+    :param baudrate: Baudrate of serial line.
+    :return: Number of seconds.
+    """
+    return 3.5 * get_char_size(baudrate)
+
+
+def get_response_timeout(baudrate, response_size, turnaround_time):
+    """ Return the max time in seconds between sending a request and
+    receiving the last byte of its response.
+
+    :param baudrate: Baudrate of serial line.
+    :param response_size: Size of response ADU in bytes.
+    :param turnaround_time: Number of seconds a slave needs to process a
+        request before it starts to respond. It should include the latency
+        of the serial port, which is often several milliseconds for USB
+        adapters.
+    :return: Number of seconds.
+    """
+    # Allow an additional silent interval for gaps between characters.
+    return turnaround_time + get_transmission_time(response_size, baudrate) + \
+        get_silent_interval(baudrate)
+
+
+def get_broadcast_turnaround_time(baudrate):
+    """ Return the time in seconds to wait after a broadcast request before
+    sending the next request, when no turnaround time is given.
+
+    Slaves get as much time to process the broadcast as a slave answering a
+    request would need at most: the time to send a response of the max ADU
+    size of 256 bytes, see :func:`get_response_timeout`.
+
+    :param baudrate: Baudrate of serial line.
+    :return: Number of seconds.
+    """
+    return get_response_timeout(baudrate, _MAX_ADU_SIZE, 0)
+
+
+def wait_for_silent_interval(serial_port):
+    """ Block until the line has been silent for at least t3.5 since the
+    last frame :func:`send_message` has send or received over the serial
+    port.
+
+    :param serial_port: Serial port instance.
+    """
+    try:
+        last_activity = _last_activity[serial_port]
+    except KeyError:
+        return
+
+    remaining = last_activity + get_silent_interval(serial_port.baudrate) - \
+        monotonic()
 
-def _create_request_adu(slave_id, req_pdu):
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def is_broadcast(adu):
+    """ Return True if ADU is a broadcast write request.
+
+    :param adu: Request ADU.
+    :return: Boolean.
+    """
+    slave_id, function_code = struct.unpack('>BB', adu[:2])
+    return slave_id == BROADCAST_ADDRESS and \
+        function_code in _broadcast_function_codes
+
+
+def create_request_adu(slave_id, req_pdu):
     """ Return request ADU for Modbus RTU.
 
     :param slave_id: Slave id.
@@ -77,7 +214,7 @@ def read_coils(slave_id, starting_address, quantity):
     function.starting_address = starting_address
     function.quantity = quantity
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def read_discrete_inputs(slave_id, starting_address, quantity):
@@ -90,7 +227,7 @@ def read_discrete_inputs(slave_id, starting_address, quantity):
     function.starting_address = starting_address
     function.quantity = quantity
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def read_holding_registers(slave_id, starting_address, quantity):
@@ -103,7 +240,7 @@ def read_holding_registers(slave_id, starting_address, quantity):
     function.starting_address = starting_address
     function.quantity = quantity
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def read_input_registers(slave_id, starting_address, quantity):
@@ -116,7 +253,7 @@ def read_input_registers(slave_id, starting_address, quantity):
     function.starting_address = starting_address
     function.quantity = quantity
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def write_single_coil(slave_id, address, value):
@@ -129,7 +266,7 @@ def write_single_coil(slave_id, address, value):
     function.address = address
     function.value = value
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def write_single_register(slave_id, address, value):
@@ -142,7 +279,7 @@ def write_single_register(slave_id, address, value):
     function.address = address
     function.value = value
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def write_multiple_coils(slave_id, starting_address, values):
@@ -155,7 +292,7 @@ def write_multiple_coils(slave_id, starting_address, values):
     function.starting_address = starting_address
     function.values = values
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def write_multiple_registers(slave_id, starting_address, values):
@@ -168,7 +305,7 @@ def write_multiple_registers(slave_id, starting_address, values):
     function.starting_address = starting_address
     function.values = values
 
-    return _create_request_adu(slave_id, function.request_pdu)
+    return create_request_adu(slave_id, function.request_pdu)
 
 
 def parse_response_adu(resp_adu, req_adu=None):
@@ -179,9 +316,18 @@ def parse_response_adu(resp_adu, req_adu=None):
     :param req_adu: Request ADU, default None.
     :return: Response data.
     """
-    resp_pdu = resp_adu[1:-2]
     validate_crc(resp_adu)
+    return parse_response_pdu(resp_adu[1:-2], req_adu)
+
 
+def parse_response_pdu(resp_pdu, req_adu=None):
+    """ Parse response PDU of which the CRC has been validated already and
+    return response data.
+
+    :param resp_pdu: Response PDU.
+    :param req_adu: Request ADU, default None.
+    :return: Response data.
+    """
     req_pdu = None
 
     if req_adu is not None:
@@ -202,24 +348,145 @@ def raise_for_exception_adu(resp_adu):
     pdu_to_function_code_or_raise_error(resp_pdu)
 
 
-def send_message(adu, serial_port):
+def read_with_crc(read_fn, crc):
+    """ Return function which reads using `read_fn` and passes all bytes read
+    to a CRC accumulator.
+
+    :param read_fn: Function that can return up to given bytes.
+    :param crc: Instance of :class:`CRCAccumulator`.
+    :return: Function with same signature as `read_fn`.
+    """
+    def read(size):
+        chunk = read_fn(size)
+        crc.update(chunk)
+
+        return chunk
+
+    return read
+
+
+def send_message(adu, serial_port, turnaround_time=None, metrics=None):
     """ Send ADU over serial to to server and return parsed response.
 
+    The CRC of the response is calculated chunk by chunk while the response is
+    received.
+
+    Before the request is send the line is kept silent for 3.5 characters
+    after the previous frame. By default the response is read using the
+    timeout of the serial port. When `turnaround_time` is given, the timeout
+    is derived from the baudrate and the size of the expected response
+    instead, see :func:`get_response_timeout`.
+
+    Slaves don't respond to broadcast write requests (see
+    :data:`BROADCAST_ADDRESS`). For those requests no response is read, but
+    `turnaround_time` seconds are waited to let slaves process the request.
+    Without `turnaround_time` the wait is derived from the baudrate, see
+    :func:`get_broadcast_turnaround_time`.
+
     :param adu: Request ADU.
     :param sock: Serial port instance.
-    :return: Parsed response from server.
+    :param turnaround_time: Number of seconds a slave needs before it starts
+        to respond, None to use timeout of serial port.
+    :param metrics: Instance of
+        :class:`umodbus.client.serial.metrics.LinkMetrics` to update, or None.
+    :return: Parsed response from server, None for broadcast requests.
     """
+    response_adu = send_request(adu, serial_port, turnaround_time, metrics)
+
+    if response_adu is None:
+        return None
+
+    raise_for_exception_adu(response_adu)
+    return parse_response_pdu(response_adu[1:-2], adu)
+
+
+def send_request(adu, serial_port, turnaround_time=None, metrics=None):
+    """ Send ADU over serial to server and return response ADU without
+    parsing it, for example to forward it. See :func:`send_message`.
+
+    :param adu: Request ADU.
+    :param sock: Serial port instance.
+    :param turnaround_time: Number of seconds a slave needs before it starts
+        to respond, None to use timeout of serial port.
+    :param metrics: Instance of
+        :class:`umodbus.client.serial.metrics.LinkMetrics` to update, or None.
+    :return: Response ADU of which the CRC has been validated, this can be an
+        exception response. None for broadcast requests.
+    """
+    wait_for_silent_interval(serial_port)
+
+    try:
+        return _send_request(adu, serial_port, turnaround_time, metrics)
+    finally:
+        _last_activity[serial_port] = monotonic()
+
+
+def _send_request(adu, serial_port, turnaround_time, metrics):
+    """ Send ADU and return response ADU, see :func:`send_request`. """
     serial_port.write(adu)
     serial_port.flush()
 
-    # Check exception ADU (which is shorter than all other responses) first.
-    exception_adu_size = 5
-    response_error_adu = recv_exactly(serial_port.read, exception_adu_size)
-    raise_for_exception_adu(response_error_adu)
+    if metrics is not None:
+        metrics.frame_sent(adu)
+
+    if is_broadcast(adu):
+        if turnaround_time is None:
+            turnaround_time = \
+                get_broadcast_turnaround_time(serial_port.baudrate)
+
+        time.sleep(turnaround_time)
+        return None
 
     expected_response_size = \
         expected_response_pdu_size_from_request_pdu(adu[1:-2]) + 3
-    response_remainder = recv_exactly(
-        serial_port.read, expected_response_size - exception_adu_size)
 
-    return parse_response_adu(response_error_adu + response_remainder, adu)
+    crc = CRCAccumulator()
+    read = read_with_crc(serial_port.read, crc)
+    timeout = serial_port.timeout
+
+    try:
+        if turnaround_time is not None:
+            serial_port.timeout = get_response_timeout(
+                serial_port.baudrate, _EXCEPTION_ADU_SIZE, turnaround_time)
+
+        # Check exception ADU (which is shorter than all other responses)
+        # first.
+        response_error_adu = recv_exactly(read, _EXCEPTION_ADU_SIZE)
+        is_exception = \
+            struct.unpack('>B', response_error_adu[1:2])[0] & 0x80
+        response_remainder = b''
+
+        if not is_exception:
+            if turnaround_time is not None:
+                # The slave is responding, so only the time to receive the
+                # remainder is needed.
+                serial_port.timeout = get_response_timeout(
+                    serial_port.baudrate,
+                    expected_response_size - _EXCEPTION_ADU_SIZE, 0)
+
+            response_remainder = recv_exactly(
+                read, expected_response_size - _EXCEPTION_ADU_SIZE)
+    except ValueError:
+        if metrics is not None:
+            metrics.timeouts += 1
+            metrics.bytes_in += crc.size
+        raise
+    finally:
+        if turnaround_time is not None:
+            serial_port.timeout = timeout
+
+    if not crc.valid:
+        if metrics is not None:
+            metrics.crc_errors += 1
+            metrics.bytes_in += crc.size
+        raise CRCError('CRC validation failed.')
+
+    response_adu = response_error_adu + response_remainder
+
+    if metrics is not None:
+        metrics.frame_received(response_adu)
+
+        if is_exception:
+            metrics.exception_responses += 1
+
+    return response_adu
@@ -0,0 +1,328 @@
+""" Listen to the traffic on a Modbus RTU bus without taking part in it.
+
+:class:`Sniffer` splits the bytes on the bus in frames, pairs requests with
+their responses and keeps statistics per slave and per function code. It
+keeps counters only, so memory use is constant however long it runs::
+
+    from serial import Serial
+
+    from umodbus.client.serial.sniffer import Sniffer
+
+    serial_port = Serial(port='/dev/ttyS1', baudrate=19200)
+    sniffer = Sniffer(serial_port.baudrate)
+
+    try:
+        sniffer.sniff(serial_port)
+    except KeyboardInterrupt:
+        print(sniffer.report())
+
+Timestamps are taken when data is read from the serial port, so latencies
+include the latency of the serial port.
+
+Some responses, like those to Write Single Coil and Write Single Register
+requests, can't be told apart from a request by their content. Such a frame
+is only paired with the pending request if it starts within `turnaround_time`
+after the end of the request. Otherwise it's counted as a new request, for
+example a retry by the master. Pick a `turnaround_time` which is shorter than
+the response timeout of the master.
+
+"""
+from __future__ import division
+import struct
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.client.serial.rtu import (get_char_size, get_transmission_time,
+                                       BROADCAST_ADDRESS)
+from umodbus.serial_framer import RTUFramer
+from umodbus.functions import (expected_request_pdu_size_from_pdu_head,
+                               expected_response_pdu_size_from_pdu_head,
+                               expected_response_pdu_size_from_request_pdu)
+from umodbus.exceptions import IllegalFunctionError
+
+
+class SlaveTraffic(object):
+    """ Counters of traffic to and from 1 slave. """
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0
+        self.exception_responses = 0
+
+        self.missing_responses = 0
+        """ Number of requests which weren't followed by a response. """
+
+        self.latency_total = 0.0
+        self.latency_min = None
+        self.latency_max = None
+
+    @property
+    def mean_latency(self):
+        """ Mean time in seconds between the end of a request and the start
+        of its response, None if no responses have been seen.
+        """
+        if self.responses == 0:
+            return None
+
+        return self.latency_total / self.responses
+
+    def add_latency(self, latency):
+        self.latency_total += latency
+
+        if self.latency_min is None or latency < self.latency_min:
+            self.latency_min = latency
+
+        if self.latency_max is None or latency > self.latency_max:
+            self.latency_max = latency
+
+
+class FunctionCodeTraffic(object):
+    """ Counters of traffic with 1 function code. """
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+
+class Sniffer(object):
+    """ Analyse traffic on an RTU bus.
+
+    :param baudrate: Baudrate of bus.
+    :param turnaround_time: Max number of seconds between the end of a
+        request and the start of its response, used to tell responses which
+        equal their request apart from repeated requests. Default is 0.1.
+    """
+    def __init__(self, baudrate, turnaround_time=0.1):
+        self.baudrate = baudrate
+        self.turnaround_time = turnaround_time
+        self.char_size = get_char_size(baudrate)
+        self.framer = RTUFramer(pdu_size_functions=[
+            expected_request_pdu_size_from_pdu_head,
+            expected_response_pdu_size_from_pdu_head])
+
+        self.slaves = {}
+        """ Dict with slave id as key and :class:`SlaveTraffic` as value. """
+
+        self.function_codes = {}
+        """ Dict with function code as key and :class:`FunctionCodeTraffic`
+        as value. Exception responses are counted under their original
+        function code.
+        """
+
+        self.bytes = 0
+        """ Number of bytes seen on the bus, including those which aren't
+        part of a valid frame.
+        """
+
+        self.first_seen = None
+        self.last_seen = None
+
+        # Request waiting for a response: tuple with slave id, function code,
+        # expected response size and time request was received.
+        self._request = None
+
+    @property
+    def frames(self):
+        """ Number of valid frames. """
+        return self.framer.frames
+
+    @property
+    def crc_errors(self):
+        """ Number of frames with an invalid CRC. """
+        return self.framer.crc_errors
+
+    @property
+    def crc_error_rate(self):
+        """ Fraction of frames with an invalid CRC. """
+        total = self.frames + self.crc_errors
+
+        if total == 0:
+            return 0.0
+
+        return self.crc_errors / total
+
+    @property
+    def utilisation(self):
+        """ Fraction of time bytes were transmitted on the bus. """
+        if self.first_seen is None or self.last_seen <= self.first_seen:
+            return 0.0
+
+        return min(1.0, get_transmission_time(self.bytes, self.baudrate) /
+                   (self.last_seen - self.first_seen))
+
+    def _get_slave(self, slave_id):
+        slave = self.slaves.get(slave_id)
+
+        if slave is None:
+            slave = self.slaves[slave_id] = SlaveTraffic()
+
+        return slave
+
+    def _get_function_code(self, function_code):
+        traffic = self.function_codes.get(function_code)
+
+        if traffic is None:
+            traffic = self.function_codes[function_code] = \
+                FunctionCodeTraffic()
+
+        return traffic
+
+    def _get_latency(self, frame, timestamp):
+        """ Return number of seconds between end of pending request and
+        start of frame.
+        """
+        # Timestamp is taken after the frame has been received.
+        return timestamp - self._request[3] - \
+            get_transmission_time(len(frame), self.baudrate)
+
+    def _is_response(self, slave_id, function_code, frame, timestamp):
+        """ Return True if frame is the response to pending request. """
+        if self._request is None:
+            return False
+
+        request_slave_id, request_function_code, response_size, _ = \
+            self._request
+
+        if slave_id != request_slave_id:
+            return False
+
+        if function_code == request_function_code | 0x80:
+            return len(frame) == 5
+
+        if function_code != request_function_code or \
+                len(frame) != response_size:
+            return False
+
+        try:
+            could_be_request = len(frame) == \
+                expected_request_pdu_size_from_pdu_head(frame[1:-2]) + 3
+        except (IllegalFunctionError, struct.error):
+            could_be_request = False
+
+        if could_be_request:
+            # A repeated request looks like a response, but arrives after
+            # the slave should have started to respond.
+            return self._get_latency(frame, timestamp) <= \
+                self.turnaround_time
+
+        return True
+
+    def _end_request(self):
+        """ Count pending request as unanswered. """
+        if self._request is not None:
+            self._get_slave(self._request[0]).missing_responses += 1
+            self._request = None
+
+    def _handle_frame(self, frame, timestamp):
+        slave_id, function_code = struct.unpack('>BB', frame[:2])
+        slave = self._get_slave(slave_id)
+
+        if self._is_response(slave_id, function_code, frame, timestamp):
+            slave.responses += 1
+
+            if function_code & 0x80:
+                slave.exception_responses += 1
+
+            slave.add_latency(max(0.0, self._get_latency(frame, timestamp)))
+            self._request = None
+        else:
+            self._end_request()
+            slave.requests += 1
+
+            if slave_id != BROADCAST_ADDRESS:
+                try:
+                    response_size = \
+                        expected_response_pdu_size_from_request_pdu(
+                            frame[1:-2]) + 3
+                except (IllegalFunctionError, struct.error):
+                    response_size = None
+
+                self._request = (slave_id, function_code, response_size,
+                                 timestamp)
+
+        traffic = self._get_function_code(function_code & 0x7F)
+        traffic.frames += 1
+        traffic.bytes += len(frame)
+
+    def feed(self, data, timestamp=None):
+        """ Process bytes received from bus.
+
+        :param data: Byte array.
+        :param timestamp: Time data was received as returned by
+            `monotonic()`, default is now.
+        """
+        if timestamp is None:
+            timestamp = monotonic()
+
+        if self.first_seen is None:
+            # Data was transmitted before it was received.
+            self.first_seen = timestamp - \
+                get_transmission_time(len(data), self.baudrate)
+
+        self.last_seen = timestamp
+        self.bytes += len(data)
+
+        for frame in self.framer.feed(data):
+            self._handle_frame(frame, timestamp)
+
+    def flush(self, timestamp=None):
+        """ Signal that the bus has been silent for 3.5 characters.
+
+        :param timestamp: Time silence was detected, default is now.
+        """
+        if timestamp is None:
+            timestamp = monotonic()
+
+        for frame in self.framer.flush():
+            self._handle_frame(frame, timestamp)
+
+    def sniff(self, serial_port, duration=None):
+        """ Read from serial port and analyse traffic.
+
+        :param serial_port: Serial port instance. Its timeout is changed to
+            3.5 characters to detect silence.
+        :param duration: Number of seconds to sniff, None to sniff forever.
+        """
+        serial_port.timeout = 3.5 * self.char_size
+        serial_port.inter_byte_timeout = 1.5 * self.char_size
+        deadline = None if duration is None else monotonic() + duration
+
+        while deadline is None or monotonic() < deadline:
+            data = serial_port.read(max(self.framer.missing,
+                                        serial_port.in_waiting))
+
+            if len(data) == 0:
+                self.flush()
+            else:
+                self.feed(data)
+
+    def report(self):
+        """ Return human readable report of statistics.
+
+        :return: String.
+        """
+        lines = [
+            'Frames: {0}, CRC errors: {1} ({2:.1%}), bus utilisation: '
+            '{3:.1%}.'.format(self.frames, self.crc_errors,
+                              self.crc_error_rate, self.utilisation),
+            '',
+            '{0:>5} {1:>9} {2:>9} {3:>9} {4:>9} {5:>12}'.format(
+                'slave', 'requests', 'responses', 'errors', 'missing',
+                'latency ms'),
+        ]
+
+        for slave_id, slave in sorted(self.slaves.items()):
+            latency = slave.mean_latency
+            lines.append('{0:>5} {1:>9} {2:>9} {3:>9} {4:>9} {5:>12}'.format(
+                slave_id, slave.requests, slave.responses,
+                slave.exception_responses, slave.missing_responses,
+                '-' if latency is None else '{0:.2f}'.format(latency * 1000)))
+
+        lines.extend(['', '{0:>8} {1:>9} {2:>9}'.format(
+            'function', 'frames', 'bytes')])
+
+        for function_code, traffic in sorted(self.function_codes.items()):
+            lines.append('{0:>8} {1:>9} {2:>9}'.format(
+                function_code, traffic.frames, traffic.bytes))
+
+        return '\n'.join(lines)
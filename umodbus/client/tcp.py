@@ -254,16 +254,32 @@ def send_message(adu, sock):
     :param sock: Socket instance.
     :return: Parsed response from server.
     """
+    response_adu = send_request(adu, sock)
+    raise_for_exception_adu(response_adu)
+
+    return parse_response_adu(response_adu, adu)
+
+
+def send_request(adu, sock):
+    """ Send ADU over socket to server and return response ADU without
+    parsing it, for example to forward it.
+
+    :param adu: Request ADU.
+    :param sock: Socket instance.
+    :return: Response ADU, this can be an exception response.
+    """
     sock.sendall(adu)
 
     # Check exception ADU (which is shorter than all other responses) first.
     exception_adu_size = 9
     response_error_adu = recv_exactly(sock.recv, exception_adu_size)
-    raise_for_exception_adu(response_error_adu)
+
+    if struct.unpack('>B', response_error_adu[7:8])[0] & 0x80:
+        return response_error_adu
 
     expected_response_size = \
         expected_response_pdu_size_from_request_pdu(adu[7:]) + 7
     response_remainder = recv_exactly(
         sock.recv, expected_response_size - exception_adu_size)
 
-    return parse_response_adu(response_error_adu + response_remainder, adu)
+    return response_error_adu + response_remainder
@@ -0,0 +1,96 @@
+""" Send Modbus TCP/IP ADU's as UDP datagrams.
+
+Every request is send in 1 datagram, there is no connection to set up.
+Request ADU's are created with the functions in :mod:`umodbus.client.tcp`::
+
+    import socket
+
+    from umodbus.client import tcp, udp
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(('192.168.1.20', 502))
+    sock.settimeout(0.1)
+
+    adu = tcp.read_holding_registers(slave_id=1, starting_address=0,
+                                     quantity=10)
+    print(udp.send_message(adu, sock, retries=2))
+
+    sock.close()
+
+UDP doesn't guarantee delivery. A request which isn't answered within the
+timeout of the socket is retransmitted. Responses are matched with their
+request by transaction id, so late responses to earlier requests are
+discarded.
+
+"""
+import struct
+import socket
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.utils import unpack_mbap
+from umodbus.client.tcp import parse_response_adu, raise_for_exception_adu
+
+# Maximum size of a Modbus TCP/IP ADU.
+MAX_ADU_SIZE = 260
+
+
+def _recv_response(adu, sock, timeout):
+    """ Return response datagram for request, discarding other datagrams.
+
+    :raises socket.timeout: When no response is received in time.
+    """
+    transaction_id, protocol_id, _, unit_id = unpack_mbap(adu[:7])
+    deadline = None if timeout is None else monotonic() + timeout
+
+    while True:
+        if deadline is not None:
+            remaining = deadline - monotonic()
+
+            if remaining <= 0:
+                raise socket.timeout('timed out')
+
+            sock.settimeout(remaining)
+
+        response_adu = sock.recv(MAX_ADU_SIZE)
+
+        try:
+            mbap = unpack_mbap(response_adu[:7])
+        except struct.error:
+            continue
+
+        if mbap[0] == transaction_id and mbap[1] == protocol_id and \
+                mbap[3] == unit_id and mbap[2] == len(response_adu) - 6:
+            return response_adu
+
+
+def send_message(adu, sock, retries=2):
+    """ Send ADU in a datagram to server and return parsed response.
+
+    :param adu: Request ADU, see :mod:`umodbus.client.tcp`.
+    :param sock: Connected UDP socket. Its timeout is the time to wait for a
+        response before the request is retransmitted.
+    :param retries: Number of times a request is retransmitted.
+    :return: Parsed response from server.
+    :raises socket.timeout: When no response is received after last
+        retransmission.
+    """
+    timeout = sock.gettimeout()
+
+    try:
+        for attempt in range(retries + 1):
+            sock.send(adu)
+
+            try:
+                response_adu = _recv_response(adu, sock, timeout)
+                break
+            except socket.timeout:
+                if attempt == retries:
+                    raise
+    finally:
+        sock.settimeout(timeout)
+
+    raise_for_exception_adu(response_adu)
+    return parse_response_adu(response_adu, adu)
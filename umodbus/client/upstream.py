@@ -0,0 +1,96 @@
+""" A shared connection with a Modbus TCP/IP device.
+
+:class:`Upstream` opens the connection when a request is send and reopens it
+after the device failed to respond. Requests of multiple threads are send one
+after another, so servers which forward requests of many clients to 1 device
+can share 1 :class:`Upstream`::
+
+    from umodbus.client import tcp
+    from umodbus.client.upstream import Upstream
+
+    upstream = Upstream(('192.168.1.20', 502), timeout=1)
+
+    print(upstream.send_message(tcp.read_holding_registers(1, 0, 10)))
+
+    upstream.close()
+
+Failures are raised as gateway exceptions, so a server can answer them
+without translating them.
+
+"""
+import struct
+import socket
+from threading import Lock
+
+from umodbus.client import tcp
+from umodbus.exceptions import (GatewayPathUnavailableError,
+                                GatewayTargetDeviceFailedToRespondError)
+
+
+class Upstream(object):
+    """ Connection with a Modbus TCP/IP device. It's opened when needed and
+    closed when the device fails to respond. Requests of multiple threads are
+    send one after another.
+
+    :param address: Tuple with host and port of device.
+    :param timeout: Number of seconds to wait for device.
+    """
+    def __init__(self, address, timeout=1):
+        self.address = address
+        self.timeout = timeout
+
+        self.requests = 0
+        """ Number of requests send to device. """
+
+        self._lock = Lock()
+        self._sock = None
+
+    def send_message(self, adu):
+        """ Send ADU to device and return parsed response.
+
+        :param adu: Request ADU, see :mod:`umodbus.client.tcp`.
+        :return: Parsed response from device.
+        :raises ModbusError: When device responds with an exception.
+        :raises GatewayPathUnavailableError: When device can't be connected.
+        :raises GatewayTargetDeviceFailedToRespondError: When device doesn't
+            respond in time.
+        """
+        response_adu = self.send_request(adu)
+        tcp.raise_for_exception_adu(response_adu)
+
+        return tcp.parse_response_adu(response_adu, adu)
+
+    def send_request(self, adu):
+        """ Send ADU to device and return response ADU without parsing it.
+
+        :param adu: Request ADU, see :mod:`umodbus.client.tcp`.
+        :return: Response ADU, this can be an exception response.
+        :raises GatewayPathUnavailableError: When device can't be connected.
+        :raises GatewayTargetDeviceFailedToRespondError: When device doesn't
+            respond in time.
+        """
+        with self._lock:
+            if self._sock is None:
+                try:
+                    self._sock = socket.create_connection(self.address,
+                                                          self.timeout)
+                except socket.error:
+                    raise GatewayPathUnavailableError()
+
+            self.requests += 1
+
+            try:
+                return tcp.send_request(adu, self._sock)
+            except (socket.error, ValueError, struct.error):
+                self._close()
+                raise GatewayTargetDeviceFailedToRespondError()
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def close(self):
+        """ Close connection. """
+        with self._lock:
+            self._close()
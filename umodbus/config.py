@@ -30,6 +30,8 @@ class Config(object):
     def __init__(self):
         self.SIGNED_VALUES = os.environ.get('UMODBUS_SIGNED_VALUES', False)
         self.BIT_SIZE = os.environ.get('UMODBUS_BIT_SIZE', 16)
+        self.FRAME_LOG_SAMPLE_RATE = \
+            int(os.environ.get('UMODBUS_FRAME_LOG_SAMPLE_RATE', 1))
 
     @property
     def TYPE_CHAR(self):
@@ -89,3 +91,22 @@ class Config(object):
         """
         self._BIT_SIZE = value
         self._set_multi_bit_value_format_character()
+
+    @property
+    def FRAME_LOG_SAMPLE_RATE(self):
+        """ Log 1 in every N frames send or received by servers. Default is 1,
+        which logs every frame. Frames are only logged if the logger
+        'uModbus' is enabled for the level of the message.
+
+        This value can also be set using the environment variable
+        `UMODBUS_FRAME_LOG_SAMPLE_RATE`.
+        """
+        return self._FRAME_LOG_SAMPLE_RATE
+
+    @FRAME_LOG_SAMPLE_RATE.setter
+    def FRAME_LOG_SAMPLE_RATE(self, value):
+        """ Set sample rate of frame logging.
+
+        :param value: Number, log 1 in every `value` frames.
+        """
+        self._FRAME_LOG_SAMPLE_RATE = value
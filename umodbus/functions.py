@@ -57,12 +57,15 @@ A response PDU could look like this::
 """
 from __future__ import division
 import struct
-import inspect
 import math
 try:
     from functools import reduce
 except ImportError:
     pass
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
 
 from umodbus import conf, log
 from umodbus.exceptions import (error_code_to_exception_map,
@@ -126,7 +129,7 @@ def create_function_from_response_pdu(resp_pdu, req_pdu=None):
     function = function_code_to_function_map[function_code]
 
     if req_pdu is not None and \
-        'req_pdu' in inspect.getargspec(function.create_from_response_pdu).args:  # NOQA
+        'req_pdu' in getargspec(function.create_from_response_pdu).args:  # NOQA
 
         return function.create_from_response_pdu(resp_pdu, req_pdu)
 
@@ -158,9 +161,69 @@ def expected_response_pdu_size_from_request_pdu(pdu):
     return create_function_from_request_pdu(pdu).expected_response_pdu_size
 
 
+def expected_request_pdu_size_from_pdu_head(pdu_head):
+    """ Return number of bytes of request PDU, based on first bytes of the
+    request PDU. The size of requests with function code 15 or 16 depends on
+    their byte count, which is the 6th byte of the PDU.
+
+    :param pdu_head: Array of bytes, at least the function code.
+    :return: Number of bytes or None if more bytes are required.
+    :raises IllegalFunctionError: When function code is not supported.
+    """
+    function_code = get_function_code_from_request_pdu(pdu_head)
+
+    if function_code not in function_code_to_function_map:
+        raise IllegalFunctionError(function_code)
+
+    if function_code in [WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS]:
+        if len(pdu_head) < 6:
+            return None
+
+        return 6 + struct.unpack('>B', pdu_head[5:6])[0]
+
+    return 5
+
+
+def expected_response_pdu_size_from_pdu_head(pdu_head):
+    """ Return number of bytes of response PDU, based on first bytes of the
+    response PDU. The size of responses to read requests depends on their
+    byte count, which is the 2nd byte of the PDU.
+
+    :param pdu_head: Array of bytes, at least the function code.
+    :return: Number of bytes or None if more bytes are required.
+    :raises IllegalFunctionError: When function code is not supported.
+    """
+    function_code = get_function_code_from_request_pdu(pdu_head)
+
+    # Exception responses have the MSB of the function code set.
+    if function_code & 0x80:
+        function_code &= 0x7F
+
+        if function_code in function_code_to_function_map:
+            return 2
+
+    if function_code not in function_code_to_function_map:
+        raise IllegalFunctionError(function_code)
+
+    if function_code in [READ_COILS, READ_DISCRETE_INPUTS,
+                         READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS]:
+        if len(pdu_head) < 2:
+            return None
+
+        return 2 + struct.unpack('>B', pdu_head[1:2])[0]
+
+    return 5
+
+
 class ModbusFunction(object):
     function_code = None
 
+    produces_data = False
+    """ Whether the response PDU is created from data returned by the
+    endpoints. If True :meth:`create_response_pdu` requires the result of
+    :meth:`execute`.
+    """
+
 
 class ReadCoils(ModbusFunction):
     """ Implement Modbus function code 01.
@@ -233,6 +296,7 @@ class ReadCoils(ModbusFunction):
 
     """
     function_code = READ_COILS
+    produces_data = True
     max_quantity = 2000
     format_character = 'B'
 
@@ -356,22 +420,20 @@ class ReadCoils(ModbusFunction):
         :param eindpoint: Instance of modbus.route.Map.
         :return: Result of call to endpoint.
         """
-        try:
-            values = []
+        values = []
 
-            for address in range(self.starting_address,
-                                 self.starting_address + self.quantity):
-                endpoint = route_map.match(slave_id, self.function_code,
-                                           address)
-                values.append(endpoint(slave_id=slave_id, address=address,
-                                       function_code=self.function_code))
+        for address in range(self.starting_address,
+                             self.starting_address + self.quantity):
+            endpoint = route_map.match(slave_id, self.function_code, address)
 
-            return values
+            # route_map.match() returns None if no match is found.
+            if endpoint is None:
+                raise IllegalDataAddressError()
 
-        # route_map.match() returns None if no match is found. Calling None
-        # results in TypeError.
-        except TypeError:
-            raise IllegalDataAddressError()
+            values.append(endpoint(slave_id=slave_id, address=address,
+                                   function_code=self.function_code))
+
+        return values
 
 
 class ReadDiscreteInputs(ModbusFunction):
@@ -446,6 +508,7 @@ class ReadDiscreteInputs(ModbusFunction):
 
     """
     function_code = READ_DISCRETE_INPUTS
+    produces_data = True
     max_quantity = 2000
     format_character = 'B'
 
@@ -569,22 +632,20 @@ class ReadDiscreteInputs(ModbusFunction):
         :param eindpoint: Instance of modbus.route.Map.
         :return: Result of call to endpoint.
         """
-        try:
-            values = []
+        values = []
 
-            for address in range(self.starting_address,
-                                 self.starting_address + self.quantity):
-                endpoint = route_map.match(slave_id, self.function_code,
-                                           address)
-                values.append(endpoint(slave_id=slave_id, address=address,
-                                       function_code=self.function_code))
+        for address in range(self.starting_address,
+                             self.starting_address + self.quantity):
+            endpoint = route_map.match(slave_id, self.function_code, address)
 
-            return values
+            # route_map.match() returns None if no match is found.
+            if endpoint is None:
+                raise IllegalDataAddressError()
 
-        # route_map.match() returns None if no match is found. Calling None
-        # results in TypeError.
-        except TypeError:
-            raise IllegalDataAddressError()
+            values.append(endpoint(slave_id=slave_id, address=address,
+                                   function_code=self.function_code))
+
+        return values
 
 
 class ReadHoldingRegisters(ModbusFunction):
@@ -650,6 +711,7 @@ class ReadHoldingRegisters(ModbusFunction):
 
     """
     function_code = READ_HOLDING_REGISTERS
+    produces_data = True
     max_quantity = 0x007D
 
     data = None
@@ -749,22 +811,20 @@ class ReadHoldingRegisters(ModbusFunction):
         :param eindpoint: Instance of modbus.route.Map.
         :return: Result of call to endpoint.
         """
-        try:
-            values = []
+        values = []
 
-            for address in range(self.starting_address,
-                                 self.starting_address + self.quantity):
-                endpoint = route_map.match(slave_id, self.function_code,
-                                           address)
-                values.append(endpoint(slave_id=slave_id, address=address,
-                                       function_code=self.function_code))
+        for address in range(self.starting_address,
+                             self.starting_address + self.quantity):
+            endpoint = route_map.match(slave_id, self.function_code, address)
 
-            return values
+            # route_map.match() returns None if no match is found.
+            if endpoint is None:
+                raise IllegalDataAddressError()
 
-        # route_map.match() returns None if no match is found. Calling None
-        # results in TypeError.
-        except TypeError:
-            raise IllegalDataAddressError()
+            values.append(endpoint(slave_id=slave_id, address=address,
+                                   function_code=self.function_code))
+
+        return values
 
 
 class ReadInputRegisters(ModbusFunction):
@@ -830,6 +890,7 @@ class ReadInputRegisters(ModbusFunction):
 
     """
     function_code = READ_INPUT_REGISTERS
+    produces_data = True
     max_quantity = 0x007D
 
     data = None
@@ -927,22 +988,20 @@ class ReadInputRegisters(ModbusFunction):
         :param eindpoint: Instance of modbus.route.Map.
         :return: Result of call to endpoint.
         """
-        try:
-            values = []
+        values = []
 
-            for address in range(self.starting_address,
-                                 self.starting_address + self.quantity):
-                endpoint = route_map.match(slave_id, self.function_code,
-                                           address)
-                values.append(endpoint(slave_id=slave_id, address=address,
-                                       function_code=self.function_code))
+        for address in range(self.starting_address,
+                             self.starting_address + self.quantity):
+            endpoint = route_map.match(slave_id, self.function_code, address)
 
-            return values
+            # route_map.match() returns None if no match is found.
+            if endpoint is None:
+                raise IllegalDataAddressError()
 
-        # route_map.match() returns None if no match is found. Calling None
-        # results in TypeError.
-        except TypeError:
-            raise IllegalDataAddressError()
+            values.append(endpoint(slave_id=slave_id, address=address,
+                                   function_code=self.function_code))
+
+        return values
 
 
 class WriteSingleCoil(ModbusFunction):
@@ -1094,14 +1153,14 @@ class WriteSingleCoil(ModbusFunction):
         :param eindpoint: Instance of modbus.route.Map.
         """
         endpoint = route_map.match(slave_id, self.function_code, self.address)
-        try:
-            endpoint(slave_id=slave_id, address=self.address, value=self.value,
-                     function_code=self.function_code)
-        # route_map.match() returns None if no match is found. Calling None
-        # results in TypeError.
-        except TypeError:
+
+        # route_map.match() returns None if no match is found.
+        if endpoint is None:
             raise IllegalDataAddressError()
 
+        endpoint(slave_id=slave_id, address=self.address, value=self.value,
+                 function_code=self.function_code)
+
 
 class WriteSingleRegister(ModbusFunction):
     """ Implement Modbus function code 06.
@@ -1238,14 +1297,14 @@ class WriteSingleRegister(ModbusFunction):
         :param eindpoint: Instance of modbus.route.Map.
         """
         endpoint = route_map.match(slave_id, self.function_code, self.address)
-        try:
-            endpoint(slave_id=slave_id, address=self.address, value=self.value,
-                     function_code=self.function_code)
-        # route_map.match() returns None if no match is found. Calling None
-        # results in TypeError.
-        except TypeError:
+
+        # route_map.match() returns None if no match is found.
+        if endpoint is None:
             raise IllegalDataAddressError()
 
+        endpoint(slave_id=slave_id, address=self.address, value=self.value,
+                 function_code=self.function_code)
+
 
 class WriteMultipleCoils(ModbusFunction):
     """ Implement Modbus function 15 (0x0F) Write Multiple Coils.
@@ -1338,8 +1397,7 @@ class WriteMultipleCoils(ModbusFunction):
 
         fmt = '>BHHB' + 'B' * len(bytes_)
         return struct.pack(fmt, self.function_code, self.starting_address,
-                           len(self.values), (len(self.values) // 8) + 1,
-                           *bytes_)
+                           len(self.values), len(bytes_), *bytes_)
 
     @staticmethod
     def create_from_request_pdu(pdu):
@@ -1455,14 +1513,13 @@ class WriteMultipleCoils(ModbusFunction):
             address = self.starting_address + index
             endpoint = route_map.match(slave_id, self.function_code, address)
 
-            try:
-                endpoint(slave_id=slave_id, address=address, value=value,
-                         function_code=self.function_code)
-            # route_map.match() returns None if no match is found. Calling None
-            # results in TypeError.
-            except TypeError:
+            # route_map.match() returns None if no match is found.
+            if endpoint is None:
                 raise IllegalDataAddressError()
 
+            endpoint(slave_id=slave_id, address=address, value=value,
+                     function_code=self.function_code)
+
 
 class WriteMultipleRegisters(ModbusFunction):
     """ Implement Modbus function 16 (0x10) Write Multiple Registers.
@@ -1607,14 +1664,13 @@ class WriteMultipleRegisters(ModbusFunction):
             address = self.starting_address + index
             endpoint = route_map.match(slave_id, self.function_code, address)
 
-            try:
-                endpoint(slave_id=slave_id, address=address, value=value,
-                         function_code=self.function_code)
-            # route_map.match() returns None if no match is found. Calling None
-            # results in TypeError.
-            except TypeError:
+            # route_map.match() returns None if no match is found.
+            if endpoint is None:
                 raise IllegalDataAddressError()
 
+            endpoint(slave_id=slave_id, address=address, value=value,
+                     function_code=self.function_code)
+
 function_code_to_function_map = {
     READ_COILS: ReadCoils,
     READ_DISCRETE_INPUTS: ReadDiscreteInputs,
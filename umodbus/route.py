@@ -2,9 +2,15 @@ class Map:
     def __init__(self):
         self._rules = []
 
+        # Slave ids of all rules. The set is updated in place, so it can be
+        # shared.
+        self.slave_ids = set()
+
     def add_rule(self, endpoint, slave_ids, function_codes, addresses):
         self._rules.append(DataRule(endpoint, slave_ids, function_codes,
                                     addresses))
+        self.slave_ids.update(slave_id for slave_id in range(256)
+                              if slave_id in slave_ids)
 
     def match(self, slave_id, function_code, address):
         for rule in self._rules:
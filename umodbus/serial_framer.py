@@ -0,0 +1,317 @@
+""" Split a stream of bytes received from a serial line into Modbus RTU
+frames.
+
+Modbus RTU frames are delimited by a silent interval of 3.5 characters. Relying
+on timing alone is fragile: frames arriving back to back end up in one read
+and frames split over 2 reads are dropped as CRC errors. :class:`RTUFramer`
+uses the function code and byte count of a frame to know its size. A frame is
+emitted as soon as its last byte has been received and its CRC is valid. After
+garbage the framer resynchronises by skipping bytes until it finds a valid
+frame::
+
+    >>> framer = RTUFramer()
+    >>> framer.feed(b'\\xff\\x01\\x03\\x00\\x00')
+    []
+    >>> framer.feed(b'\\x00\\x01\\x84\\n\\x01\\x03')
+    [b'\\x01\\x03\\x00\\x00\\x00\\x01\\x84\\n']
+    >>> framer.dropped_bytes
+    1
+
+"""
+from umodbus.exceptions import IllegalFunctionError
+from umodbus.functions import (expected_request_pdu_size_from_pdu_head,
+                               expected_response_pdu_size_from_pdu_head)
+from umodbus.client.serial.rtu import BROADCAST_ADDRESS
+from umodbus.client.serial.redundancy_check import CRCAccumulator
+
+# Address field (1 byte) and CRC (2 bytes).
+_ADU_OVERHEAD = 3
+
+# The size of all PDU's can be determined using the first 6 bytes.
+_PDU_HEAD_SIZE = 6
+
+
+class RTUFramer(object):
+    """ Assemble RTU frames from chunks of bytes.
+
+    By default the framer expects requests. Pass
+    :func:`umodbus.functions.expected_response_pdu_size_from_pdu_head` in
+    `pdu_size_functions` to assemble responses. When multiple functions are
+    given, a frame is emitted when it has a valid CRC for one of the sizes.
+
+    When `slave_ids` is given, frames with another address are skipped.
+    They can be requests or responses, so their size is determined using
+    the functions in :attr:`foreign_pdu_size_functions`. If only 1 size is
+    possible the frame is skipped without calculating its CRC, otherwise
+    the CRC tells which size is right. Broadcasts, frames with address 0,
+    are always assembled.
+
+    :param pdu_size_functions: List of functions which return size of a PDU
+        based on the first bytes of a PDU. See
+        :func:`umodbus.functions.expected_request_pdu_size_from_pdu_head`.
+    :param slave_ids: Container with addresses of frames to assemble, None
+        to assemble all frames.
+    """
+    max_frame_size = 256
+
+    foreign_pdu_size_functions = [expected_request_pdu_size_from_pdu_head,
+                                  expected_response_pdu_size_from_pdu_head]
+    """ Functions which return size of a PDU of a frame for another slave.
+    """
+
+    def __init__(self, pdu_size_functions=None, slave_ids=None):
+        if pdu_size_functions is None:
+            pdu_size_functions = [expected_request_pdu_size_from_pdu_head]
+
+        self.pdu_size_functions = pdu_size_functions
+        self.slave_ids = slave_ids
+
+        self.foreign_frames = 0
+        """ Number of frames skipped because of their address. """
+
+        self.frames = 0
+        """ Number of frames emitted. """
+
+        self.crc_errors = 0
+        """ Number of frames with a known size but an invalid CRC. A
+        damaged frame is counted once, not for every byte skipped while
+        resynchronising after it.
+        """
+
+        self.dropped_bytes = 0
+        """ Number of bytes which weren't part of a valid frame. """
+
+        self.reset()
+
+    def reset(self):
+        """ Discard all bytes received so far. """
+        self._buffer = bytearray()
+        self._crc = CRCAccumulator()
+
+        # Offset of the frame being assembled in the buffer.
+        self._start = 0
+
+        # Offset in the buffer where the segment of bytes starts which were
+        # received after the last frame or silence. None if the segment is
+        # too large to be a frame.
+        self._segment_start = 0
+
+        # True while skipping the bytes of a frame with an invalid CRC.
+        self._resyncing = False
+
+    def _is_foreign(self):
+        """ Return True if frame being assembled is for another slave. """
+        return self.slave_ids is not None and \
+            self._buffer[self._start] != BROADCAST_ADDRESS and \
+            self._buffer[self._start] not in self.slave_ids
+
+    def _frame_sizes(self, pdu_size_functions):
+        """ Return sizes the frame being assembled could have.
+
+        :param pdu_size_functions: List with functions which return size of
+            PDU.
+
+        :return: Tuple with a sorted list of possible frame sizes and a
+            boolean which is True when more bytes are needed to determine all
+            possible sizes.
+        """
+        pdu_head = self._buffer[self._start + 1:
+                                self._start + 1 + _PDU_HEAD_SIZE]
+        sizes = []
+        pending = False
+
+        for pdu_size in pdu_size_functions:
+            try:
+                size = pdu_size(pdu_head)
+            except IllegalFunctionError:
+                continue
+
+            if size is None:
+                pending = True
+            else:
+                sizes.append(size + _ADU_OVERHEAD)
+
+        return sorted(sizes), pending
+
+    def _drop_byte(self):
+        """ Skip first byte of frame being assembled. """
+        self._start += 1
+        self.dropped_bytes += 1
+        self._crc.reset()
+
+        if self._segment_start is not None and \
+                self._start - self._segment_start >= self.max_frame_size:
+            self._segment_start = None
+
+        if self._segment_start is None:
+            del self._buffer[:self._start]
+            self._start = 0
+
+    def _remove_frame(self, size):
+        """ Remove frame from buffer and return it. """
+        frame = bytes(self._buffer[self._start:self._start + size])
+        del self._buffer[:self._start + size]
+
+        self._start = 0
+        self._segment_start = 0
+        self._resyncing = False
+        self._crc.reset()
+
+        return frame
+
+    def _emit_frame(self, size):
+        """ Remove frame from buffer and return it. """
+        self.frames += 1
+        return self._remove_frame(size)
+
+    def _skip_frame(self, size):
+        """ Remove frame for another slave from buffer. """
+        self.foreign_frames += 1
+        self._remove_frame(size)
+
+    def _next_frame(self):
+        """ Return next frame in buffer, None if more bytes are needed.
+
+        :return: Byte array with frame or None.
+        """
+        while len(self._buffer) - self._start >= 2:
+            foreign = self._is_foreign()
+
+            if foreign and self._start != self._segment_start:
+                # Not the start of a frame, or the start of a frame for
+                # another slave which is skipped byte by byte.
+                self._drop_byte()
+                continue
+
+            if foreign:
+                sizes, pending = self._frame_sizes(
+                    self.foreign_pdu_size_functions)
+            else:
+                sizes, pending = self._frame_sizes(self.pdu_size_functions)
+
+            if not sizes and not pending:
+                # Function code isn't known, so this can't be the start of a
+                # frame.
+                self._drop_byte()
+                continue
+
+            available = len(self._buffer) - self._start
+
+            if foreign and not pending and len(set(sizes)) == 1:
+                # A frame for another slave with only 1 possible size, skip
+                # it without calculating its CRC.
+                if available < sizes[0]:
+                    return None
+
+                self._skip_frame(sizes[0])
+                continue
+
+            frame_size = None
+
+            for size in sizes:
+                if self._crc.size < size:
+                    # Only process the bytes not processed before.
+                    end = self._start + min(size, available)
+                    self._crc.update(
+                        self._buffer[self._start + self._crc.size:end])
+
+                if self._crc.size < size:
+                    return None
+
+                if self._crc.valid:
+                    frame_size = size
+                    break
+
+            if frame_size is None:
+                if pending:
+                    return None
+
+                if not self._resyncing:
+                    self.crc_errors += 1
+                    self._resyncing = True
+
+                self._drop_byte()
+            elif foreign:
+                self._skip_frame(frame_size)
+            else:
+                return self._emit_frame(frame_size)
+
+        return None
+
+    def feed(self, data):
+        """ Process bytes and return frames which are complete.
+
+        :param data: Byte array.
+        :return: List with frames.
+        """
+        self._buffer.extend(data)
+        frames = []
+
+        while True:
+            frame = self._next_frame()
+
+            if frame is None:
+                return frames
+
+            frames.append(frame)
+
+    def flush(self):
+        """ Signal that the line has been silent for at least 3.5 characters.
+        A frame can't continue after silence, so all remaining bytes are
+        discarded. Unless these bytes form a frame with a valid CRC of which
+        the size can't be determined, for example a request with an
+        unsupported function code.
+
+        :return: List with at most 1 frame.
+        """
+        frames = []
+
+        if self._segment_start is not None:
+            segment = self._buffer[self._segment_start:]
+
+            if len(segment) >= 4 and CRCAccumulator(segment).valid:
+                frames.append(bytes(segment))
+                self.frames += 1
+                self.dropped_bytes -= self._start - self._segment_start
+            else:
+                self.dropped_bytes += len(self._buffer) - self._start
+        else:
+            self.dropped_bytes += len(self._buffer) - self._start
+
+        self.reset()
+
+        return frames
+
+    @property
+    def receiving(self):
+        """ True if bytes have been received since the last frame which
+        haven't been discarded yet. :meth:`flush` must be called when the line
+        becomes silent.
+        """
+        return len(self._buffer) > 0
+
+    @property
+    def missing(self):
+        """ Minimum number of bytes required to complete a frame or to learn
+        its size. At least 1.
+        """
+        available = len(self._buffer) - self._start
+
+        if available < 2:
+            return 2 - available
+
+        if self._is_foreign():
+            sizes, pending = self._frame_sizes(
+                self.foreign_pdu_size_functions)
+        else:
+            sizes, pending = self._frame_sizes(self.pdu_size_functions)
+
+        candidates = [size - available for size in sizes if size > available]
+
+        if pending:
+            candidates.append(1 + _PDU_HEAD_SIZE - available)
+
+        if not candidates:
+            return 1
+
+        return max(1, min(candidates))
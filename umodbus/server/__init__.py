@@ -2,13 +2,14 @@ try:
     from socketserver import BaseRequestHandler
 except ImportError:
     from SocketServer import BaseRequestHandler
-from binascii import hexlify
+import logging
 
 from umodbus import log
 from umodbus.functions import create_function_from_request_pdu
 from umodbus.exceptions import ModbusError, ServerDeviceFailureError
 from umodbus.utils import (get_function_code_from_request_pdu,
-                           pack_exception_pdu, recv_exactly)
+                           pack_exception_pdu, log_frame)
+from umodbus.client.serial.rtu import is_broadcast, BROADCAST_ADDRESS
 
 
 def route(self, slave_ids=None, function_codes=None, addresses=None):
@@ -30,29 +31,105 @@ def route(self, slave_ids=None, function_codes=None, addresses=None):
     return inner
 
 
+def execute_broadcast(self, route_map, request_adu):
+    """ Execute broadcast write request. All slaves on the line execute a
+    broadcast, so the request is executed once for every slave id in the
+    route map. Slaves never respond to broadcast requests, so the responses
+    are discarded.
+
+    :param self: Server or request handler which received the request.
+    :param route_map: Route map of the server.
+    :param request_adu: A bytearray containing the RTU request ADU, of which
+        the CRC has been validated already.
+    """
+    if not is_broadcast(request_adu):
+        log.warning('Ignoring broadcast request which isn\'t a write.')
+        return
+
+    request_pdu = self.get_request_pdu(request_adu)
+
+    for slave_id in sorted(getattr(route_map, 'slave_ids',
+                                   [BROADCAST_ADDRESS])):
+        self.execute_route({'unit_id': slave_id}, request_pdu)
+
+
 class AbstractRequestHandler(BaseRequestHandler):
     """ A subclass of :class:`socketserver.BaseRequestHandler` dispatching
     incoming Modbus requests using the server's :attr:`route_map`.
 
     """
+    recv_size = 4096
+    """ Maximum number of bytes read from socket at once. """
+
+    def setup(self):
+        """ Prepare handling of connection. """
+        self.buffer = b''
+
     def handle(self):
+        """ Handle requests until client closes the connection.
+
+        All data available on the socket is read at once. Every complete
+        request ADU in it is processed and the responses are send back
+        together, in order of the requests. So a client which pipelines
+        requests doesn't cost a few system calls per request.
+        """
         try:
             while True:
+                data = self.request.recv(self.recv_size)
+
+                if len(data) == 0:
+                    return
+
                 try:
-                    mbap_header = recv_exactly(self.request.recv, 7)
-                    remaining = self.get_meta_data(mbap_header)['length'] - 1
-                    request_pdu = recv_exactly(self.request.recv, remaining)
+                    request_adus = self.feed(data)
                 except ValueError:
                     return
 
-                response_adu = self.process(mbap_header + request_pdu)
-                self.respond(response_adu)
+                response_adus = b''.join([self.process(request_adu)
+                                          for request_adu in request_adus])
+
+                if response_adus:
+                    self.respond(response_adus)
         except:
             import traceback
             log.exception('Error while handling request: {0}.'
                           .format(traceback.print_exc()))
             raise
 
+    def feed(self, data):
+        """ Buffer data received from client and return the request ADU's
+        which are complete.
+
+        An ADU is complete when the MBAP header and the number of bytes
+        indicated by the length field of the header are available.
+
+        :param data: Bytes received from client.
+        :return: List with request ADU's.
+        :raises ValueError: When the data can't be a request ADU.
+        """
+        self.buffer += data
+        request_adus = []
+        offset = 0
+
+        while len(self.buffer) - offset >= 7:
+            length = self.get_meta_data(
+                self.buffer[offset:offset + 7])['length']
+
+            if length < 1:
+                raise ValueError('Invalid length {0} in MBAP header.'
+                                 .format(length))
+
+            end = offset + 6 + length
+            if len(self.buffer) < end:
+                break
+
+            request_adus.append(self.buffer[offset:end])
+            offset = end
+
+        self.buffer = self.buffer[offset:]
+
+        return request_adus
+
     def process(self, request_adu):
         """ Process request ADU and return response.
 
@@ -81,13 +158,12 @@ class AbstractRequestHandler(BaseRequestHandler):
             results =\
                 function.execute(meta_data['unit_id'], self.server.route_map)
 
-            try:
-                # ReadFunction's use results of callbacks to build response
-                # PDU...
+            # Read functions use results of callbacks to build response PDU,
+            # other functions don't.
+            if function.produces_data:
                 return function.create_response_pdu(results)
-            except TypeError:
-                # ...other functions don't.
-                return function.create_response_pdu()
+
+            return function.create_response_pdu()
         except ModbusError as e:
             function_code = get_function_code_from_request_pdu(request_pdu)
             return pack_exception_pdu(function_code, e.error_code)
@@ -101,8 +177,9 @@ class AbstractRequestHandler(BaseRequestHandler):
     def respond(self, response_adu):
         """ Send response ADU back to client.
 
-        :param response_adu: A bytearray containing the response of an ADU.
+        :param response_adu: A bytearray containing the response of an ADU, or
+            the responses of multiple ADU's.
         """
-        log.info('--> {0} - {1}.'.format(self.client_address[0],
-                 hexlify(response_adu)))
+        log_frame(logging.INFO, '--> {0} - {frame}.', response_adu,
+                  self.client_address[0])
         self.request.sendall(response_adu)
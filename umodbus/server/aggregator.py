@@ -0,0 +1,311 @@
+""" A virtual slave which composes its address space from many devices.
+
+Clients which need values of many devices need a connection to every device.
+:class:`Aggregator` polls the devices in the background and keeps their
+values in memory. A declarative map translates virtual addresses to
+addresses of devices, so a client reads values of many devices with 1
+request to 1 server::
+
+    from socketserver import ThreadingTCPServer
+    from serial import Serial
+
+    from umodbus.client import tcp
+    from umodbus.client.serial import rtu
+    from umodbus.client.serial.bus import BusMaster
+    from umodbus.server.tcp import get_server, RequestHandler
+    from umodbus.client.upstream import Upstream
+    from umodbus.server.aggregator import Aggregator
+    from umodbus.functions import READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS
+
+    app = get_server(ThreadingTCPServer, ('', 502), RequestHandler)
+    aggregator = Aggregator(max_age=5)
+
+    boiler = aggregator.add_device(
+        Upstream(('192.168.1.20', 502)).send_message, client=tcp,
+        slave_id=1, interval=1)
+    pump = aggregator.add_device(
+        BusMaster(Serial('/dev/ttyS1', baudrate=19200, timeout=0.5))
+        .send_message, client=rtu, slave_id=7, interval=0.5)
+
+    # Virtual holding registers 0 to 9 are holding registers 100 to 109 of
+    # the boiler, virtual holding registers 10 and 11 are input registers 0
+    # and 1 of the pump.
+    aggregator.add_mapping(0, boiler, address=100, quantity=10)
+    aggregator.add_mapping(10, pump, address=0, quantity=2,
+                           function_code=READ_INPUT_REGISTERS,
+                           virtual_function_code=READ_HOLDING_REGISTERS)
+
+    aggregator.bind_routes(app, slave_ids=[1])
+    aggregator.start()
+
+    try:
+        app.serve_forever()
+    finally:
+        aggregator.shutdown()
+
+Every device is polled by its own thread, so a slow device doesn't delay the
+others. Devices sharing a serial line are serialised by their
+:class:`umodbus.client.serial.bus.BusMaster`. The virtual address space is
+read only.
+
+"""
+from threading import Thread, Event
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus import log
+from umodbus.client import tcp
+from umodbus.functions import (READ_COILS, READ_DISCRETE_INPUTS,
+                               READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS)
+from umodbus.exceptions import GatewayTargetDeviceFailedToRespondError
+
+_function_names = {
+    READ_COILS: 'read_coils',
+    READ_DISCRETE_INPUTS: 'read_discrete_inputs',
+    READ_HOLDING_REGISTERS: 'read_holding_registers',
+    READ_INPUT_REGISTERS: 'read_input_registers',
+}
+
+_bit_function_codes = (READ_COILS, READ_DISCRETE_INPUTS)
+
+
+class Mapping(object):
+    """ Range of virtual addresses which holds values of a device.
+
+    :param virtual_function_code: Function code to read virtual range with.
+    :param virtual_address: First virtual address.
+    :param device: Instance of :class:`Device`.
+    :param function_code: Function code to read range of device with.
+    :param address: First address of range of device.
+    :param quantity: Number of addresses in range.
+    """
+    def __init__(self, virtual_function_code, virtual_address, device,
+                 function_code, address, quantity):
+        self.virtual_function_code = virtual_function_code
+        self.virtual_address = virtual_address
+        self.device = device
+        self.function_code = function_code
+        self.address = address
+        self.quantity = quantity
+
+        # Raises an error when quantity exceeds the limits of the protocol.
+        self.create_request_adu()
+
+        self.values = None
+        """ List with values, None if range has never been read. """
+
+        self.updated = None
+        """ Time values were read as returned by `monotonic()`. """
+
+    def create_request_adu(self):
+        """ Return request ADU to read range of device. Every Modbus TCP/IP
+        request ADU has a new transaction id.
+
+        :return: Byte array with ADU.
+        """
+        return getattr(self.device.client,
+                       _function_names[self.function_code])(
+            self.device.slave_id, self.address, self.quantity)
+
+    def overlaps(self, other):
+        """ Return True if virtual ranges of mappings share addresses.
+
+        :param other: Instance of :class:`Mapping`.
+        """
+        return self.virtual_function_code == other.virtual_function_code and \
+            self.virtual_address < other.virtual_address + other.quantity and \
+            other.virtual_address < self.virtual_address + self.quantity
+
+
+class Device(object):
+    """ Device polled by an :class:`Aggregator`. Create it with
+    :meth:`Aggregator.add_device`.
+
+    :param send_message: Function which sends a request ADU to the device and
+        returns the parsed response.
+    :param client: Module with functions to create request ADU's,
+        :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+    :param slave_id: Slave id of device.
+    :param interval: Number of seconds between start of polls.
+    """
+    def __init__(self, send_message, client, slave_id, interval):
+        self.send_message = send_message
+        self.client = client
+        self.slave_id = slave_id
+        self.interval = interval
+
+        self.mappings = []
+        """ List with instances of :class:`Mapping` of device. """
+
+        self.polls = 0
+        """ Number of requests send to device. """
+
+        self.errors = 0
+        """ Number of requests which failed. """
+
+    def poll(self):
+        """ Read all mappings of device. A failing request doesn't stop the
+        other mappings from being read.
+        """
+        for mapping in self.mappings:
+            self.polls += 1
+
+            try:
+                values = self.send_message(mapping.create_request_adu())
+            except Exception as e:
+                self.errors += 1
+                log.warning('Polling slave {0} failed: {1!r}.'
+                            .format(self.slave_id, e))
+                continue
+
+            mapping.values = values
+            mapping.updated = monotonic()
+
+
+class Aggregator(object):
+    """ Image of values of many devices in a virtual address space.
+
+    :param max_age: Number of seconds after which values of a device which
+        isn't updated are invalid, None if values never become invalid.
+        Reads of invalid values are answered with
+        :class:`umodbus.exceptions.GatewayTargetDeviceFailedToRespondError`.
+    """
+    def __init__(self, max_age=None):
+        self.max_age = max_age
+
+        self.devices = []
+        """ List with instances of :class:`Device`. """
+
+        self.mappings = []
+        """ List with instances of :class:`Mapping`. """
+
+        self._threads = []
+        self._shutdown_request = Event()
+
+    def add_device(self, send_message, client=tcp, slave_id=1, interval=1):
+        """ Add device to poll.
+
+        :param send_message: Function which sends a request ADU to the device
+            and returns the parsed response. For example the `send_message`
+            method of :class:`umodbus.client.upstream.Upstream` or
+            :class:`umodbus.client.serial.bus.BusMaster`.
+        :param client: Module with functions to create request ADU's,
+            :mod:`umodbus.client.tcp` or :mod:`umodbus.client.serial.rtu`.
+            Default is :mod:`umodbus.client.tcp`.
+        :param slave_id: Slave id of device.
+        :param interval: Number of seconds between start of polls.
+        :return: Instance of :class:`Device`.
+        """
+        device = Device(send_message, client, slave_id, interval)
+        self.devices.append(device)
+
+        return device
+
+    def add_mapping(self, virtual_address, device, address, quantity=1,
+                    function_code=READ_HOLDING_REGISTERS,
+                    virtual_function_code=None):
+        """ Map range of device to virtual addresses.
+
+        :param virtual_address: First virtual address.
+        :param device: Instance of :class:`Device`.
+        :param address: First address of range of device.
+        :param quantity: Number of addresses in range. The range is read with
+            1 request, so it must fit in 1 request.
+        :param function_code: Function code to read range of device with.
+            Default is 3, Read Holding Registers.
+        :param virtual_function_code: Function code to read virtual range
+            with. Default is `function_code`. Registers which are read as
+            coils or discrete inputs are 1 when they aren't 0.
+        :return: Instance of :class:`Mapping`.
+        :raises ValueError: When virtual range overlaps with another mapping.
+        """
+        if virtual_function_code is None:
+            virtual_function_code = function_code
+
+        for function_code_ in (function_code, virtual_function_code):
+            if function_code_ not in _function_names:
+                raise ValueError('Function code {0} doesn\'t read.'
+                                 .format(function_code_))
+
+        mapping = Mapping(virtual_function_code, virtual_address, device,
+                          function_code, address, quantity)
+
+        for other in self.mappings:
+            if mapping.overlaps(other):
+                raise ValueError('Virtual address {0} is already mapped.'
+                                 .format(max(virtual_address,
+                                             other.virtual_address)))
+
+        self.mappings.append(mapping)
+        device.mappings.append(mapping)
+
+        return mapping
+
+    def bind_routes(self, server, slave_ids):
+        """ Add routes to route map of server for all virtual addresses.
+
+        :param server: Server with route map.
+        :param slave_ids: A list or set with slave id's of virtual slave.
+        """
+        for mapping in self.mappings:
+            server.route_map.add_rule(
+                self._create_endpoint(mapping), slave_ids,
+                [mapping.virtual_function_code],
+                range(mapping.virtual_address,
+                      mapping.virtual_address + mapping.quantity))
+
+    def _create_endpoint(self, mapping):
+        def read(slave_id, function_code, address):
+            values = mapping.values
+
+            if values is None or (self.max_age is not None and
+                                  monotonic() - mapping.updated >
+                                  self.max_age):
+                raise GatewayTargetDeviceFailedToRespondError()
+
+            value = values[address - mapping.virtual_address]
+
+            if mapping.virtual_function_code in _bit_function_codes:
+                return 1 if value else 0
+
+            return value
+
+        return read
+
+    def poll(self):
+        """ Poll all devices once. """
+        for device in self.devices:
+            device.poll()
+
+    def _poll_forever(self, device):
+        while not self._shutdown_request.is_set():
+            started = monotonic()
+            device.poll()
+
+            self._shutdown_request.wait(
+                max(0, started + device.interval - monotonic()))
+
+    def start(self):
+        """ Start a thread for every device which polls it until
+        :meth:`shutdown` is called.
+        """
+        self._shutdown_request.clear()
+
+        for device in self.devices:
+            t = Thread(target=self._poll_forever, args=(device,))
+            t.daemon = True
+            t.start()
+
+            self._threads.append(t)
+
+    def shutdown(self):
+        """ Stop polling and wait for threads to finish their current poll.
+        """
+        self._shutdown_request.set()
+
+        for t in self._threads:
+            t.join()
+
+        self._threads = []
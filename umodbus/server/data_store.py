@@ -0,0 +1,127 @@
+""" A data store which keeps coils, discrete inputs, holding registers and
+input registers in shared memory.
+
+uModbus itself doesn't know the concept of Modbus' data models, routes decide
+where data comes from. But when a server runs in several processes, like
+:class:`umodbus.server.prefork.PreforkServer` does, routes can't use a plain
+`dict` to store values: a write handled by one process wouldn't be visible in
+the other processes. :class:`SharedMemoryDataStore` allocates its tables in
+shared memory before the workers are forked, so all workers read and write the
+same values::
+
+    from umodbus.server.data_store import SharedMemoryDataStore
+    from umodbus.server.prefork import PreforkServer
+    from umodbus.server.tcp import RequestHandler, get_server
+
+    app = get_server(PreforkServer, ('', 502), RequestHandler)
+
+    data_store = SharedMemoryDataStore(coils=100, holding_registers=100)
+    data_store.bind_routes(app, slave_ids=[1])
+
+    app.serve_forever()
+
+"""
+from multiprocessing import RawArray, RLock
+
+from umodbus import conf
+from umodbus.functions import (READ_COILS, READ_DISCRETE_INPUTS,
+                               READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
+                               WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
+                               WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS)
+
+COILS = 'coils'
+DISCRETE_INPUTS = 'discrete_inputs'
+HOLDING_REGISTERS = 'holding_registers'
+INPUT_REGISTERS = 'input_registers'
+
+function_code_to_table_map = {
+    READ_COILS: COILS,
+    WRITE_SINGLE_COIL: COILS,
+    WRITE_MULTIPLE_COILS: COILS,
+    READ_DISCRETE_INPUTS: DISCRETE_INPUTS,
+    READ_HOLDING_REGISTERS: HOLDING_REGISTERS,
+    WRITE_SINGLE_REGISTER: HOLDING_REGISTERS,
+    WRITE_MULTIPLE_REGISTERS: HOLDING_REGISTERS,
+    READ_INPUT_REGISTERS: INPUT_REGISTERS,
+}
+
+
+class SharedMemoryDataStore(object):
+    """ Data store with 4 tables in shared memory. The tables can be accessed
+    using the attributes :attr:`coils`, :attr:`discrete_inputs`,
+    :attr:`holding_registers` and :attr:`input_registers`. Each table is a
+    sequence indexed by address.
+
+    Registers are signed when :attr:`umodbus.conf.SIGNED_VALUES` is set at
+    the time the data store is created.
+
+    Reading or writing a single value is atomic. Writes of multiple values,
+    like those done by function code 15 and 16, are not. Use :attr:`lock`
+    when a group of values must be updated consistently.
+
+    :param coils: Number of coils, default 0.
+    :param discrete_inputs: Number of discrete inputs, default 0.
+    :param holding_registers: Number of holding registers, default 0.
+    :param input_registers: Number of input registers, default 0.
+    """
+    def __init__(self, coils=0, discrete_inputs=0, holding_registers=0,
+                 input_registers=0):
+        register_type = conf.TYPE_CHAR
+
+        self.coils = RawArray('B', coils)
+        self.discrete_inputs = RawArray('B', discrete_inputs)
+        self.holding_registers = RawArray(register_type, holding_registers)
+        self.input_registers = RawArray(register_type, input_registers)
+
+        self.lock = RLock()
+
+    def get_table(self, function_code):
+        """ Return table which is accessed by function code.
+
+        :param function_code: Function code.
+        :return: Table with values.
+        """
+        return getattr(self, function_code_to_table_map[function_code])
+
+    def read(self, slave_id, function_code, address):
+        """ Return value of address. This method can be used as endpoint for
+        routes of read requests.
+
+        :param slave_id: Slave id.
+        :param function_code: Function code.
+        :param address: Address.
+        :return: Value of address.
+        """
+        return self.get_table(function_code)[address]
+
+    def write(self, slave_id, function_code, address, value):
+        """ Set value of address. This method can be used as endpoint for
+        routes of write requests.
+
+        :param slave_id: Slave id.
+        :param function_code: Function code.
+        :param address: Address.
+        :param value: Value.
+        """
+        self.get_table(function_code)[address] = value
+
+    def bind_routes(self, server, slave_ids):
+        """ Add routes to route map of server for all addresses in data store.
+
+        :param server: Server with route map.
+        :param slave_ids: A list or set with slave id's.
+        """
+        for function_codes, table, endpoint in [
+                ([READ_COILS], self.coils, self.read),
+                ([WRITE_SINGLE_COIL, WRITE_MULTIPLE_COILS], self.coils,
+                 self.write),
+                ([READ_DISCRETE_INPUTS], self.discrete_inputs, self.read),
+                ([READ_HOLDING_REGISTERS], self.holding_registers, self.read),
+                ([WRITE_SINGLE_REGISTER, WRITE_MULTIPLE_REGISTERS],
+                 self.holding_registers, self.write),
+                ([READ_INPUT_REGISTERS], self.input_registers, self.read)]:
+            if len(table) == 0:
+                continue
+
+            server.route_map.add_rule(endpoint, slave_ids, function_codes,
+                                      range(len(table)))
@@ -0,0 +1,178 @@
+""" A gateway which forwards Modbus TCP/IP requests to Modbus RTU slaves.
+
+Every serial line serves a set of unit ids. Requests of all TCP connections
+for the same serial line are queued and send one after another by a
+:class:`umodbus.client.serial.bus.BusMaster`::
+
+    from serial import Serial
+
+    from umodbus.server.gateway import GatewayServer, RequestHandler
+
+    app = GatewayServer(('', 502), RequestHandler)
+    app.add_line(Serial('/dev/ttyS1', baudrate=19200, timeout=0.5),
+                 unit_ids=range(1, 11))
+    app.add_line(Serial('/dev/ttyS2', baudrate=9600, timeout=0.5),
+                 unit_ids=range(11, 21))
+
+    app.serve_forever()
+
+Responses of slaves, including exception responses, are forwarded
+unchanged. Requests for a unit id without serial line, or which wait longer
+than
+:attr:`GatewayServer.queue_timeout` for their line, are answered with
+:class:`umodbus.exceptions.GatewayPathUnavailableError`. Requests which
+aren't answered by the slave are answered with
+:class:`umodbus.exceptions.GatewayTargetDeviceFailedToRespondError`.
+
+"""
+import struct
+try:
+    from socketserver import TCPServer, ThreadingMixIn
+except ImportError:
+    from SocketServer import TCPServer, ThreadingMixIn
+
+from umodbus import log
+from umodbus.server import tcp
+from umodbus.client.serial import rtu
+from umodbus.client.serial.bus import BusMaster, DeadlineExceededError
+from umodbus.client.serial.redundancy_check import CRCError
+from umodbus.functions import create_function_from_request_pdu
+from umodbus.utils import (get_function_code_from_request_pdu,
+                           pack_exception_pdu)
+from umodbus.exceptions import (ModbusError, ServerDeviceFailureError,
+                                GatewayPathUnavailableError,
+                                GatewayTargetDeviceFailedToRespondError)
+
+
+class GatewayServer(ThreadingMixIn, TCPServer):
+    """ A :class:`socketserver.TCPServer` which handles every connection in
+    its own thread and forwards requests to serial lines.
+
+    """
+    daemon_threads = True
+
+    queue_timeout = 1
+    """ Max number of seconds a request waits for its serial line, None to
+    wait forever.
+    """
+
+    def __init__(self, server_address, request_handler_class,
+                 bind_and_activate=True):
+        TCPServer.__init__(self, server_address, request_handler_class,
+                           bind_and_activate)
+
+        self.lines = []
+        """ List with a :class:`umodbus.client.serial.bus.BusMaster` for
+        every serial line. Use it to read metrics of a line.
+        """
+
+        self._lines_by_unit_id = {}
+
+    @property
+    def queue_depths(self):
+        """ List with number of requests waiting for every serial line, in
+        order of :attr:`lines`.
+        """
+        return [line.queue_depth for line in self.lines]
+
+    def add_line(self, serial_port, unit_ids):
+        """ Forward requests for unit ids to serial port.
+
+        :param serial_port: Serial port instance. Its timeout is the time to
+            wait for a response of a slave.
+        :param unit_ids: Iterable with unit ids of slaves on the serial line.
+        :return: The :class:`umodbus.client.serial.bus.BusMaster` of the
+            serial line.
+        """
+        line = BusMaster(serial_port)
+        self.lines.append(line)
+
+        for unit_id in unit_ids:
+            self._lines_by_unit_id[unit_id] = line
+
+        return line
+
+    def get_line(self, unit_id):
+        """ Return :class:`umodbus.client.serial.bus.BusMaster` of serial line
+        serving unit id.
+
+        :param unit_id: Unit id.
+        :return: Instance of :class:`umodbus.client.serial.bus.BusMaster`.
+        :raises GatewayPathUnavailableError: When no serial line serves unit
+            id.
+        """
+        try:
+            return self._lines_by_unit_id[unit_id]
+        except KeyError:
+            raise GatewayPathUnavailableError()
+
+
+class RequestHandler(tcp.RequestHandler):
+    """ A subclass of :class:`umodbus.server.tcp.RequestHandler` which
+    forwards requests to the serial line of the server serving the unit id,
+    instead of executing a route.
+
+    """
+    def forward(self, unit_id, request_pdu):
+        """ Send request to slave and return its response PDU.
+
+        :param unit_id: Unit id.
+        :param request_pdu: A bytearray containing request PDU.
+        :return: A bytearray containing response PDU of slave, None for
+            broadcast requests.
+        :raises ModbusError: When line is unavailable or slave doesn't
+            respond.
+        """
+        line = self.server.get_line(unit_id)
+        request_adu = rtu.create_request_adu(unit_id, request_pdu)
+
+        try:
+            with line.acquire(timeout=self.server.queue_timeout) as \
+                    serial_port:
+                try:
+                    response_adu = rtu.send_request(request_adu,
+                                                    serial_port,
+                                                    metrics=line.metrics)
+                except (ValueError, CRCError, struct.error) as e:
+                    # Remainder of an invalid response would corrupt the
+                    # response of the next request.
+                    serial_port.reset_input_buffer()
+                    log.warning('Unit {0} failed to respond: {1!r}.'
+                                .format(unit_id, e))
+                    raise GatewayTargetDeviceFailedToRespondError()
+        except DeadlineExceededError:
+            raise GatewayPathUnavailableError()
+
+        if response_adu is None:
+            return None
+
+        return response_adu[1:-2]
+
+    def execute_route(self, meta_data, request_pdu):
+        """ Forward request to serial line and return response PDU.
+
+        :param meta_data: A dict with meta data. It must at least contain
+            key 'unit_id'.
+        :param request_pdu: A bytearray containing request PDU.
+        :return: A bytearray containing response PDU.
+        """
+        try:
+            # Requests for functions which aren't supported are answered
+            # without forwarding them.
+            function = create_function_from_request_pdu(request_pdu)
+            response_pdu = self.forward(meta_data['unit_id'], request_pdu)
+
+            if response_pdu is None:
+                # Slaves don't respond to broadcasts, which are writes.
+                return function.create_response_pdu()
+
+            return response_pdu
+        except ModbusError as e:
+            function_code = get_function_code_from_request_pdu(request_pdu)
+            return pack_exception_pdu(function_code, e.error_code)
+        except Exception as e:
+            log.exception('Could not forward request: {0}.'.format(e))
+            function_code = get_function_code_from_request_pdu(request_pdu)
+
+            return pack_exception_pdu(function_code,
+                                      ServerDeviceFailureError.error_code)
@@ -0,0 +1,191 @@
+""" A Modbus TCP server which handles requests in multiple processes.
+
+A single Python process serving Modbus TCP is bound to 1 CPU core.
+:class:`PreforkServer` forks a number of worker processes. Every worker binds
+its own listening socket to the same address using `SO_REUSEPORT`, the kernel
+distributes incoming connections over the workers. All workers share the
+route map of the server.
+
+Workers don't share memory, so routes which keep state should store it in
+shared memory, for example in a
+:class:`umodbus.server.data_store.SharedMemoryDataStore`::
+
+    from umodbus.server.data_store import SharedMemoryDataStore
+    from umodbus.server.prefork import PreforkServer
+    from umodbus.server.tcp import RequestHandler, get_server
+
+    app = get_server(PreforkServer, ('', 502), RequestHandler)
+    app.workers = 4
+
+    data_store = SharedMemoryDataStore(holding_registers=100)
+    data_store.bind_routes(app, slave_ids=[1])
+
+    try:
+        app.serve_forever()
+    finally:
+        app.shutdown()
+        app.server_close()
+
+.. note:: `SO_REUSEPORT` and :func:`os.fork` are only available on Unix-like
+    systems. Linux 3.9 or newer is required to balance connections over
+    workers.
+
+"""
+import os
+import errno
+import socket
+import signal
+from threading import Lock
+from multiprocessing import cpu_count
+try:
+    from socketserver import TCPServer, ThreadingMixIn
+except ImportError:
+    from SocketServer import TCPServer, ThreadingMixIn
+
+from umodbus import log
+
+
+def _enable_reuse_port(sock):
+    """ Set `SO_REUSEPORT` on socket.
+
+    :param sock: Socket instance.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+
+class ReusePortTCPServer(ThreadingMixIn, TCPServer):
+    """ A threading :class:`socketserver.TCPServer` which binds its socket
+    with `SO_REUSEPORT` set. Multiple instances can listen on the same
+    address.
+
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def server_bind(self):
+        _enable_reuse_port(self.socket)
+        TCPServer.server_bind(self)
+
+
+class PreforkServer(object):
+    """ Server which forks :attr:`workers` processes, each serving requests
+    using an instance of :attr:`worker_server_class`. The signature is equal
+    to the one of :class:`socketserver.TCPServer`, so the server can be
+    created with :func:`umodbus.server.tcp.get_server`.
+
+    On creation the server binds (but doesn't listen on) a socket to reserve
+    the address. If the port is 0 the port picked by the OS is used by all
+    workers. :attr:`server_address` contains the address workers listen on.
+
+    :param server_address: Tuple with host and port.
+    :param request_handler_class: (sub)Class of
+        :class:`umodbus.server.tcp.RequestHandler`.
+    """
+    workers = cpu_count()
+    """ Number of worker processes. Default is number of CPU's. """
+
+    worker_server_class = ReusePortTCPServer
+    """ (sub)Class of :class:`socketserver.TCPServer` used by workers. It must
+    set `SO_REUSEPORT` on its socket before binding.
+    """
+
+    address_family = socket.AF_INET
+
+    def __init__(self, server_address, request_handler_class):
+        self.RequestHandlerClass = request_handler_class
+        self.socket = socket.socket(self.address_family, socket.SOCK_STREAM)
+
+        try:
+            _enable_reuse_port(self.socket)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind(server_address)
+        except BaseException:
+            self.socket.close()
+            raise
+
+        self.server_address = self.socket.getsockname()
+        self._worker_pids = set()
+        # Guards _worker_pids and _shutdown_request, which are changed by
+        # the thread serving and the thread calling shutdown().
+        self._lock = Lock()
+        self._shutdown_request = False
+
+    def _spawn_worker(self):
+        """ Fork a worker process and return its pid, or None when shutdown
+        has been requested.
+        """
+        with self._lock:
+            if self._shutdown_request:
+                return None
+
+            pid = os.fork()
+
+            if pid != 0:
+                self._worker_pids.add(pid)
+                return pid
+
+        status = 0
+        try:
+            self.socket.close()
+            server = self.worker_server_class(self.server_address,
+                                              self.RequestHandlerClass)
+            server.route_map = self.route_map
+            server.serve_forever()
+        except BaseException:
+            # Nothing may escape from the worker into the code of the parent
+            # it was forked from, os._exit() below ends the worker.
+            log.exception('Worker {0} failed.'.format(os.getpid()))
+            status = 1
+        finally:
+            os._exit(status)
+
+    def serve_forever(self):
+        """ Fork workers and wait until :meth:`shutdown` is called. Workers
+        which die unexpectedly are replaced.
+
+        A :meth:`shutdown` called before this method makes it return
+        without forking workers.
+        """
+        try:
+            for _ in range(self.workers):
+                self._spawn_worker()
+
+            while self._worker_pids:
+                try:
+                    pid, status = os.wait()
+                except OSError as e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    if e.errno == errno.ECHILD:
+                        break
+                    raise
+
+                with self._lock:
+                    if pid not in self._worker_pids:
+                        continue
+
+                    self._worker_pids.discard(pid)
+
+                if not self._shutdown_request:
+                    log.error('Worker {0} exited with status {1}, starting '
+                              'a new one.'.format(pid, status))
+                    self._spawn_worker()
+        finally:
+            with self._lock:
+                self._shutdown_request = False
+
+    def shutdown(self):
+        """ Stop all workers and let :meth:`serve_forever` return. """
+        with self._lock:
+            self._shutdown_request = True
+
+            for pid in self._worker_pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError as e:
+                    if e.errno != errno.ESRCH:
+                        raise
+
+    def server_close(self):
+        """ Close socket which reserves the address. """
+        self.socket.close()
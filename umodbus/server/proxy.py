@@ -0,0 +1,373 @@
+""" A proxy which answers reads of many Modbus TCP/IP clients from a cache.
+
+Devices which handle only a few requests per second are easily overloaded
+when several HMI's and historians poll them. :class:`CachingProxy` keeps the
+values of address ranges in a cache. The ranges are refreshed by a single
+poller when they are older than their time to live, so the load on the device
+doesn't depend on the number of clients::
+
+    from threading import Thread
+    from socketserver import ThreadingTCPServer
+
+    from umodbus.server.tcp import get_server
+    from umodbus.server.proxy import CachingProxy, RequestHandler
+    from umodbus.functions import READ_HOLDING_REGISTERS
+
+    app = get_server(ThreadingTCPServer, ('', 502), RequestHandler)
+
+    proxy = CachingProxy(('192.168.1.20', 502))
+    proxy.add_range(slave_id=1, function_code=READ_HOLDING_REGISTERS,
+                    starting_address=0, quantity=100, ttl=1)
+    proxy.bind_routes(app)
+
+    Thread(target=proxy.poll_forever).start()
+    app.serve_forever()
+
+Reads of a range which is expired because the poller didn't refresh it yet
+are forwarded to the device, concurrent reads of the same range result in 1
+upstream request. All values a read takes from 1 range come from the same
+refresh. Reads of addresses outside the ranges are answered with
+:class:`umodbus.exceptions.IllegalDataAddressError`.
+
+Writes are forwarded to the device. Cached ranges touched by a write are
+expired, so the next read returns the written values.
+
+"""
+from threading import RLock, Event
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus import log
+from umodbus.client import tcp
+from umodbus.client.upstream import Upstream
+from umodbus.server import gateway
+from umodbus.server.data_store import function_code_to_table_map
+from umodbus.functions import (create_function_from_request_pdu, READ_COILS,
+                               READ_DISCRETE_INPUTS, READ_HOLDING_REGISTERS,
+                               READ_INPUT_REGISTERS, WRITE_SINGLE_COIL,
+                               WRITE_SINGLE_REGISTER, WRITE_MULTIPLE_COILS,
+                               WRITE_MULTIPLE_REGISTERS)
+from umodbus.exceptions import IllegalDataAddressError
+
+_read_functions = {
+    READ_COILS: tcp.read_coils,
+    READ_DISCRETE_INPUTS: tcp.read_discrete_inputs,
+    READ_HOLDING_REGISTERS: tcp.read_holding_registers,
+    READ_INPUT_REGISTERS: tcp.read_input_registers,
+}
+
+_write_function_codes = (WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
+                         WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS)
+
+
+class CachedRange(object):
+    """ Values of a range of addresses of a slave.
+
+    :param slave_id: Slave id.
+    :param function_code: Function code to read range with.
+    :param starting_address: First address of range.
+    :param quantity: Number of addresses in range.
+    :param ttl: Number of seconds values are fresh after they are read.
+    """
+    def __init__(self, slave_id, function_code, starting_address, quantity,
+                 ttl):
+        self.slave_id = slave_id
+        self.function_code = function_code
+        self.starting_address = starting_address
+        self.quantity = quantity
+        self.ttl = ttl
+
+        self.values = None
+        """ List with values, None if range has never been read. """
+
+        self.updated = None
+        """ Time values were read as returned by `monotonic()`, None if
+        values are expired.
+        """
+
+    @property
+    def fresh(self):
+        """ True if values are younger than their time to live. """
+        return self.updated is not None and \
+            monotonic() - self.updated < self.ttl
+
+    def overlaps(self, slave_id, table, starting_address, quantity):
+        """ Return True if range shares addresses with given range.
+
+        :param slave_id: Slave id.
+        :param table: Table of range, see
+            :data:`umodbus.server.data_store.function_code_to_table_map`.
+        :param starting_address: First address of range.
+        :param quantity: Number of addresses in range.
+        """
+        return slave_id == self.slave_id and \
+            table == function_code_to_table_map[self.function_code] and \
+            starting_address < self.starting_address + self.quantity and \
+            self.starting_address < starting_address + quantity
+
+
+class CachingProxy(object):
+    """ Cache of ranges of a Modbus TCP/IP device. All requests to the device
+    are send over 1 :class:`umodbus.client.upstream.Upstream` connection.
+
+    :param upstream_address: Tuple with host and port of device.
+    :param timeout: Number of seconds to wait for device.
+    """
+    def __init__(self, upstream_address, timeout=1):
+        self.upstream = Upstream(upstream_address, timeout)
+        """ Instance of :class:`umodbus.client.upstream.Upstream`. """
+
+        self.ranges = []
+        """ List with instances of :class:`CachedRange`. """
+
+        self.hits = 0
+        """ Number of times values of a range were read from cache. """
+
+        self.errors = 0
+        """ Number of refreshes by :meth:`poll` which failed. """
+
+        self.misses = 0
+        """ Number of times a read had to wait for an expired range to be
+        refreshed.
+        """
+
+        self._lock = RLock()
+        self._shutdown_request = Event()
+
+    @property
+    def upstream_requests(self):
+        """ Number of requests send to device. """
+        return self.upstream.requests
+
+    def add_range(self, slave_id, function_code, starting_address, quantity,
+                  ttl):
+        """ Cache range. Ranges must not overlap.
+
+        :param slave_id: Slave id.
+        :param function_code: Function code to read range with, 1, 2, 3 or
+            4.
+        :param starting_address: First address of range.
+        :param quantity: Number of addresses in range. It must fit in 1
+            request.
+        :param ttl: Number of seconds values are fresh after they are read,
+            must be greater than 0.
+        :return: Instance of :class:`CachedRange`.
+        """
+        if function_code not in _read_functions:
+            raise ValueError('Function code {0} doesn\'t read.'
+                             .format(function_code))
+
+        if ttl <= 0:
+            raise ValueError('Time to live must be greater than 0, not {0}.'
+                             .format(ttl))
+
+        cached_range = CachedRange(slave_id, function_code, starting_address,
+                                   quantity, ttl)
+        self.ranges.append(cached_range)
+
+        return cached_range
+
+    def bind_routes(self, server):
+        """ Add routes to route map of server for all cached ranges and let
+        :class:`RequestHandler` of server forward requests to this proxy.
+
+        Routes are executed per address, so values of a read answered using
+        the route map might come from different refreshes.
+        :class:`RequestHandler` answers reads using :meth:`read` instead.
+
+        :param server: Server with route map.
+        """
+        server.proxy = self
+
+        for cached_range in self.ranges:
+            server.route_map.add_rule(
+                self._create_endpoint(cached_range), [cached_range.slave_id],
+                [cached_range.function_code],
+                range(cached_range.starting_address,
+                      cached_range.starting_address + cached_range.quantity))
+
+    def _create_endpoint(self, cached_range):
+        def read(slave_id, function_code, address):
+            return self.get_values(cached_range)[
+                address - cached_range.starting_address]
+
+        return read
+
+    def refresh(self, cached_range):
+        """ Read values of range from device.
+
+        :param cached_range: Instance of :class:`CachedRange`.
+        """
+        with self._lock:
+            cached_range.values = self.upstream.send_message(
+                _read_functions[cached_range.function_code](
+                    cached_range.slave_id, cached_range.starting_address,
+                    cached_range.quantity))
+            cached_range.updated = monotonic()
+
+    def get_values(self, cached_range):
+        """ Return values of range, refresh them first if they are expired.
+
+        :param cached_range: Instance of :class:`CachedRange`.
+        :return: List with values.
+        """
+        if cached_range.fresh:
+            self.hits += 1
+            return cached_range.values
+
+        with self._lock:
+            # Range might have been refreshed while waiting for the lock.
+            if not cached_range.fresh:
+                self.misses += 1
+                self.refresh(cached_range)
+
+            return cached_range.values
+
+    def read(self, slave_id, function_code, starting_address, quantity):
+        """ Return values of addresses. Values of 1 range are taken from the
+        same refresh, expired ranges are refreshed first.
+
+        :param slave_id: Slave id.
+        :param function_code: Function code of read.
+        :param starting_address: First address to read.
+        :param quantity: Number of addresses to read.
+        :return: List with values.
+        :raises IllegalDataAddressError: When not all addresses are cached.
+        """
+        values = []
+        address = starting_address
+        end = starting_address + quantity
+
+        while address < end:
+            cached_range = self._get_range(slave_id, function_code, address)
+
+            if cached_range is None:
+                raise IllegalDataAddressError()
+
+            offset = address - cached_range.starting_address
+            size = min(end - address, cached_range.quantity - offset)
+            values.extend(
+                self.get_values(cached_range)[offset:offset + size])
+            address += size
+
+        return values
+
+    def _get_range(self, slave_id, function_code, address):
+        """ Return cached range containing address, None if there's none.
+        """
+        for cached_range in self.ranges:
+            if cached_range.slave_id == slave_id and \
+                    cached_range.function_code == function_code and \
+                    0 <= address - cached_range.starting_address < \
+                    cached_range.quantity:
+                return cached_range
+
+        return None
+
+    def write(self, slave_id, request_pdu):
+        """ Forward write request to device and expire the cached ranges it
+        touches.
+
+        :param slave_id: Slave id.
+        :param request_pdu: A bytearray containing request PDU.
+        :return: A bytearray containing response PDU of device.
+        """
+        function = create_function_from_request_pdu(request_pdu)
+
+        try:
+            starting_address = function.address
+            quantity = 1
+        except AttributeError:
+            starting_address = function.starting_address
+            quantity = len(function.values)
+
+        table = function_code_to_table_map[function.function_code]
+
+        with self._lock:
+            try:
+                return self.upstream.send_request(
+                    tcp._create_request_adu(slave_id, request_pdu))[7:]
+            finally:
+                # Also when write failed, it might have been executed.
+                for cached_range in self.ranges:
+                    if cached_range.overlaps(slave_id, table,
+                                             starting_address, quantity):
+                        cached_range.updated = None
+
+    def poll(self):
+        """ Refresh all expired ranges.
+
+        A failing range doesn't stop the other ranges from being refreshed.
+
+        :return: Number of seconds until the first range expires, None if no
+            range is fresh.
+        """
+        for cached_range in self.ranges:
+            if cached_range.fresh:
+                continue
+
+            try:
+                self.refresh(cached_range)
+            except Exception as e:
+                self.errors += 1
+                log.warning('Refreshing {0} values of slave {1} from address '
+                            '{2} failed: {3!r}.'.format(
+                                cached_range.quantity, cached_range.slave_id,
+                                cached_range.starting_address, e))
+
+        timeouts = [cached_range.updated + cached_range.ttl - monotonic()
+                    for cached_range in self.ranges if cached_range.fresh]
+
+        if not timeouts:
+            return None
+
+        return min(timeouts)
+
+    def poll_forever(self, poll_interval=0.5):
+        """ Refresh expired ranges until :meth:`shutdown` is called.
+
+        :param poll_interval: Max number of seconds between checks for a
+            shutdown request, also the time to wait before retrying when the
+            device fails.
+        """
+        while not self._shutdown_request.is_set():
+            timeout = self.poll()
+
+            if timeout is None:
+                timeout = poll_interval
+
+            self._shutdown_request.wait(min(timeout, poll_interval))
+
+    def shutdown(self):
+        """ Stop :meth:`poll_forever` and close connection with device. """
+        self._shutdown_request.set()
+        self.close()
+
+    def close(self):
+        """ Close connection with device. """
+        self.upstream.close()
+
+
+class RequestHandler(gateway.RequestHandler):
+    """ A subclass of :class:`umodbus.server.tcp.RequestHandler` which
+    answers reads from the cache of the :class:`CachingProxy` bound to the
+    server and forwards writes to it.
+
+    """
+    def forward(self, unit_id, request_pdu):
+        """ Read values from cache or forward write request to device.
+
+        :param unit_id: Unit id.
+        :param request_pdu: A bytearray containing request PDU.
+        :return: A bytearray containing response PDU.
+        """
+        function = create_function_from_request_pdu(request_pdu)
+
+        if function.function_code in _write_function_codes:
+            return self.server.proxy.write(unit_id, request_pdu)
+
+        return function.create_response_pdu(self.server.proxy.read(
+            unit_id, function.function_code, function.starting_address,
+            function.quantity))
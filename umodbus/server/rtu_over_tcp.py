@@ -0,0 +1,101 @@
+""" A server which receives Modbus RTU frames over TCP connections.
+
+The server behaves like a serial to Ethernet converter with an RTU slave
+behind it. Create it with :func:`umodbus.server.tcp.get_server`::
+
+    from socketserver import TCPServer
+
+    from umodbus.server.tcp import get_server
+    from umodbus.server.rtu_over_tcp import RequestHandler
+
+    app = get_server(TCPServer, ('', 4001), RequestHandler)
+
+    @app.route(slave_ids=[1], function_codes=[3], addresses=list(range(10)))
+    def read_data_store(slave_id, function_code, address):
+        return 0
+
+    app.serve_forever()
+
+Frames are delimited by their expected size, see
+:class:`umodbus.serial_framer.RTUFramer`. TCP has no silent interval,
+so requests with an unknown function code can't be delimited and are
+discarded instead of answered.
+
+"""
+import struct
+
+from umodbus.server import AbstractRequestHandler, execute_broadcast
+from umodbus.serial_framer import RTUFramer
+from umodbus.client.serial.rtu import BROADCAST_ADDRESS
+from umodbus.client.serial.redundancy_check import get_crc
+
+
+class RequestHandler(AbstractRequestHandler):
+    """ A subclass of :class:`socketserver.BaseRequestHandler` dispatching
+    incoming Modbus RTU requests using the server's :attr:`route_map`.
+
+    """
+    def setup(self):
+        """ Prepare handling of connection. """
+        AbstractRequestHandler.setup(self)
+        self.framer = RTUFramer()
+
+    def feed(self, data):
+        """ Pass data received from client to framer and return the request
+        ADU's which are complete. Their CRC has been validated already.
+
+        :param data: Bytes received from client.
+        :return: List with request ADU's.
+        """
+        return self.framer.feed(data)
+
+    def process(self, request_adu):
+        """ Process request ADU and return response. Broadcast requests are
+        executed, but not responded to.
+
+        :param request_adu: A bytearray containing the ADU request.
+        :return: A bytearray containing the response of the ADU request,
+            empty for broadcast requests.
+        """
+        if self.get_meta_data(request_adu)['unit_id'] == BROADCAST_ADDRESS:
+            self.process_broadcast(request_adu)
+            return b''
+
+        return AbstractRequestHandler.process(self, request_adu)
+
+    def process_broadcast(self, request_adu):
+        """ Execute broadcast write request once for every slave id in the
+        route map, see :func:`umodbus.server.execute_broadcast`.
+
+        :param request_adu: A bytearray containing the ADU request.
+        """
+        execute_broadcast(self, self.server.route_map, request_adu)
+
+    def get_meta_data(self, request_adu):
+        """" Extract address field from request ADU and return it. The dict
+        has 1 key: unit_id.
+
+        :param request_adu: A bytearray containing request ADU.
+        :return: Dict with meta data of request.
+        """
+        return {
+            'unit_id': struct.unpack('>B', request_adu[:1])[0],
+        }
+
+    def get_request_pdu(self, request_adu):
+        """ Extract PDU from request ADU and return it.
+
+        :param request_adu: A bytearray containing request ADU.
+        :return: An bytearray container request PDU.
+        """
+        return request_adu[1:-2]
+
+    def create_response_adu(self, meta_data, response_pdu):
+        """ Build response ADU from meta data and response PDU and return it.
+
+        :param meta_data: A dict with meta data.
+        :param request_pdu: A bytearray containing request PDU.
+        :return: A bytearray containing request ADU.
+        """
+        first_part_adu = struct.pack('>B', meta_data['unit_id']) + response_pdu
+        return first_part_adu + get_crc(first_part_adu)
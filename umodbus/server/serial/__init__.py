@@ -1,5 +1,5 @@
 import struct
-from binascii import hexlify
+import logging
 from types import MethodType
 from serial import SerialTimeoutException
 
@@ -9,7 +9,7 @@ from umodbus.server import route
 from umodbus.functions import create_function_from_request_pdu
 from umodbus.exceptions import ModbusError, ServerDeviceFailureError
 from umodbus.utils import (get_function_code_from_request_pdu,
-                           pack_exception_pdu)
+                           pack_exception_pdu, log_frame)
 from umodbus.client.serial.redundancy_check import CRCError
 
 
@@ -99,13 +99,12 @@ class AbstractSerialServer(object):
             results =\
                 function.execute(meta_data['unit_id'], self.route_map)
 
-            try:
-                # ReadFunction's use results of callbacks to build response
-                # PDU...
+            # Read functions use results of callbacks to build response PDU,
+            # other functions don't.
+            if function.produces_data:
                 return function.create_response_pdu(results)
-            except TypeError:
-                # ...other functions don't.
-                return function.create_response_pdu()
+
+            return function.create_response_pdu()
         except ModbusError as e:
             function_code = get_function_code_from_request_pdu(request_pdu)
             return pack_exception_pdu(function_code, e.error_code)
@@ -121,7 +120,7 @@ class AbstractSerialServer(object):
 
         :param response_adu: A bytearray containing the response of an ADU.
         """
-        log.debug('--> {0}'.format(hexlify(response_adu)))
+        log_frame(logging.DEBUG, '--> {frame}', response_adu)
         self.serial_port.write(response_adu)
 
     def shutdown(self):
@@ -0,0 +1,56 @@
+""" Modbus RTU server for :mod:`asyncio` applications.
+
+:class:`AsyncRTUServer` handles requests like
+:class:`umodbus.server.serial.rtu.RTUServer` does, but waits for data without
+blocking the event loop::
+
+    import asyncio
+    from serial import Serial
+
+    from umodbus.server.serial import get_server
+    from umodbus.server.serial.async_rtu import AsyncRTUServer
+
+    app = get_server(AsyncRTUServer, Serial('/dev/ttyS1', baudrate=19200))
+
+    @app.route(slave_ids=[1], function_codes=[3], addresses=list(range(10)))
+    def read_data_store(slave_id, function_code, address):
+        return 0
+
+    asyncio.get_event_loop().run_until_complete(app.serve_forever())
+
+Routes are called from the event loop, so they should return quickly.
+
+.. note:: This module requires Python 3.5 or newer.
+
+"""
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus.server.serial.multiport import SerialLine
+from umodbus.client.serial.async_rtu import wait_for_data
+
+
+class AsyncRTUServer(SerialLine):
+    """ RTU server which serves 1 serial port from an :mod:`asyncio` event
+    loop. The serial port is read without blocking.
+    """
+    async def serve_forever(self, poll_interval=0.5):
+        """ Wait for incoming requests until :meth:`shutdown` is called.
+
+        :param poll_interval: Max number of seconds between checks for a
+            shutdown request.
+        """
+        while not self._shutdown_request:
+            timeout = poll_interval
+
+            if self.deadline is not None:
+                timeout = max(0, min(self.deadline - monotonic(),
+                                     poll_interval))
+
+            if await wait_for_data(self.serial_port, timeout):
+                self.receive()
+
+            if self.deadline is not None and self.deadline <= monotonic():
+                self.silence()
@@ -0,0 +1,205 @@
+""" Serve Modbus RTU on multiple serial ports from 1 thread.
+
+:meth:`umodbus.server.serial.AbstractSerialServer.serve_forever` blocks on a
+single serial port. :class:`MultiPortRTUServer` waits for data on all its
+serial ports at once. Every serial port has its own
+:class:`umodbus.server.serial.rtu.RTUServer` with its own framer and timing,
+all share the route map of the :class:`MultiPortRTUServer`. Create the server
+with :func:`get_server`::
+
+    from serial import Serial
+
+    from umodbus.server.serial.multiport import MultiPortRTUServer, get_server
+
+    app = get_server(MultiPortRTUServer,
+                     [Serial('/dev/ttyS{0}'.format(i), baudrate=19200)
+                      for i in range(8)])
+
+    @app.route(slave_ids=[1], function_codes=[3], addresses=list(range(10)))
+    def read_data_store(slave_id, function_code, address):
+        return 0
+
+    try:
+        app.serve_forever()
+    finally:
+        app.shutdown()
+
+Data is read as soon as it arrives. A frame is completed when its expected
+size has been received or when the serial port has been silent for 3.5
+characters, see :class:`umodbus.serial_framer.RTUFramer`.
+
+.. note:: Serial ports must have a file descriptor, so URL handlers like
+    `loop://` are not supported.
+
+"""
+import struct
+from types import MethodType
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from umodbus import log
+from umodbus.route import Map
+from umodbus.server import route
+from umodbus.utils import wait_readable
+from umodbus.server.serial.rtu import RTUServer
+from umodbus.client.serial.rtu import get_silent_interval
+from umodbus.client.serial.redundancy_check import CRCError
+
+
+class SerialLine(RTUServer):
+    """ RTU server for 1 serial port of a :class:`MultiPortRTUServer`. The
+    serial port is read without blocking.
+    """
+    def __init__(self):
+        super(SerialLine, self).__init__()
+
+        self.last_activity = None
+        """ Time last byte was received, None when nothing is buffered. """
+
+    @property
+    def serial_port(self):
+        return self._serial_port
+
+    @serial_port.setter
+    def serial_port(self, serial_port):
+        serial_port.timeout = 0
+        self.metrics.baudrate = serial_port.baudrate
+        self.silent_interval = get_silent_interval(serial_port.baudrate)
+        self._serial_port = serial_port
+
+    @property
+    def deadline(self):
+        """ Time at which the line is silent long enough to end the frame
+        being received. None if no frame is being received.
+        """
+        if self.last_activity is None:
+            return None
+
+        return self.last_activity + self.silent_interval
+
+    def receive(self):
+        """ Read available bytes and handle requests which are complete. """
+        data = self.serial_port.read(max(1, self.serial_port.in_waiting))
+
+        if len(data) == 0:
+            return
+
+        self._handle_requests(self.feed(data))
+        self.last_activity = monotonic() if self.framer.receiving else None
+
+    def silence(self):
+        """ Handle line becoming silent. """
+        self.last_activity = None
+        self._handle_requests(self.framer.flush())
+
+    def _handle_requests(self, request_adus):
+        """ Handle requests and log errors, like
+        :meth:`umodbus.server.serial.AbstractSerialServer.serve_forever`
+        does.
+        """
+        try:
+            self.handle_requests(request_adus)
+        except (CRCError, struct.error) as e:
+            log.error('Can\'t handle request: {0}'.format(e))
+        except ValueError:
+            pass
+
+
+def get_server(server_class, serial_ports):
+    """ Return instance of :param:`server_class` serving the serial ports.
+    This method also binds a :func:`route` method to the server instance.
+
+    :param server_class: (sub)Class of :class:`MultiPortRTUServer`.
+    :param serial_ports: List with serial port instances.
+    :return: Instance of :param:`server_class`.
+    """
+    s = server_class()
+    s.serial_ports = serial_ports
+
+    s.route_map = Map()
+    s.route = MethodType(route, s)
+
+    return s
+
+
+class MultiPortRTUServer(object):
+    """ RTU server which serves multiple serial ports. Use :func:`get_server`
+    to create it.
+
+    """
+    _shutdown_request = False
+
+    line_class = SerialLine
+    """ (sub)Class of :class:`SerialLine` used for every serial port. """
+
+    def __init__(self):
+        self.lines = []
+        self._route_map = None
+
+    @property
+    def route_map(self):
+        return self._route_map
+
+    @route_map.setter
+    def route_map(self, route_map):
+        """ Share route map with all lines. """
+        self._route_map = route_map
+
+        for line in self.lines:
+            line.route_map = route_map
+
+    @property
+    def serial_ports(self):
+        """ List with serial ports. """
+        return [line.serial_port for line in self.lines]
+
+    @serial_ports.setter
+    def serial_ports(self, serial_ports):
+        self.lines = []
+
+        for serial_port in serial_ports:
+            self.add_serial_port(serial_port)
+
+    def add_serial_port(self, serial_port):
+        """ Serve serial port.
+
+        :param serial_port: Serial port instance.
+        :return: The :class:`SerialLine` serving the port.
+        """
+        line = self.line_class()
+        line.serial_port = serial_port
+        line.route_map = self.route_map
+        self.lines.append(line)
+
+        return line
+
+    def serve_forever(self, poll_interval=0.5):
+        """ Wait for incoming requests on all serial ports until
+        :meth:`shutdown` is called.
+
+        :param poll_interval: Max number of seconds between checks for a
+            shutdown request.
+        """
+        lines = dict((line.serial_port, line) for line in self.lines)
+
+        while not self._shutdown_request:
+            deadlines = [line.deadline for line in self.lines
+                         if line.deadline is not None]
+            timeout = poll_interval
+
+            if deadlines:
+                timeout = max(0, min(min(deadlines) - monotonic(),
+                                     poll_interval))
+
+            for serial_port in wait_readable(lines, timeout):
+                lines[serial_port].receive()
+
+            now = monotonic()
+            for line in self.lines:
+                if line.deadline is not None and line.deadline <= now:
+                    line.silence()
+
+    def shutdown(self):
+        self._shutdown_request = True
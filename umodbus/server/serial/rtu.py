@@ -1,36 +1,32 @@
-from __future__ import division
 import struct
-from binascii import hexlify
+import logging
 
-from umodbus import log
+from umodbus.utils import log_frame
+from umodbus.server import execute_broadcast
 from umodbus.server.serial import AbstractSerialServer
+from umodbus.serial_framer import RTUFramer
+from umodbus.client.serial.metrics import LinkMetrics
+from umodbus.client.serial.rtu import get_char_size, BROADCAST_ADDRESS
 from umodbus.client.serial.redundancy_check import get_crc, validate_crc
 
 
-def get_char_size(baudrate):
-    """ Get the size of 1 character in seconds.
-
-    From the implementation guide:
-
-        "The implementation of RTU reception driver may imply the management of
-        a lot of interruptions due to the t 1.5  and t 3.5  timers. With high
-
-        communication baud rates, this leads to a heavy CPU load. Consequently
-        these two timers must be strictly respected when the baud rate is equal
-        or lower than 19200 Bps. For baud rates greater than 19200 Bps, fixed
-        values for the 2 timers should be used:  it is recommended to use a
-        value of 750us for the inter-character time-out (t 1.5) and a value of
-        1.750ms for inter-frame delay (t 3.5)."
-    """
-    if baudrate <= 19200:
-        # One frame is 11 bits.
-        return 11 / baudrate
+class RTUServer(AbstractSerialServer):
+    def __init__(self):
+        self.framer = RTUFramer()
+        self.metrics = LinkMetrics()
 
-    # 750 us / 1.5 = 500 us or 0.0005 s.
-    return 0.0005
+    @property
+    def route_map(self):
+        return self._route_map
 
+    @route_map.setter
+    def route_map(self, route_map):
+        """ Let framer ignore frames for slave id's which aren't in route
+        map, without calculating their CRC.
+        """
+        self.framer.slave_ids = getattr(route_map, 'slave_ids', None)
+        self._route_map = route_map
 
-class RTUServer(AbstractSerialServer):
     @property
     def serial_port(self):
         return self._serial_port
@@ -43,19 +39,72 @@ class RTUServer(AbstractSerialServer):
         # See docstring of get_char_size() for meaning of constants below.
         serial_port.inter_byte_timeout = 1.5 * char_size
         serial_port.timeout = 3.5 * char_size
+        self.metrics.baudrate = serial_port.baudrate
         self._serial_port = serial_port
 
     def serve_once(self):
-        """ Listen and handle 1 request. """
-        # 256 is the maximum size of a Modbus RTU frame.
-        request_adu = self.serial_port.read(256)
-        log.debug('<-- {0}'.format(hexlify(request_adu)))
+        """ Listen and handle requests which are complete.
+
+        Only the bytes needed to complete the frame being received are read.
+        Frames are recognized by their size, so frames which arrive back to
+        back or which are split over multiple reads are handled correctly.
+        """
+        data = self.serial_port.read(max(self.framer.missing,
+                                         self.serial_port.in_waiting))
+
+        if len(data) == 0:
+            # The line is silent, the frame being received won't be continued.
+            request_adus = self.framer.flush()
+
+            if not request_adus:
+                raise ValueError
+        else:
+            request_adus = self.feed(data)
+
+        self.handle_requests(request_adus)
+
+    def feed(self, data):
+        """ Pass received bytes to framer and return requests which are
+        complete. Updates :attr:`metrics`.
+
+        :param data: Byte array.
+        :return: List with request ADU's.
+        """
+        crc_errors = self.framer.crc_errors
+        request_adus = self.framer.feed(data)
 
-        if len(request_adu) == 0:
-            raise ValueError
+        self.metrics.bytes_in += len(data)
+        self.metrics.crc_errors += self.framer.crc_errors - crc_errors
 
-        response_adu = self.process(request_adu)
-        self.respond(response_adu)
+        return request_adus
+
+    def handle_requests(self, request_adus):
+        """ Handle requests and respond to them.
+
+        :param request_adus: List with request ADU's of which the CRC has
+            been validated, as returned by :class:`RTUFramer`.
+        """
+        for request_adu in request_adus:
+            log_frame(logging.DEBUG, '<-- {frame}', request_adu)
+            self.metrics.frames_in += 1
+
+            if self.get_meta_data(request_adu)['unit_id'] == \
+                    BROADCAST_ADDRESS:
+                self.process_broadcast(request_adu)
+                continue
+
+            # The framer has validated the CRC of the request already.
+            response_adu = super(RTUServer, self).process(request_adu)
+            self.respond(response_adu)
+
+    def process_broadcast(self, request_adu):
+        """ Execute broadcast write request once for every slave id in the
+        route map, see :func:`umodbus.server.execute_broadcast`.
+
+        :param request_adu: A bytearray containing the ADU request.
+        """
+        # The framer has validated the CRC of the request already.
+        execute_broadcast(self, self.route_map, request_adu)
 
     def process(self, request_adu):
         """ Process request ADU and return response.
@@ -66,6 +115,18 @@ class RTUServer(AbstractSerialServer):
         validate_crc(request_adu)
         return super(RTUServer, self).process(request_adu)
 
+    def respond(self, response_adu):
+        """ Send response ADU back to client and update :attr:`metrics`.
+
+        :param response_adu: A bytearray containing the response of an ADU.
+        """
+        self.metrics.frame_sent(response_adu)
+
+        if struct.unpack('>B', response_adu[1:2])[0] & 0x80:
+            self.metrics.exception_responses += 1
+
+        super(RTUServer, self).respond(response_adu)
+
     def create_response_adu(self, meta_data, response_pdu):
         """ Build response ADU from meta data and response PDU and return it.
 
@@ -1,10 +1,24 @@
 import struct
+import socket
+from threading import Thread, Lock
 from types import MethodType
+try:
+    from socketserver import TCPServer
+    from queue import Queue, Empty, Full
+except ImportError:
+    from SocketServer import TCPServer
+    from Queue import Queue, Empty, Full
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
 
+from umodbus import log
 from umodbus.route import Map
 from umodbus.server import AbstractRequestHandler, route
-from umodbus.utils import unpack_mbap, pack_mbap
-from umodbus.exceptions import ServerDeviceFailureError
+from umodbus.utils import (unpack_mbap, pack_mbap, pack_exception_pdu,
+                           get_function_code_from_request_pdu, wait_readable)
+from umodbus.exceptions import ServerDeviceFailureError, ServerDeviceBusyError
 
 
 def get_server(server_class, server_address, request_handler_class):
@@ -74,3 +88,285 @@ class RequestHandler(AbstractRequestHandler):
         )
 
         return response_mbap + response_pdu
+
+
+class ThreadPoolTCPServer(TCPServer):
+    """ A :class:`socketserver.TCPServer` which executes requests using a
+    fixed number of worker threads.
+
+    A single thread reads requests from all connections and puts them in a
+    queue of at most :attr:`max_queue_size` requests. Idle workers take
+    requests from this queue, so a connection only occupies a worker while
+    its request is executed and a client which keeps its connection open
+    doesn't block other clients.
+
+    A request is answered with exception code 6,
+    :class:`umodbus.exceptions.ServerDeviceBusyError`, when the queue is full
+    or when it waited longer than :attr:`max_queue_time` for a worker. This
+    protects the server and the clients already connected against request
+    and connection storms.
+
+    Requests of a connection are executed in order. No data is read from a
+    connection while it has a request in the queue or in a worker, requests
+    pipelined in the meantime are read together afterwards and take 1 place
+    in the queue.
+
+        >>> server = get_server(ThreadPoolTCPServer, ('localhost', 502),
+        ...                     RequestHandler)
+        >>> server.serve_forever()
+
+    """
+    pool_size = 8
+    """ Number of worker threads. """
+
+    max_queue_size = 64
+    """ Maximum number of requests waiting for a worker. """
+
+    max_queue_time = 1
+    """ Maximum number of seconds a request waits for a worker. A client has
+    likely given up on a request which waited longer.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, request_handler_class,
+                 bind_and_activate=True):
+        TCPServer.__init__(self, server_address, request_handler_class,
+                           bind_and_activate)
+        self._queue = Queue(self.max_queue_size)
+        self._workers = []
+        self._reader = None
+        self._closed = False
+
+        # Dict with socket as key and request handler as value for every
+        # open connection, and set with sockets of connections which are
+        # read by the reader thread. Other connections are owned by a worker.
+        self._connections = {}
+        self._readable = set()
+        self._lock = Lock()
+
+        # The reader thread waits for data on this socket too, so it can be
+        # woken up when a connection must be read.
+        self._wake_up_receiver, self._wake_up_sender = socket.socketpair()
+        self._wake_up_sender.setblocking(False)
+
+        self.shed_requests = 0
+        """ Number of requests answered with a
+        :class:`umodbus.exceptions.ServerDeviceBusyError`.
+        """
+
+    @property
+    def queue_depth(self):
+        """ Number of requests waiting for a worker. """
+        return self._queue.qsize()
+
+    def _start_threads(self):
+        # Instances of this class are used by workers to process requests.
+        # The connection is read by the reader thread, so the instance must
+        # not handle the connection itself.
+        class Handler(self.RequestHandlerClass):
+            def handle(self):
+                pass
+
+        self._handler_class = Handler
+
+        self._reader = Thread(target=self._read_forever)
+        self._reader.daemon = True
+        self._reader.start()
+
+        for _ in range(self.pool_size):
+            t = Thread(target=self._work)
+            t.daemon = self.daemon_threads
+            t.start()
+
+            self._workers.append(t)
+
+    def _wake_up(self):
+        try:
+            self._wake_up_sender.send(b'\x00')
+        except socket.error:
+            # Buffer is full, so reader will wake up anyway.
+            pass
+
+    def _read_forever(self):
+        """ Read requests from connections and queue them until server is
+        closed.
+        """
+        while not self._closed:
+            with self._lock:
+                socks = list(self._readable)
+
+            try:
+                readable = wait_readable(socks + [self._wake_up_receiver])
+            except Exception:
+                if self._closed:
+                    return
+                raise
+
+            for sock in readable:
+                if sock is self._wake_up_receiver:
+                    self._wake_up_receiver.recv(4096)
+                    continue
+
+                self._read(sock)
+
+    def _read(self, sock):
+        """ Read data from connection and queue requests which are complete.
+        Connections which are closed by the client or send invalid data are
+        closed.
+        """
+        handler = self._connections[sock]
+
+        try:
+            data = sock.recv(handler.recv_size)
+            request_adus = handler.feed(data) if data else None
+        except (socket.error, ValueError):
+            request_adus = None
+
+        if request_adus is None:
+            return self._close_connection(sock)
+
+        if not request_adus:
+            return
+
+        # A worker might be done with the request before put_nowait()
+        # returns, so stop reading before.
+        with self._lock:
+            self._readable.discard(sock)
+
+        try:
+            self._queue.put_nowait((handler, request_adus, monotonic()))
+            return
+        except Full:
+            pass
+
+        timeout = sock.gettimeout()
+
+        try:
+            # Don't let a client which doesn't read its responses block the
+            # reader thread.
+            sock.setblocking(False)
+            self.shed_request(handler, request_adus)
+            sock.settimeout(timeout)
+        except socket.error:
+            return self._close_connection(sock)
+
+        with self._lock:
+            self._readable.add(sock)
+
+    def _work(self):
+        """ Execute requests from queue until None is received. """
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                return
+
+            handler, request_adus, queued = item
+
+            try:
+                if monotonic() - queued > self.max_queue_time:
+                    self.shed_request(handler, request_adus)
+                else:
+                    response_adus = b''.join(
+                        [handler.process(request_adu)
+                         for request_adu in request_adus])
+
+                    if response_adus:
+                        handler.respond(response_adus)
+            except socket.error:
+                self._close_connection(handler.request)
+                continue
+            except Exception:
+                log.exception('Error while handling request of {0}.'
+                              .format(handler.client_address[0]))
+                self._close_connection(handler.request)
+                continue
+
+            with self._lock:
+                if handler.request in self._connections:
+                    self._readable.add(handler.request)
+
+            self._wake_up()
+
+    def _close_connection(self, sock):
+        with self._lock:
+            self._connections.pop(sock, None)
+            self._readable.discard(sock)
+
+        self.shutdown_request(sock)
+
+    def process_request(self, request, client_address):
+        """ Let reader thread read requests from connection. """
+        if self._reader is None:
+            self._start_threads()
+
+        handler = self._handler_class(request, client_address, self)
+
+        with self._lock:
+            self._connections[request] = handler
+            self._readable.add(request)
+
+        self._wake_up()
+
+    def shed_request(self, handler, request_adus):
+        """ Respond to requests with a
+        :class:`umodbus.exceptions.ServerDeviceBusyError`.
+
+        :param handler: Request handler of connection.
+        :param request_adus: List with request ADU's.
+        """
+        with self._lock:
+            self.shed_requests += len(request_adus)
+
+        log.warning('Server is busy, refusing {0} request(s) of {1}.'
+                    .format(len(request_adus), handler.client_address[0]))
+
+        handler.respond(b''.join([
+            handler.create_response_adu(
+                handler.get_meta_data(request_adu),
+                pack_exception_pdu(
+                    get_function_code_from_request_pdu(
+                        handler.get_request_pdu(request_adu)),
+                    ServerDeviceBusyError.error_code))
+            for request_adu in request_adus]))
+
+    def server_close(self):
+        """ Close socket, stop workers and close all connections. Unless
+        :attr:`daemon_threads` is set, wait for workers to finish their
+        current request.
+
+        """
+        TCPServer.server_close(self)
+        self._closed = True
+
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                break
+
+        for _ in self._workers:
+            self._queue.put(None)
+
+        self._wake_up()
+
+        if not self.daemon_threads:
+            for t in self._workers:
+                t.join()
+
+        if self._reader is not None:
+            self._reader.join()
+
+        with self._lock:
+            socks = list(self._connections)
+            self._connections.clear()
+            self._readable.clear()
+
+        for sock in socks:
+            self.shutdown_request(sock)
+
+        self._workers = []
+        self._reader = None
+        self._wake_up_receiver.close()
+        self._wake_up_sender.close()
@@ -0,0 +1,76 @@
+""" A server which receives Modbus TCP/IP ADU's as UDP datagrams.
+
+Every datagram carries 1 or more ADU's with MBAP header. The responses are
+send back in 1 datagram to the address the request came from. Create the
+server with :func:`umodbus.server.tcp.get_server`::
+
+    from socketserver import UDPServer
+
+    from umodbus.server.tcp import get_server
+    from umodbus.server.udp import RequestHandler
+
+    app = get_server(UDPServer, ('', 502), RequestHandler)
+
+    @app.route(slave_ids=[1], function_codes=[3], addresses=list(range(10)))
+    def read_data_store(slave_id, function_code, address):
+        return 0
+
+    app.serve_forever()
+
+UDP doesn't guarantee delivery. Clients retransmit requests which aren't
+answered in time, so a write request can be executed more than once.
+
+"""
+import logging
+
+from umodbus import log
+from umodbus.server import tcp
+from umodbus.utils import log_frame
+from umodbus.exceptions import ServerDeviceFailureError
+
+
+class RequestHandler(tcp.RequestHandler):
+    """ A subclass of :class:`socketserver.BaseRequestHandler` dispatching
+    Modbus requests received as UDP datagrams using the server's
+    :attr:`route_map`.
+
+    """
+    def handle(self):
+        """ Handle all request ADU's in datagram. A datagram which doesn't
+        contain complete ADU's is discarded as a whole.
+        """
+        data = self.request[0]
+        request_adus = []
+        offset = 0
+
+        while offset < len(data):
+            try:
+                length = self.get_meta_data(data[offset:offset + 7])['length']
+            except ServerDeviceFailureError:
+                length = 0
+
+            end = offset + 6 + length
+
+            if length < 2 or end > len(data):
+                log.warning('Discarding malformed datagram from {0}.'
+                            .format(self.client_address[0]))
+                return
+
+            request_adus.append(data[offset:end])
+            offset = end
+
+        response_adus = [self.process(request_adu)
+                         for request_adu in request_adus]
+
+        if response_adus:
+            self.respond(b''.join(response_adus))
+
+    def respond(self, response_adu):
+        """ Send response ADU back to client in 1 datagram.
+
+        :param response_adu: A bytearray containing the response of an ADU, or
+            the responses of multiple ADU's.
+        """
+        log_frame(logging.INFO, '--> {0} - {frame}.', response_adu,
+                  self.client_address[0])
+        self.request[1].sendto(response_adu, self.client_address)
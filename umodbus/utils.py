@@ -1,10 +1,13 @@
 import sys
 import struct
+import select
 import logging
+from itertools import count
+from binascii import hexlify
 from logging import StreamHandler, Formatter
 from functools import wraps
 
-from umodbus import log
+from umodbus import conf, log
 
 
 def log_to_stream(stream=sys.stderr, level=logging.NOTSET,
@@ -23,6 +26,35 @@ def log_to_stream(stream=sys.stderr, level=logging.NOTSET,
     log.addHandler(handler)
 
 
+_frame_counter = count()
+
+
+def log_frame(level, fmt, frame, *args):
+    """ Log a frame in hexadecimal representation. Nothing is formatted when
+    the logger doesn't handle messages of this level.
+
+    When :attr:`umodbus.conf.FRAME_LOG_SAMPLE_RATE` is N, only 1 in N frames
+    is logged.
+
+        >>> log_frame(logging.INFO, '--> {0} - {frame}.', b'\\x01', '1.2.3.4')
+
+    :param level: Log level.
+    :param fmt: Format string. The field `frame` is replaced by the
+        hexadecimal representation of the frame, other fields are replaced by
+        `args`.
+    :param frame: Byte array.
+    :param args: Arguments for format string.
+    """
+    if not log.isEnabledFor(level):
+        return
+
+    if conf.FRAME_LOG_SAMPLE_RATE > 1 and \
+            next(_frame_counter) % conf.FRAME_LOG_SAMPLE_RATE != 0:
+        return
+
+    log.log(level, fmt.format(*args, frame=hexlify(frame)))
+
+
 def unpack_mbap(mbap):
     """ Parse MBAP of 7 bytes and return tuple with fields.
 
@@ -141,3 +173,36 @@ def recv_exactly(recv_fn, size):
         raise ValueError
 
     return response
+
+
+def wait_readable(objects, timeout=None):
+    """ Wait until at least 1 object is readable and return the readable
+    objects.
+
+    :func:`select.poll` is used where available, unlike :func:`select.select`
+    it handles file descriptors above `FD_SETSIZE`.
+
+    :param objects: Iterable with file descriptors or objects with a
+        `fileno()` method, like sockets and serial ports.
+    :param timeout: Max number of seconds to wait, None to wait forever.
+    :return: List with readable objects, empty when timeout expired.
+    """
+    objects = list(objects)
+
+    if not hasattr(select, 'poll'):
+        return select.select(objects, [], [], timeout)[0]
+
+    poller = select.poll()
+    objects_by_fd = {}
+
+    for object_ in objects:
+        fd = object_ if isinstance(object_, int) else object_.fileno()
+        objects_by_fd[fd] = object_
+        poller.register(fd, select.POLLIN)
+
+    if timeout is not None:
+        # poll() expects milliseconds.
+        timeout = timeout * 1000
+
+    # Also hang ups and errors make an object readable, reading reveals them.
+    return [objects_by_fd[fd] for fd, _ in poller.poll(timeout)]